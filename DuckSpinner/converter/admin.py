@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ConversionJob
+
+
+@admin.register(ConversionJob)
+class ConversionJobAdmin(admin.ModelAdmin):
+    list_display = ('original_name', 'output_format', 'with_images', 'status', 'created_at', 'finished_at')
+    list_filter = ('status', 'output_format')
+    readonly_fields = ('id', 'created_at', 'started_at', 'finished_at')
@@ -0,0 +1,164 @@
+import json
+import math
+import os
+import re
+import threading
+import uuid
+import zipfile
+from contextlib import contextmanager
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: sınır yalnızca süreç içinde uygulanır
+    fcntl = None
+
+# Maliyet birimi "sayfa eşdeğeri"dir: bir PDF sayfası ya da slayt 1, girdinin her MB'ı 1,
+# resimli dönüştürmede gömülecek her resim 1 birimdir
+MB = 1024 * 1024
+# Word'de sayfa sayısı paketten güvenilir okunamaz (docProps/app.xml'deki değer çoğu zaman
+# eskidir); gövde XML'inin açılmış boyutunun bu kadarı bir sayfa sayılır
+WORD_XML_BYTES_PER_PAGE = 8 * 1024
+
+_SLIDE = re.compile(r'ppt/slides/slide\d+\.xml$')
+
+
+class Overloaded(Exception):
+    """Düğümdeki dönüştürmelerin toplam maliyeti sınırda; istek sonra tekrar denenmeli."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Sunucu yoğun, {retry_after} saniye sonra tekrar deneyin.")
+        self.retry_after = retry_after
+
+
+def _package_units(source, file_ext):
+    """Word/PowerPoint paketinin sayfa ve resim sayısını yalnızca ZIP dizininden tahmin eder."""
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    with zipfile.ZipFile(source) as archive:
+        infos = archive.infolist()
+    if file_ext == '.docx':
+        body = sum(info.file_size for info in infos if info.filename == 'word/document.xml')
+        pages = math.ceil(body / WORD_XML_BYTES_PER_PAGE)
+        media = 'word/media/'
+    else:
+        pages = sum(1 for info in infos if _SLIDE.match(info.filename))
+        media = 'ppt/media/'
+    images = sum(1 for info in infos if info.filename.startswith(media))
+    return pages, images
+
+
+def estimate_cost(source, file_ext, size, with_images):
+    """Dönüştürmenin maliyetini içeriği okumadan, sayfa eşdeğeri olarak tahmin eder.
+
+    PDF'te sayfa sayısı fitz'in xref tablosundan, Word/PowerPoint'te ZIP
+    dizininden okunur. Dosya bozuksa ya da eski ikili biçimdeyse (.doc/.ppt)
+    yalnızca boyut kullanılır; hatayı dönüştürmenin kendisi bildirir.
+    """
+    pages = images = 0
+    try:
+        if file_ext == '.pdf':
+            from .pdf_text import open_pdf
+
+            with open_pdf(source) as pdf_document:
+                pages = pdf_document.page_count
+        elif file_ext in ('.docx', '.pptx'):
+            pages, images = _package_units(source, file_ext)
+    except Exception:
+        pass
+    cost = max(1, pages) + math.ceil(size / MB)
+    if with_images:
+        cost += images
+    return cost
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+class AdmissionController:
+    """Düğümdeki eşzamanlı dönüştürmelerin toplam maliyetini `max_cost` ile sınırlar.
+
+    Kabul edilen her dönüştürme `directory` altındaki ortak kayda (süreç
+    numarası ve maliyetiyle) yazılır; kayıt dosya kilidiyle korunduğu için
+    sınır gunicorn işçileri ve arka plan işçileri arasında paylaşılır. Çöken
+    süreçlerin kayıtları okunurken düşülür. Tek başına sınırı aşan bir
+    dönüştürme de düğüm boşsa kabul edilir, yoksa hiç çalışamazdı.
+    """
+
+    def __init__(self, max_cost, directory, retry_after=5):
+        self.max_cost = max_cost
+        self.directory = directory
+        self.retry_after = retry_after
+        self._thread_lock = threading.Lock()
+        self._local = {}
+
+    @contextmanager
+    def _ledger(self):
+        """Kaydı kilit altında okur; bloktaki değişiklikleri çıkışta yazar."""
+        if fcntl is None:
+            with self._thread_lock:
+                yield self._local
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, 'inflight.json')
+        with open(path + '.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(path) as f:
+                        entries = json.load(f)
+                except (OSError, ValueError):
+                    entries = {}
+                entries = {token: entry for token, entry in entries.items() if _pid_alive(entry['pid'])}
+                yield entries
+                tmp_path = f'{path}.{os.getpid()}.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def in_flight(self):
+        with self._ledger() as entries:
+            return sum(entry['cost'] for entry in entries.values())
+
+    def acquire(self, cost, force=False):
+        """Maliyeti kayda ekleyip bilet döndürür; sınır aşılacaksa Overloaded yükseltir.
+
+        `force` ile sınıra bakılmadan eklenir (sıradan alınan arka plan işleri
+        için: reddedilemezler ama yükleri web isteklerinin kabulünde sayılır).
+        """
+        token = uuid.uuid4().hex
+        with self._ledger() as entries:
+            total = sum(entry['cost'] for entry in entries.values())
+            if not force and self.max_cost and entries and total + cost > self.max_cost:
+                raise Overloaded(self.retry_after)
+            entries[token] = {'pid': os.getpid(), 'cost': cost}
+        return token
+
+    def release(self, token):
+        with self._ledger() as entries:
+            entries.pop(token, None)
+
+    @contextmanager
+    def admit(self, cost, force=False):
+        token = self.acquire(cost, force)
+        try:
+            yield
+        finally:
+            self.release(token)
+
+
+admission = AdmissionController(
+    settings.CONVERTER_ADMISSION_MAX_COST,
+    settings.CONVERTER_ADMISSION_DIR,
+    settings.CONVERTER_ADMISSION_RETRY_AFTER,
+)
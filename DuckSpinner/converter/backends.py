@@ -0,0 +1,65 @@
+import importlib
+import sys
+
+# Biçim -> o biçim ilk kullanıldığında yüklenen kütüphaneler
+FORMAT_BACKENDS = {
+    'word': ('docx', 'docx.shared'),
+    'powerpoint': ('pptx', 'pptx.enum.shapes'),
+    'pdf': ('fitz', 'PyPDF2'),
+    'pdf_output': (
+        'reportlab.platypus', 'reportlab.lib.styles', 'reportlab.lib.units', 'reportlab.lib.pagesizes',
+    ),
+    'images': ('PIL.Image',),
+}
+
+
+class LazyModule:
+    """Modülü ilk öznitelik erişiminde içe aktaran vekil.
+
+    `from .backends import fitz` ile alınan vekil gerçek modül gibi kullanılır
+    (`fitz.open(...)`); kütüphane ancak o biçim ilk kez işlendiğinde yüklenir.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'yüklü' if self._module is not None else 'yüklenmedi'
+        return f'<LazyModule {self._name} ({state})>'
+
+
+def load_format(name):
+    """Bir biçimin tüm kütüphanelerini içe aktarır."""
+    return [importlib.import_module(module) for module in FORMAT_BACKENDS[name]]
+
+
+def preload():
+    """Tüm biçimlerin kütüphanelerini hemen yükler.
+
+    gunicorn'da preload_app ile ana süreçte çağrılırsa çatallanan işçiler bu
+    sayfaları kopyalamadan paylaşır.
+    """
+    for name in FORMAT_BACKENDS:
+        load_format(name)
+
+
+def loaded_formats():
+    """Kütüphaneleri şu an bellekte olan biçimlerin listesi."""
+    return [
+        name for name, modules in FORMAT_BACKENDS.items()
+        if all(module in sys.modules for module in modules)
+    ]
+
+
+fitz = LazyModule('fitz')  # PyMuPDF
+PILImage = LazyModule('PIL.Image')
+etree = LazyModule('lxml.etree')  # python-docx/python-pptx'in de kullandığı XML ayrıştırıcı
@@ -0,0 +1,307 @@
+import json
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from .admission import admission, estimate_cost
+from .isolation import run_isolated
+from .metrics import StageTimer
+from .workspace import remove_workspace
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """Toplu dönüştürme süreç havuzunu ilk kullanımda oluşturur (boyutu sınırlıdır)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.CONVERTER_BATCH_WORKERS or os.cpu_count() or 1)
+        return _pool
+
+
+def _reset_pool(broken):
+    """İşçisi ölen (ör. OOM ile öldürülen) havuzu kapatır; sonraki _get_pool yenisini kurar."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(*args):
+    """Dönüştürmeyi havuza verir; havuz başka bir istekte bozulduysa yenisini kurup tekrar dener."""
+    pool = _get_pool()
+    try:
+        return pool, pool.submit(convert_batch_item, *args)
+    except (BrokenProcessPool, RuntimeError):
+        _reset_pool(pool)
+        pool = _get_pool()
+        return pool, pool.submit(convert_batch_item, *args)
+
+
+class BatchError(Exception):
+    """Toplu yüklemenin tamamını geçersiz kılan hata (ör. bozuk ZIP)."""
+
+
+def _unique_name(name, used):
+    """Aynı adlı çıktılar ZIP içinde birbirini ezmesin diye numara ekler."""
+    base, ext = os.path.splitext(name)
+    candidate = name
+    counter = 2
+    while candidate.lower() in used:
+        candidate = f'{base} ({counter}){ext}'
+        counter += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _copy_limited(chunks, f, budget):
+    """Parçaları dosyaya yazar; toplam `budget` baytı aşarsa durur (ZIP bombasına karşı)."""
+    written = 0
+    for chunk in chunks:
+        written += len(chunk)
+        if written > budget:
+            raise BatchError("Toplu yükleme (açılmış ZIP içeriği dahil) boyut sınırını aşıyor.")
+        f.write(chunk)
+    return written
+
+
+def _safe_member_name(filename):
+    """ZIP içindeki yolu klasör yapısını koruyarak, dışarı taşamayacak biçime getirir."""
+    parts = [p for p in filename.replace('\\', '/').split('/') if p not in ('', '.', '..')]
+    return '/'.join(parts)
+
+
+def _zip_member_chunks(archive, member):
+    with archive.open(member) as src:
+        yield from iter(lambda: src.read(1024 * 1024), b'')
+
+
+def collect_inputs(uploaded_files, workspace, supported_extensions):
+    """Yüklenen dosyaları (ZIP'ler açılarak) çalışma alanına yazar.
+
+    (görünen ad, dosya yolu ya da None, hata) üçlülerinin listesini döndürür;
+    desteklenmeyen dosyalar listede hata ile yer alır ki bildirimde görünsün.
+    """
+    inputs = []
+    budget = settings.CONVERTER_MAX_BATCH_UPLOAD_SIZE
+
+    def add(name, chunks):
+        nonlocal budget
+        ext = os.path.splitext(name)[1].lower()
+        if ext not in supported_extensions:
+            inputs.append((name, None, "Desteklenmeyen dosya formatı."))
+            return
+        if sum(path is not None for _, path, _ in inputs) >= settings.CONVERTER_BATCH_MAX_FILES:
+            raise BatchError(f"Bir seferde en fazla {settings.CONVERTER_BATCH_MAX_FILES} dosya dönüştürülebilir.")
+        path = os.path.join(workspace, f'input-{len(inputs)}{ext}')
+        with open(path, 'wb') as f:
+            budget -= _copy_limited(chunks, f, budget)
+        inputs.append((name, path, None))
+
+    for uploaded_file in uploaded_files:
+        if os.path.splitext(uploaded_file.name)[1].lower() == '.zip':
+            try:
+                with zipfile.ZipFile(uploaded_file) as archive:
+                    for member in archive.infolist():
+                        name = _safe_member_name(member.filename)
+                        if member.is_dir() or not name or os.path.basename(name).startswith('.'):
+                            continue
+                        add(name, _zip_member_chunks(archive, member))
+            except zipfile.BadZipFile:
+                raise BatchError(f"{uploaded_file.name} geçerli bir ZIP dosyası değil.")
+        else:
+            add(os.path.basename(uploaded_file.name) or 'dosya', uploaded_file.chunks())
+    return inputs
+
+
+def batch_cost(inputs, with_images):
+    """Toplu yüklemedeki dönüştürülecek dosyaların toplam maliyeti (yük kabulü için)."""
+    return sum(
+        estimate_cost(path, os.path.splitext(path)[1].lower(), os.path.getsize(path), with_images)
+        for _, path, _ in inputs if path is not None
+    )
+
+
+def convert_batch_item(input_path, output_path, output_format, with_images):
+    """Havuz sürecinde çalışır: tek bir dosyayı dönüştürüp çıktıyı diske yazar.
+
+    Tek dosyalık dönüştürmedeki gibi (CONVERSION_ISOLATION) süre ve bellek
+    sınırlı bir alt süreçte çalışır. Dosya okunamadığı için belgeye yalnızca
+    hata metni yazıldıysa başarısız sayılır.
+    """
+    from .backends import load_format
+    from .views import backend_formats, convert_to_file
+
+    file_ext = os.path.splitext(input_path)[1].lower()
+    args = (input_path, file_ext, output_format, with_images, output_path)
+    timer = StageTimer()
+    with timer:
+        if settings.CONVERTER_ISOLATION:
+            # Kütüphaneler havuz sürecinde bir kez yüklenir, alt süreçler fork ile hazır bulur
+            for name in backend_formats(file_ext, output_format, with_images):
+                load_format(name)
+            result = run_isolated(
+                convert_to_file, args,
+                timeout=settings.CONVERTER_CONVERSION_TIMEOUT,
+                memory_limit=settings.CONVERTER_CONVERSION_MEMORY_LIMIT,
+            )
+        else:
+            result = convert_to_file(*args)
+    if result is True and timer.counts.get('extract_errors'):
+        return "Dosya okunamadı (bozuk ya da desteklenmeyen içerik)."
+    return result
+
+
+class _ZipStream:
+    """zipfile'ın yazdığı baytları toplayıp parça parça dışarı veren, geri sarılamayan akış."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _write_entry(archive, stream, name, path_or_file):
+    """Dosyayı ZIP'e RESPONSE_CHUNK_SIZE'lık parçalarla yazar; her parçadan sonra akışı boşaltır."""
+    if isinstance(path_or_file, str):
+        zinfo = zipfile.ZipInfo.from_file(path_or_file, name)
+        f = open(path_or_file, 'rb')
+    else:
+        zinfo = zipfile.ZipInfo(name, time.localtime()[:6])
+        f = path_or_file
+        zinfo.file_size = os.fstat(f.fileno()).st_size
+    # Boyut önceden bilindiği için ZIP64 yalnızca gerekince kullanılır (archive.write'taki gibi)
+    zinfo.compress_type = zipfile.ZIP_STORED
+    with f, archive.open(zinfo, 'w') as dest:
+        for block in iter(lambda: f.read(settings.CONVERTER_RESPONSE_CHUNK_SIZE), b''):
+            dest.write(block)
+            yield stream.drain()
+    yield stream.drain()
+
+
+def _stream_batch(inputs, workspace, output_format, with_images, output_extension, cache, cache_key_for,
+                  ticket):
+    stream = _ZipStream()
+    manifest = []
+    used = set()
+    futures = {}
+    try:
+        with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for index, (name, path, error) in enumerate(inputs):
+                entry = {'input': name, 'status': 'error', 'output': None, 'error': error}
+                manifest.append(entry)
+                if path is None:
+                    continue
+
+                output_name = _unique_name(f'{os.path.splitext(name)[0]}.{output_extension}', used)
+                cache_key = None
+                if cache is not None:
+                    with open(path, 'rb') as f:
+                        cache_key = cache_key_for(iter(lambda: f.read(64 * 1024), b''), output_format, with_images)
+                    cached = cache.get(cache_key)
+                    if cached is not None:
+                        yield from _write_entry(archive, stream, output_name, cached)
+                        entry.update(status='ok', output=output_name, seconds=0.0, cached=True)
+                        continue
+
+                output_path = os.path.join(workspace, f'output-{index}.{output_extension}')
+                args = (path, output_path, output_format, with_images)
+                pool, future = _submit(*args)
+                futures[future] = (pool, args, entry, output_name, cache_key, time.monotonic(), False)
+
+            # Bir işçinin ölümü (ör. OOM) havuzdaki tüm bekleyen işleri düşürür. Havuz yeniden
+            # kurulur ve düşen dosyalar tek tek denenir; yalnızca tek başına da havuzu bozan
+            # dosya başarısız sayılır
+            suspects = []
+            pending = set(futures)
+            while pending or suspects:
+                if suspects and not any(futures[f][6] for f in pending):
+                    args, entry, output_name, cache_key, started = suspects.pop(0)
+                    pool, future = _submit(*args)
+                    futures[future] = (pool, args, entry, output_name, cache_key, started, True)
+                    pending.add(future)
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pool, args, entry, output_name, cache_key, started, alone = futures.pop(future)
+                    output_path = args[1]
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        _reset_pool(pool)
+                        if not alone:
+                            suspects.append((args, entry, output_name, cache_key, started))
+                            continue
+                        result = "Dönüştürme süreci beklenmedik biçimde sonlandı."
+                    except Exception as e:
+                        result = str(e)
+                    entry['seconds'] = round(time.monotonic() - started, 3)
+                    if result is not True:
+                        entry['error'] = str(result)
+                        continue
+                    yield from _write_entry(archive, stream, output_name, output_path)
+                    entry.update(status='ok', output=output_name)
+                    if cache_key is not None:
+                        try:
+                            with open(output_path, 'rb') as f:
+                                cache.put(cache_key, f)
+                        except OSError as e:
+                            print(f"Sonuç önbelleğe yazılamadı: {e}")
+                    os.remove(output_path)
+
+            archive.writestr('manifest.json', json.dumps(
+                {'converted': sum(e['status'] == 'ok' for e in manifest),
+                 'failed': sum(e['status'] != 'ok' for e in manifest),
+                 'files': manifest},
+                ensure_ascii=False, indent=2,
+            ))
+        yield stream.drain()
+    finally:
+        # İstemci bağlantıyı kestiyse henüz başlamamış dönüştürmeler iptal edilir
+        for future in futures:
+            future.cancel()
+        remove_workspace(workspace)
+        if ticket is not None:
+            admission.release(ticket)
+
+
+class BatchStream:
+    """Dosyaları süreç havuzunda paralel dönüştürür, biten her sonucu hemen ZIP akışına yazar.
+
+    En sonda dosya başına durum ve hataları içeren manifest.json eklenir.
+    Django yanıtı kapatırken close() çağırır; akış hiç başlamamış olsa bile
+    çalışma alanı silinir ve yük kabulündeki pay (`ticket`) bırakılır.
+    """
+
+    def __init__(self, inputs, workspace, output_format, with_images, output_extension,
+                 cache=None, cache_key_for=None, ticket=None):
+        self.workspace = workspace
+        self.ticket = ticket
+        self._generator = _stream_batch(inputs, workspace, output_format, with_images,
+                                        output_extension, cache, cache_key_for, ticket)
+
+    def __iter__(self):
+        return self._generator
+
+    def close(self):
+        self._generator.close()
+        remove_workspace(self.workspace)
+        if self.ticket is not None:
+            admission.release(self.ticket)
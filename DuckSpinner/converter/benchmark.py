@@ -0,0 +1,298 @@
+import gc
+import io
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from importlib import metadata
+
+from django.conf import settings
+
+from .chunked_pdf import create_pdf_chunked
+from .document import ImageBlock, ParagraphBlock, image_blocks
+from .images import ImageDeduplicator, prepare_images
+from .normalizer import DEFAULT_WORDS, TextNormalizer
+
+# Hazır derlem boyutları: sayfa/slayt sayısı, sayfa başına paragraf, resim sayısı ve kenar uzunluğu (px)
+PRESETS = {
+    'small': {'pages': 5, 'paragraphs': 5, 'images': 2, 'image_px': 400},
+    'medium': {'pages': 40, 'paragraphs': 8, 'images': 20, 'image_px': 1200},
+    'large': {'pages': 200, 'paragraphs': 10, 'images': 60, 'image_px': 2400},
+}
+
+KINDS = ('docx', 'pptx', 'pdf')
+
+STAGES = (
+    'extract_text', 'normalize', 'extract_images', 'prepare_images', 'build_pdf', 'build_pdf_fitz',
+    'build_pdf_chunked', 'build_docx', 'build_docx_bulk',
+)
+
+# Birleşik kelime sorunlarını da içeren örnek kelime dağarcığı
+VOCABULARY = list(DEFAULT_WORDS) + [
+    'patient', 'nurse', 'therapy', 'hospital', 'dose', 'care', 'anatomy', 'assessment',
+    'hemşire', 'tedavi', 'ilaç', 'theandof', 'ofthe', 'tothe', 'infection', 'monitoring',
+]
+
+
+def _paragraph(rng, words=40):
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(words // 2, words))) + '.'
+
+
+def _image(index, size, seed):
+    """Sıkıştırması gerçekçi olsun diye renk geçişli, her indekste farklı bir JPEG üretir."""
+    from PIL import Image
+
+    rng = random.Random(seed * 1000 + index)
+    gradient = Image.linear_gradient('L').resize((size, size))
+    radial = Image.radial_gradient('L').resize((size, size))
+    tint = Image.new('L', (size, size), rng.randint(0, 255))
+    im = Image.merge('RGB', (gradient, radial, tint)).rotate(rng.randint(0, 359))
+    out = io.BytesIO()
+    im.save(out, 'JPEG', quality=90)
+    return out.getvalue()
+
+
+def _images_on_page(page, pages, images):
+    """Resimleri sayfalara mümkün olduğunca eşit dağıtır."""
+    return images * (page + 1) // pages - images * page // pages
+
+
+def corpus_name(kind, params, seed):
+    return '{kind}-p{pages}-q{paragraphs}-i{images}-{image_px}px-s{seed}.{kind}'.format(
+        kind=kind, seed=seed, **params
+    )
+
+
+def generate_docx(path, pages, paragraphs, images, image_px, seed=0):
+    from docx import Document
+    from docx.shared import Inches
+
+    rng = random.Random(seed)
+    doc = Document()
+    added = 0
+    for page in range(pages):
+        if page:
+            doc.add_page_break()
+        for _ in range(paragraphs):
+            doc.add_paragraph(_paragraph(rng))
+        for _ in range(_images_on_page(page, pages, images)):
+            doc.add_picture(io.BytesIO(_image(added, image_px, seed)), width=Inches(2))
+            added += 1
+    doc.save(path)
+
+
+def generate_pptx(path, pages, paragraphs, images, image_px, seed=0):
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    rng = random.Random(seed)
+    prs = Presentation()
+    added = 0
+    for slide_no in range(pages):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f'Slide {slide_no + 1}'
+        slide.placeholders[1].text = '\n'.join(_paragraph(rng, 12) for _ in range(paragraphs))
+        for i in range(_images_on_page(slide_no, pages, images)):
+            left = Inches(0.5 + (i % 4) * 2.3)
+            slide.shapes.add_picture(io.BytesIO(_image(added, image_px, seed)), left, Inches(5), width=Inches(2))
+            added += 1
+    prs.save(path)
+
+
+def generate_pdf(path, pages, paragraphs, images, image_px, seed=0):
+    import fitz
+
+    rng = random.Random(seed)
+    doc = fitz.open()
+    added = 0
+    for page_no in range(pages):
+        page = doc.new_page()
+        text = '\n\n'.join(_paragraph(rng) for _ in range(paragraphs))
+        page.insert_textbox(fitz.Rect(40, 40, 570, 560), text, fontsize=8)
+        for i in range(_images_on_page(page_no, pages, images)):
+            x = 40 + (i % 4) * 135
+            y = 580 + (i // 4 % 2) * 105
+            page.insert_image(fitz.Rect(x, y, x + 125, y + 95), stream=_image(added, image_px, seed))
+            added += 1
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+
+GENERATORS = {'docx': generate_docx, 'pptx': generate_pptx, 'pdf': generate_pdf}
+
+
+def ensure_corpus(directory, kinds, params, seed=0):
+    """Derlem dosyalarını üretir; aynı parametrelerle üretilmiş dosya varsa yeniden kullanır."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for kind in kinds:
+        path = os.path.join(directory, corpus_name(kind, params, seed))
+        if not os.path.exists(path):
+            tmp_path = path + '.tmp'
+            GENERATORS[kind](tmp_path, seed=seed, **params)
+            os.replace(tmp_path, path)
+        paths.append(path)
+    return paths
+
+
+def _measure(func, repeat):
+    """İşlevi `repeat` kez zamanlar, ardından bir kez de tracemalloc ile tepe belleği ölçer."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    # tracemalloc zamanlamayı yavaşlattığı için bellek ayrı bir turda ölçülür
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, {
+        'best_seconds': min(times),
+        'mean_seconds': statistics.mean(times),
+        'peak_python_mb': round(peak / (1024 * 1024), 3),
+    }
+
+
+def run_stages(path, repeat=3, stages=STAGES):
+    """Bir girdi için dönüştürme hattının aşamalarını ayrı ayrı ölçer.
+
+    extract_text normalizasyonu da içerir (çıkarıcılar metni okurken düzeltir);
+    normalize aşaması yalnızca düzelticinin payını gösterir.
+    """
+    from . import views
+
+    ext = os.path.splitext(path)[1].lower()
+    text_extractors = {
+        '.docx': views.extract_blocks_from_word,
+        '.pptx': views.extract_blocks_from_powerpoint,
+        '.pdf': views.extract_blocks_from_pdf,
+    }
+    image_extractors = {
+        '.pptx': views.extract_images_from_powerpoint,
+        '.pdf': views.extract_images_from_pdf,
+    }
+    results = {}
+
+    text_blocks, results['extract_text'] = _measure(lambda: list(text_extractors[ext](path)), repeat)
+    texts = [block.text for block in text_blocks if isinstance(block, ParagraphBlock)]
+    if 'normalize' in stages:
+        normalizer = TextNormalizer(settings.CONVERTER_NORMALIZER_WORDS or DEFAULT_WORDS)
+        _, results['normalize'] = _measure(lambda: [normalizer(text) for text in texts], repeat)
+
+    images = []
+    if ext in image_extractors and 'extract_images' in stages:
+        images, results['extract_images'] = _measure(
+            lambda: list(image_extractors[ext](path, ImageDeduplicator())), repeat
+        )
+    if images and settings.CONVERTER_IMAGE_DPI and 'prepare_images' in stages:
+        images, results['prepare_images'] = _measure(lambda: list(prepare_images(
+            images,
+            views.IMAGE_CELL_INCHES,
+            max(72, settings.CONVERTER_IMAGE_DPI),
+            jpeg_quality=settings.CONVERTER_IMAGE_JPEG_QUALITY,
+            png_compress_level=settings.CONVERTER_IMAGE_PNG_COMPRESS_LEVEL,
+        )), repeat)
+
+    blocks = text_blocks + list(image_blocks(images))
+
+    def build_pdf_chunked(blocks, buffer):
+        # Parça ayarları kapalıysa 45 resimlik parçalarla ölçülür
+        max_paragraphs = settings.CONVERTER_PDF_CHUNK_PARAGRAPHS
+        max_images = settings.CONVERTER_PDF_CHUNK_IMAGES or (0 if max_paragraphs else 45)
+        return create_pdf_chunked(
+            blocks, buffer, views.PDF_WRITERS['reportlab'], max_paragraphs, max_images,
+            settings.CONVERTER_PDF_CHUNK_WORKERS,
+        )
+
+    builders = (
+        ('build_pdf', views.PDF_WRITERS['reportlab']),
+        ('build_pdf_fitz', views.PDF_WRITERS['fitz']),
+        ('build_pdf_chunked', build_pdf_chunked),
+        ('build_docx', views.WORD_WRITERS['python-docx']),
+        ('build_docx_bulk', views.WORD_WRITERS['bulk']),
+    )
+    for stage, builder in builders:
+        if stage not in stages:
+            continue
+
+        def build():
+            buffer = io.BytesIO()
+            result = builder(iter(blocks), buffer)
+            if result is not True:
+                raise RuntimeError(result)
+            return buffer.tell()
+
+        output_bytes, results[stage] = _measure(build, repeat)
+        results[stage]['output_bytes'] = output_bytes
+
+    return {
+        'input': os.path.basename(path),
+        'input_bytes': os.path.getsize(path),
+        'paragraphs': len(texts),
+        'characters': sum(len(text) for text in texts),
+        'images': sum(1 for block in blocks if isinstance(block, ImageBlock)),
+        'stages': results,
+    }
+
+
+def environment():
+    """Sonuçları commit'ler arasında karşılaştırmak için ortam bilgisi."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    versions = {}
+    for dist in ('Django', 'python-docx', 'python-pptx', 'reportlab', 'PyMuPDF', 'PyPDF2', 'Pillow'):
+        try:
+            versions[dist] = metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            versions[dist] = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'packages': versions,
+        'settings': {
+            'ooxml_reader': settings.CONVERTER_OOXML_READER,
+            'pdf_engine': settings.CONVERTER_PDF_ENGINE,
+            'pdf_workers': settings.CONVERTER_PDF_WORKERS,
+            'pdf_chunk_images': settings.CONVERTER_PDF_CHUNK_IMAGES,
+            'pdf_chunk_paragraphs': settings.CONVERTER_PDF_CHUNK_PARAGRAPHS,
+            'word_writer': settings.CONVERTER_WORD_WRITER,
+            'image_dpi': settings.CONVERTER_IMAGE_DPI,
+        },
+    }
+
+
+def compare(baseline, current):
+    """İki sonuç dosyasındaki aynı girdi/aşama çiftleri için süre ve bellek oranlarını döndürür."""
+    old = {(r['input'], stage): m for r in baseline['results'] for stage, m in r['stages'].items()}
+    rows = []
+    for r in current['results']:
+        for stage, m in r['stages'].items():
+            before = old.get((r['input'], stage))
+            if before is None:
+                continue
+            rows.append({
+                'input': r['input'],
+                'stage': stage,
+                'seconds_before': before['best_seconds'],
+                'seconds_after': m['best_seconds'],
+                'time_ratio': m['best_seconds'] / before['best_seconds'] if before['best_seconds'] else None,
+                'peak_mb_before': before['peak_python_mb'],
+                'peak_mb_after': m['peak_python_mb'],
+            })
+    return rows
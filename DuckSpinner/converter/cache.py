@@ -0,0 +1,143 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+# Dönüştürme hattı çıktıyı ya da sayfa önbelleği kayıtlarının biçimini değiştirecek şekilde
+# değişirse artırılır; eski kayıtlar kullanılmaz
+CACHE_VERSION = 5
+
+
+class ConversionCache:
+    """Yüklenen dosyanın içeriğine göre adreslenen, diskte tutulan sonuç önbelleği.
+
+    Anahtar; dosya baytlarının SHA-256 özeti, çıktı formatı ve resimli
+    dönüştürme seçeneğinden oluşur. Toplam boyut `max_bytes` sınırını aşınca en
+    uzun süredir kullanılmayan kayıtlar (dosya mtime'ına göre LRU) silinir.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Son taramada bulunan toplam boyut; henüz taranmadıysa None
+        self._size = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(chunks, output_format, with_images, extra=''):
+        """Dosya parçalarını akış halinde özetleyip önbellek anahtarını üretir.
+
+        `extra`, çıktıyı etkileyen diğer ayarları (ör. resim kalitesi) taşır.
+        """
+        digest = hashlib.sha256()
+        for chunk in chunks:
+            digest.update(chunk)
+        digest.update(f'|{output_format}|{int(bool(with_images))}|{extra}|v{CACHE_VERSION}'.encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key):
+        """Kayıt varsa okunmak üzere açılmış dosyayı, yoksa None döndürür."""
+        path = self._path(key)
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU için son kullanım zamanını güncelle
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return f
+
+    def put(self, key, data, evict=True):
+        """Sonucu (bayt dizisi ya da dosya benzeri nesne) atomik olarak yazar, yazılan boyutu döndürür.
+
+        Ardından gerekirse eski kayıtları siler (`evict=False` ise silme çağırana kalır).
+        Sınırdan büyük sonuç yazılmaz, None döner.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if hasattr(data, 'read'):
+                    shutil.copyfileobj(data, f, 1024 * 1024)
+                else:
+                    f.write(data)
+                size = f.tell()
+            if size > self.max_bytes:
+                os.remove(tmp_path)
+                return None
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        if evict:
+            self.evict()
+        return size
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith('.tmp-'):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """Toplam boyut sınırın altına inene kadar en eski kayıtları siler."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            self._size = total
+            return 0
+        removed = 0
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+            if total <= self.max_bytes:
+                break
+        self._size = total
+        return removed
+
+    def clear(self):
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,166 @@
+import gc
+import os
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+from .backends import fitz
+from .document import ImageBlock, ParagraphBlock
+from .metrics import stage
+from .workspace import request_workspace
+
+# Oluşturucuların bir sayfaya koyduğu resim sayısı (3x3 ızgara)
+GRID_SIZE = 9
+
+_pool = None
+_pool_size = None
+
+
+def _get_pool(workers):
+    """Parça oluşturma süreç havuzunu ilk kullanımda oluşturur ve saklar."""
+    global _pool, _pool_size
+    if _pool is None or _pool_size != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_size = workers
+    return _pool
+
+
+def split_segments(blocks, max_paragraphs=0, max_images=0):
+    """Blok akışını en çok `max_paragraphs` paragraf ve `max_images` resim içeren parçalara böler.
+
+    0 o blok türünün bölünmeyeceği anlamına gelir. Parçalar yalnızca ızgara
+    sınırında kesilir; böylece resimler tek parça çıktıdaki 3x3 ızgaralarla
+    aynı gruplanır. Sayfa sonu blokları oluşturucular kullanmadığı için atlanır.
+    """
+    if max_images:
+        max_images = -(-max_images // GRID_SIZE) * GRID_SIZE
+    segment = []
+    paragraphs = images = total_images = 0
+    for block in blocks:
+        if isinstance(block, ParagraphBlock):
+            full = max_paragraphs and paragraphs >= max_paragraphs
+        elif isinstance(block, ImageBlock):
+            full = max_images and images >= max_images
+        else:
+            continue
+        if full and total_images % GRID_SIZE == 0:
+            yield segment
+            segment = []
+            paragraphs = images = 0
+        segment.append(block)
+        if isinstance(block, ImageBlock):
+            images += 1
+            total_images += 1
+        else:
+            paragraphs += 1
+    if segment:
+        yield segment
+
+
+def render_segment(writer, blocks, path):
+    """Bir parçayı kendi PDF dosyasına yazar (alt süreçte de çalışabilir)."""
+    with open(path, 'wb') as f:
+        result = writer(iter(blocks), f)
+    # reportlab belgesi çözülmüş resimleri döngüsel referanslarla tutar; sonraki
+    # parçaya geçmeden bırakılmazsa bellek yine belge boyutuyla büyür
+    gc.collect()
+    return result
+
+
+def _render_segments(writer, segments, directory, workers):
+    """Parçaları oluşturur; (dosya yolu, resimle başlıyor mu, sonuç) üçlülerini sırayla üretir."""
+    if workers < 2:
+        for index, segment in enumerate(segments):
+            path = os.path.join(directory, f'segment-{index:05d}.pdf')
+            yield path, isinstance(segment[0], ImageBlock), render_segment(writer, segment, path)
+        return
+
+    pool = _get_pool(workers)
+    pending = deque()
+    try:
+        for index, segment in enumerate(segments):
+            path = os.path.join(directory, f'segment-{index:05d}.pdf')
+            pending.append((path, isinstance(segment[0], ImageBlock), pool.submit(render_segment, writer, segment, path)))
+            # Bellekte en çok `workers` kadar parça bekler
+            if len(pending) >= workers:
+                path, starts_with_image, future = pending.popleft()
+                yield path, starts_with_image, future.result()
+        while pending:
+            path, starts_with_image, future = pending.popleft()
+            yield path, starts_with_image, future.result()
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+
+
+def _is_blank(page):
+    return not page.get_text().strip() and not page.get_images() and not page.get_drawings()
+
+
+def append_segment(merged_path, segment_path, starts_with_image):
+    """Parçanın sayfalarını birleşik dosyanın sonuna ekleyip artımlı kaydeder.
+
+    Birleşik belge her parçada yeniden açılır; MuPDF nesneleri gerektikçe
+    okuduğu için bellek kullanımı birleşik belgenin boyutuyla büyümez. Artımlı
+    kayıtların eski xref tabloları `write_merged` ile sonda atılır.
+    """
+    with fitz.open(merged_path) as merged, fitz.open(segment_path) as segment:
+        start = 0
+        # reportlab resimle başlayan belgede ızgaradan önce boş bir sayfa açar;
+        # tek parça çıktıda bu sayfa olmadığı için atlanır
+        if starts_with_image and len(segment) > 1 and _is_blank(segment[0]):
+            start = 1
+        merged.insert_pdf(segment, from_page=start)
+        merged.saveIncr()
+
+
+def write_merged(merged_path, buffer, directory):
+    """Birleşik belgeyi tek xref tablosuyla baştan yazıp `buffer`'a kopyalar."""
+    final_path = os.path.join(directory, 'final.pdf')
+    with fitz.open(merged_path) as merged:
+        merged.save(final_path, garbage=1, deflate=True)
+    with open(final_path, 'rb') as f:
+        shutil.copyfileobj(f, buffer, 1024 * 1024)
+
+
+def create_pdf_chunked(blocks, buffer, writer, max_paragraphs=0, max_images=0, workers=1):
+    """Blok akışını `writer` ile parça parça PDF'e dönüştürüp parçaları birleştirir.
+
+    Tepe bellek belgeye göre değil parça boyutuna göre büyür. Resim parçaları
+    ızgara sayfalarında bölündüğü için çıktının düzeni değişmez; metin
+    `max_paragraphs` ile bölünürse her parça yeni bir sayfada başlar.
+    `workers` 2 ve üzeriyse parçalar süreç havuzunda paralel oluşturulur.
+    """
+    try:
+        segments = split_segments(blocks, max_paragraphs, max_images)
+        first = next(segments, [])
+        second = next(segments, None)
+        if second is None:
+            # Tek parçalık belge birleştirmeye gerek kalmadan doğrudan yazılır
+            return writer(iter(first), buffer)
+
+        with request_workspace(prefix='chunks-') as workspace:
+            merged_path = os.path.join(workspace, 'merged.pdf')
+            rendered = _render_segments(writer, chain([first, second], segments), workspace, workers)
+            del first, second
+            try:
+                for index, (path, starts_with_image, result) in enumerate(rendered):
+                    if result is not True:
+                        return result
+                    if index == 0:
+                        os.replace(path, merged_path)
+                        continue
+                    with stage('merge_pdf'):
+                        append_segment(merged_path, path, starts_with_image)
+                    os.remove(path)
+            finally:
+                rendered.close()
+            with stage('merge_pdf'):
+                write_merged(merged_path, buffer, workspace)
+        return True
+    except Exception as e:
+        print(f"PDF parça parça oluşturulurken hata: {e}")
+        return str(e)
@@ -0,0 +1,73 @@
+from collections import namedtuple
+
+# Çıkarıcılar belgeyi tek bir metin olarak değil, bu blokların akışı olarak üretir;
+# oluşturucular akışı blok blok tüketir. Böylece tüm metin hiçbir zaman bellekte
+# birleştirilmez ve çıktı, çıkarma sürerken oluşturulmaya başlar.
+ParagraphBlock = namedtuple('ParagraphBlock', 'text')
+PageBreakBlock = namedtuple('PageBreakBlock', '')
+ImageBlock = namedtuple('ImageBlock', 'image')
+
+PAGE_BREAK = PageBreakBlock()
+
+
+def page_blocks(page_texts):
+    """Her biri bir paragraf dizisi olan sayfaları akıtır.
+
+    Metni olan sayfaların arasına sayfa sonu konur; boş sayfalar atlanır.
+    """
+    started = False
+    for texts in page_texts:
+        page_started = False
+        for text in texts:
+            if not text:
+                continue
+            if started and not page_started:
+                yield PAGE_BREAK
+            started = page_started = True
+            yield ParagraphBlock(text)
+
+
+def image_blocks(extracted_images):
+    """Çıkarılan resimleri resim bloklarına çevirir."""
+    for image in extracted_images:
+        yield ImageBlock(image)
+
+
+class FlowableStream(list):
+    """reportlab'ın `build()` döngüsüne verilen, üreteçten tembelce dolan liste.
+
+    `build()` listeyi baştan tüketip (`del flowables[0]`) her turda `len()` ile
+    bitip bitmediğine bakar; liste azaldıkça üreteçten yeni öğe çekilir. Böylece
+    bütün hikâye (story) hiçbir zaman bellekte tutulmaz.
+
+    reportlab 4.1.0'ın BaseDocTemplate.build/handle_flowable/handle_keepWithNext
+    koduna göre yazıldı: bunlar listeyi yalnızca len(), [0], [:i], del ve
+    baştan ekleme ile kullanır. Başka sürümde bu varsayımlar yeniden
+    denetlenmeli.
+    """
+
+    # Önde tutulan en az öğe sayısı. handle_keepWithNext zinciri len() kadar tarar;
+    # zincir daha uzunsa sonuna kadar (ve ardından gelen ilk öğeye kadar) doldurulur
+    LOOKAHEAD = 4
+
+    def __init__(self, flowables):
+        super().__init__()
+        self._source = iter(flowables)
+
+    def _keeps_with_next(self):
+        last = self[-1] if list.__len__(self) else None
+        return last is not None and hasattr(last, 'getKeepWithNext') and last.getKeepWithNext()
+
+    def _fill(self):
+        while self._source is not None and (list.__len__(self) < self.LOOKAHEAD or self._keeps_with_next()):
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __bool__(self):
+        return len(self) > 0
@@ -0,0 +1,236 @@
+import copy
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from xml.sax.saxutils import escape
+
+from .backends import etree
+from .document import ImageBlock, ParagraphBlock
+
+# Gövde XML'i bu boyuta kadar bellekte tutulur, aşınca geçici dosyaya taşar
+BODY_SPOOL_SIZE = 4 * 1024 * 1024
+
+RELS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+TYPES_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+IMAGE_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/image'
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# python-docx'in tanıdığı resim türleri; [Content_Types].xml resimlerden önce yazılabilsin diye
+# hepsi baştan bildirilir
+IMAGE_CONTENT_TYPES = {
+    'bmp': 'image/bmp',
+    'gif': 'image/gif',
+    'jpg': 'image/jpeg',
+    'png': 'image/png',
+    'tiff': 'image/tiff',
+}
+
+# lxml'in (dolayısıyla python-docx'in) reddettiği karakterler
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+_RUN_SPECIAL = re.compile('([\t\r\n])')
+
+PAGE_BREAK_XML = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+EMPTY_CELL_XML = '<w:p/>'
+# Resim eklenemeyen hücre: python-docx'te `cell.text = ''` sonucu
+FAILED_CELL_XML = '<w:p><w:r/></w:p>'
+
+PICTURE_XML = (
+    '<w:p><w:r><w:drawing><wp:inline xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+    '<wp:extent cx="{cx}" cy="{cy}"/><wp:docPr id="{id}" name="Picture {id}"/>'
+    '<wp:cNvGraphicFramePr><a:graphicFrameLocks noChangeAspect="1"/></wp:cNvGraphicFramePr>'
+    '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture"><pic:pic>'
+    '<pic:nvPicPr><pic:cNvPr id="0" name="{filename}"/><pic:cNvPicPr/></pic:nvPicPr>'
+    '<pic:blipFill><a:blip r:embed="{rid}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+    '<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm><a:prstGeom prst="rect"/></pic:spPr>'
+    '</pic:pic></a:graphicData></a:graphic></wp:inline></w:drawing></w:r></w:p>'
+)
+
+# python-docx'in şablondan nesne olarak yüklediği (kaydederken yeniden yazdığı) parçalar
+SERIALIZED_PARTS = ('word/styles.xml', 'word/settings.xml', 'word/numbering.xml')
+
+_template = None
+
+
+class _Template:
+    """python-docx'in varsayılan şablonundan okunan, her belgede aynı kalan parçalar."""
+
+    def __init__(self):
+        import docx
+
+        path = os.path.join(os.path.dirname(docx.__file__), 'templates', 'default.docx')
+        with zipfile.ZipFile(path) as archive:
+            self.parts = {name: archive.read(name) for name in archive.namelist()}
+        # python-docx'in nesne olarak yükleyip yeniden kaydettiği parçalar onun gibi sıkıştırılır;
+        # diğerleri şablondaki haliyle kopyalanır
+        compact = etree.XMLParser(remove_blank_text=True)
+        for name, data in self.parts.items():
+            if name.endswith('.rels') or name in SERIALIZED_PARTS:
+                self.parts[name] = etree.tostring(
+                    etree.fromstring(data, compact), encoding='UTF-8', xml_declaration=True, standalone=True,
+                )
+
+        # document.xml gövdenin sonundaki w:sectPr'den önce bölünür; paragraflar araya yazılır
+        root = etree.fromstring(self.parts.pop('word/document.xml'), compact)
+        body = root.find(f'{W}body')
+        sect_pr = body.find(f'{W}sectPr')
+        sect_pr.addprevious(etree.Comment('BODY'))
+        xml = etree.tostring(root, encoding='UTF-8', xml_declaration=True, standalone=True)
+        self.document_head, self.document_tail = xml.split(b'<!--BODY-->')
+
+        # Tablo sütunları python-docx'teki gibi sayfanın yazı alanını üçe böler
+        page_width = int(sect_pr.find(f'{W}pgSz').get(f'{W}w'))
+        margins = sect_pr.find(f'{W}pgMar')
+        column = round((page_width - int(margins.get(f'{W}left')) - int(margins.get(f'{W}right'))) / 3)
+        cell = f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{column}"/></w:tcPr>{{}}</w:tc>'
+        self.table_head = (
+            '<w:tbl><w:tblPr><w:tblW w:type="auto" w:w="0"/><w:tblLayout w:type="autofit"/>'
+            '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" w:noHBand="0" '
+            'w:noVBand="1" w:val="04A0"/></w:tblPr><w:tblGrid>'
+            + f'<w:gridCol w:w="{column}"/>' * 3 + '</w:tblGrid>'
+        )
+        self.cell = cell
+
+        self.rels = etree.fromstring(self.parts.pop('word/_rels/document.xml.rels'))
+
+        types = etree.fromstring(self.parts.pop('[Content_Types].xml'), compact)
+        known = {default.get('Extension').lower() for default in types.iter(f'{{{TYPES_NS}}}Default')}
+        for ext, content_type in IMAGE_CONTENT_TYPES.items():
+            if ext not in known:
+                types.insert(0, etree.Element(f'{{{TYPES_NS}}}Default', Extension=ext, ContentType=content_type))
+        self.content_types = etree.tostring(types, encoding='UTF-8', xml_declaration=True, standalone=True)
+
+
+def _get_template():
+    global _template
+    if _template is None:
+        _template = _Template()
+    return _template
+
+
+def _run_xml(text):
+    """python-docx'teki `paragraph.add_run(text)` ile aynı çalışma XML'i."""
+    if _INVALID_XML.search(text):
+        raise ValueError(
+            'All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters'
+        )
+    parts = []
+    for piece in _RUN_SPECIAL.split(text):
+        if piece == '\t':
+            parts.append('<w:tab/>')
+        elif piece in ('\r', '\n'):
+            parts.append('<w:br/>')
+        elif piece:
+            space = ' xml:space="preserve"' if len(piece.strip()) < len(piece) else ''
+            parts.append(f'<w:t{space}>{escape(piece)}</w:t>')
+    return f'<w:r>{"".join(parts)}</w:r>'
+
+
+class BulkDocxWriter:
+    """Word dosyasını python-docx nesne modeli kurmadan, XML'i doğrudan yazarak oluşturur.
+
+    Çıktı, create_word_with_images'ın python-docx ile ürettiği belgeyle aynı
+    gövde XML'ine ve aynı parçalara sahiptir. Resimler geldikçe ZIP'e yazılır;
+    gövde XML'i sonda document.xml olarak eklenir.
+    """
+
+    def __init__(self, buffer):
+        self._template = _get_template()
+        self._zip = zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED)
+        # Paket türünü tanıyan araçlar ilk girdinin [Content_Types].xml olmasını bekler
+        self._zip.writestr('[Content_Types].xml', self._template.content_types)
+        for name, data in self._template.parts.items():
+            self._zip.writestr(name, data)
+        self._body = tempfile.SpooledTemporaryFile(max_size=BODY_SPOOL_SIZE)
+        self._rels = []
+        self._media = {}
+        self._next_picture_id = 1
+        used = {rel.get('Id') for rel in self._template.rels}
+        self._free_rids = (f'rId{n}' for n in range(1, 1 << 30) if f'rId{n}' not in used)
+
+    def _write(self, xml):
+        self._body.write(xml.encode('utf-8'))
+
+    def add_paragraph(self, text):
+        self._write(f'<w:p>{_run_xml(text)}</w:p>' if text else '<w:p/>')
+
+    def _image_rid(self, image):
+        """Resim parçasını (aynı içerik bir kez) ZIP'e yazar ve ilişki kimliğini döndürür."""
+        rid = self._media.get(image.sha1)
+        if rid is None:
+            rid = next(self._free_rids)
+            partname = f'media/image{len(self._media) + 1}.{image.ext}'
+            self._zip.writestr(f'word/{partname}', image.blob)
+            self._rels.append((rid, partname))
+            self._media[image.sha1] = rid
+        return rid
+
+    def _picture_cell(self, data):
+        from docx.image.image import Image
+        from docx.shared import Inches
+
+        try:
+            image = Image.from_blob(data)
+            if image.ext not in IMAGE_CONTENT_TYPES:
+                raise ValueError(f"Desteklenmeyen resim türü: {image.ext}")
+            cx, cy = image.scaled_dimensions(Inches(3), None)
+        except Exception:
+            return FAILED_CELL_XML
+        rid = self._image_rid(image)
+        picture_id = self._next_picture_id
+        self._next_picture_id += 1
+        return PICTURE_XML.format(cx=cx, cy=cy, id=picture_id, filename=f'image.{image.ext}', rid=rid)
+
+    def add_image_grid(self, images):
+        """Sayfa sonu ve ardından en çok 9 resimlik 3x3 tablo ekler."""
+        self._write(PAGE_BREAK_XML)
+        cells = [self._picture_cell(image.data) for image in images]
+        cells += [EMPTY_CELL_XML] * (9 - len(cells))
+        rows = ''.join(
+            '<w:tr>' + ''.join(self._template.cell.format(cell) for cell in cells[i:i + 3]) + '</w:tr>'
+            for i in range(0, 9, 3)
+        )
+        self._write(f'{self._template.table_head}{rows}</w:tbl>')
+
+    def close(self):
+        """Gövdeyi document.xml olarak, ardından resim ilişkilerini yazıp paketi kapatır."""
+        with self._zip.open('word/document.xml', 'w') as f:
+            f.write(self._template.document_head)
+            self._body.seek(0)
+            shutil.copyfileobj(self._body, f, 1024 * 1024)
+            f.write(self._template.document_tail)
+        self._body.close()
+
+        rels = copy.deepcopy(self._template.rels)
+        for rid, partname in self._rels:
+            etree.SubElement(rels, f'{{{RELS_NS}}}Relationship', Id=rid, Type=IMAGE_REL, Target=partname)
+        self._zip.writestr('word/_rels/document.xml.rels', etree.tostring(
+            rels, encoding='UTF-8', xml_declaration=True, standalone=True,
+        ))
+        self._zip.close()
+
+
+def create_word_bulk(blocks, buffer):
+    """Blok akışındaki metni ve resimleri tek geçişte Word dosyasına yazar."""
+    try:
+        writer = BulkDocxWriter(buffer)
+        # create_word_with_images ile aynı düzen: metinler geldikçe, resimler 3x3 ızgara
+        # olarak (her sayfada 9 resim); kaynaktaki sayfa sonları yok sayılır
+        page_images = []
+        for block in blocks:
+            if isinstance(block, ParagraphBlock):
+                writer.add_paragraph(block.text)
+            elif isinstance(block, ImageBlock):
+                page_images.append(block.image)
+                if len(page_images) == 9:
+                    writer.add_image_grid(page_images)
+                    page_images = []
+        if page_images:
+            writer.add_image_grid(page_images)
+        writer.close()
+        return True
+    except Exception as e:
+        print(f"Word dosyası oluşturulurken hata: {e}")
+        return str(e)
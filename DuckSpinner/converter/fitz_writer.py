@@ -0,0 +1,171 @@
+import html
+
+from .backends import fitz
+from .document import ImageBlock, ParagraphBlock
+
+# Sayfa düzeni reportlab yolundaki (create_pdf_with_images) ile aynıdır: letter sayfa,
+# 30 pt kenar boşluğu ve platypus çerçevesinin 6 pt iç boşluğu
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+CONTENT_LEFT, CONTENT_TOP, CONTENT_RIGHT, CONTENT_BOTTOM = 36, 36, 576, 756
+
+# Paragraflar Helvetica 11/14; paragraflar arası 6 (önce) + 10 (Spacer) + 6 (sonra) pt
+# (line-height pt olarak verilince MuPDF paragraf aralarında sayfa bölmüyor; 14/11 oranı verilir)
+TEXT_CSS = (
+    'body {margin: 0; font-family: sans-serif; font-size: 11pt;} '
+    'p {margin: 0 0 22pt 0; line-height: 1.2727;}'
+)
+
+LINE_HEIGHT = 14
+
+# 3x3 resim ızgarası: 3.2 inç sütunlar, en çok 3 inç resimler, 5 pt hücre iç boşluğu
+GRID_COLUMN_WIDTH = 3.2 * 72
+GRID_IMAGE_MAX = 3 * 72
+GRID_PADDING = 5
+
+# Bu kadar paragraf tek bir Story'de yerleştirilir; bellek belge boyutuna göre büyümez
+PARAGRAPHS_PER_STORY = 64
+
+
+def _escape(text):
+    """Düz metni Story HTML'ine çevirir.
+
+    MuPDF (1.26) Story metnindeki karakter başvurularını iki kez çözer; tek
+    kaçırmada metindeki "&amp;" gibi diziler "&" olarak çıkıyordu. '&' bu
+    yüzden iki kez kaçırılır.
+    """
+    return html.escape(text.replace('&', '&amp;'))
+
+
+class _Output:
+    """PyMuPDF'in yazabileceği dosya nesnesi.
+
+    fitz, `name` özniteliği olan nesneleri dosya yolu sanır; SpooledTemporaryFile'ın
+    `name`'i None olduğu için yazma, seek, tell ve truncate bu sarmalayıcıdan verilir.
+    """
+
+    def __init__(self, f):
+        self.write = f.write
+        self.seek = f.seek
+        self.tell = f.tell
+        self.truncate = f.truncate
+
+
+def _image_size(image):
+    """reportlab'daki Image(...)._restrictSize(3 inç, 3 inç) ile aynı çizim boyutu."""
+    width, height = float(image.width), float(image.height)
+    if width > GRID_IMAGE_MAX or height > GRID_IMAGE_MAX:
+        factor = min(GRID_IMAGE_MAX / width, GRID_IMAGE_MAX / height)
+        width *= factor
+        height *= factor
+    return width, height
+
+
+class FitzPdfWriter:
+    """Blokları fitz.Story ile doğrudan çıktı dosyasına yazan PDF oluşturucu."""
+
+    def __init__(self, buffer):
+        self._writer = fitz.DocumentWriter(_Output(buffer), 'compress')
+        self._page_rect = fitz.Rect(0, 0, PAGE_WIDTH, PAGE_HEIGHT)
+        self._device = None
+        self._top = CONTENT_TOP
+        self._pages = 0
+
+    def _begin_page(self):
+        self._device = self._writer.begin_page(self._page_rect)
+        self._top = CONTENT_TOP
+        self._pages += 1
+
+    def _end_page(self):
+        self._writer.end_page()
+        self._device = None
+
+    def add_paragraphs(self, texts):
+        """Paragrafları kaldığı yerden akıtır; sayfa dolunca yeni sayfaya geçer."""
+        story = fitz.Story(
+            ''.join(f'<p>{_escape(text)}</p>' for text in texts), user_css=TEXT_CSS
+        )
+        more = True
+        while more:
+            # Önceki Story sayfanın dibinde bittiyse boş dikdörtgene yerleştirme yapılmaz;
+            # MuPDF bu durumda metni sayfa dışına akıtıyor
+            if self._device is not None and CONTENT_BOTTOM - self._top < LINE_HEIGHT:
+                self._end_page()
+            if self._device is None:
+                self._begin_page()
+            where = fitz.Rect(CONTENT_LEFT, self._top, CONTENT_RIGHT, CONTENT_BOTTOM)
+            more, filled = story.place(where)
+            story.draw(self._device)
+            if more:
+                self._end_page()
+            else:
+                self._top = filled[3]
+
+    def add_image_grid(self, images):
+        """En çok 9 resmi yeni bir sayfada, tablo ortalanmış 3x3 ızgara olarak yerleştirir."""
+        if self._device is not None:
+            self._end_page()
+        self._begin_page()
+
+        archive = fitz.Archive()
+        table_left = CONTENT_LEFT + (CONTENT_RIGHT - CONTENT_LEFT - 3 * GRID_COLUMN_WIDTH) / 2
+        row_top = CONTENT_TOP
+        for row_start in range(0, len(images), 3):
+            row = [(image, _image_size(image)) for image in images[row_start:row_start + 3]]
+            row_height = max(height for _, (_, height) in row) + 2 * GRID_PADDING
+            for col, (image, (width, height)) in enumerate(row):
+                # Hücre içinde yatay ve dikey ortalanır (ALIGN/VALIGN CENTER/MIDDLE)
+                x = table_left + col * GRID_COLUMN_WIDTH + (GRID_COLUMN_WIDTH - width) / 2
+                y = row_top + (row_height - height) / 2
+                name = f'img{row_start + col}.{image.ext}'
+                try:
+                    archive.add(image.data, name)
+                    story = fitz.Story(
+                        f'<img src="{name}" style="width:{width}pt;height:{height}pt">',
+                        user_css='body {margin: 0;}', archive=archive,
+                    )
+                    story.place(fitz.Rect(x, y, x + width + 1, y + height + 1))
+                    story.draw(self._device)
+                except Exception as e:
+                    print(f"Resim PDF'e eklenemedi: {e}")
+            row_top += row_height
+        self._end_page()
+
+    def close(self):
+        if self._device is not None:
+            self._end_page()
+        if not self._pages:
+            # Boş belge de geçerli bir PDF olsun
+            self._begin_page()
+            self._end_page()
+        self._writer.close()
+
+
+def create_pdf_with_fitz(blocks, buffer):
+    """Blok akışındaki metni ve resimleri PyMuPDF ile PDF'e dönüştürür."""
+    try:
+        writer = FitzPdfWriter(buffer)
+        texts = []
+        page_images = []
+        for block in blocks:
+            if isinstance(block, ParagraphBlock):
+                texts.append(block.text)
+                if len(texts) == PARAGRAPHS_PER_STORY:
+                    writer.add_paragraphs(texts)
+                    texts = []
+            elif isinstance(block, ImageBlock):
+                if texts:
+                    writer.add_paragraphs(texts)
+                    texts = []
+                page_images.append(block.image)
+                if len(page_images) == 9:
+                    writer.add_image_grid(page_images)
+                    page_images = []
+        if texts:
+            writer.add_paragraphs(texts)
+        if page_images:
+            writer.add_image_grid(page_images)
+        writer.close()
+        return True
+    except Exception as e:
+        print(f"PDF oluşturulurken hata: {e}")
+        return str(e)
@@ -0,0 +1,12 @@
+"""forkserver sunucusunda bir kez içe aktarılır (bkz. isolation._context).
+
+Django'yu kurar ve dönüştürme kütüphanelerini yükler; sunucudan çatallanan
+izole alt süreçler bunları hazır bulur.
+"""
+import django
+
+django.setup()
+
+from .backends import preload  # noqa: E402
+
+preload()
@@ -0,0 +1,109 @@
+import hashlib
+import io
+from collections import namedtuple
+
+from .backends import PILImage
+
+# Bellekte tutulan resim: ham baytlar, piksel boyutları ve dosya uzantısı
+ExtractedImage = namedtuple('ExtractedImage', ['data', 'width', 'height', 'ext'])
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def content_digest(data):
+    """Resmin tüm içeriğinin SHA-256 özetini parça parça hesaplar."""
+    digest = hashlib.sha256()
+    view = memoryview(data)
+    for start in range(0, len(view), HASH_CHUNK_SIZE):
+        digest.update(view[start:start + HASH_CHUNK_SIZE])
+    return digest.digest()
+
+
+class ImageDeduplicator:
+    """Çıkarıcılar ve oluşturucular arasında paylaşılan tekrar eleme aşaması.
+
+    Önce kaynak kimliğine bakılır (PDF xref'i, PPTX resim parçası); aynı
+    kaynak ikinci kez görülürse baytları hiç çıkarılmaz. Farklı kaynaklardan
+    gelen aynı içerik ise tam içerik özetiyle yakalanır.
+    """
+
+    def __init__(self):
+        self._seen_sources = set()
+        self._seen_digests = set()
+        self.duplicates = 0
+
+    def seen_source(self, source):
+        """Kaynak daha önce görüldüyse True döndürür ve tekrarı sayar."""
+        if source in self._seen_sources:
+            self.duplicates += 1
+            return True
+        self._seen_sources.add(source)
+        return False
+
+    def add(self, image):
+        """Resim ilk kez görülüyorsa True, içerik tekrarıysa False döndürür."""
+        digest = content_digest(image.data)
+        if digest in self._seen_digests:
+            self.duplicates += 1
+            return False
+        self._seen_digests.add(digest)
+        return True
+
+    def unique(self, images):
+        return [image for image in images if self.add(image)]
+
+
+def prepare_image(image, max_px, jpeg_quality=85, png_compress_level=6):
+    """Resmi `max_px` x `max_px` kutusuna sığacak şekilde küçültüp yeniden kodlar.
+
+    Zaten kutuya sığan ya da PIL'in açamadığı resimler olduğu gibi döner.
+    Saydamlığı olan resimler PNG, diğerleri JPEG olarak kodlanır.
+    """
+    if image.width <= max_px and image.height <= max_px:
+        return image
+    try:
+        with PILImage.open(io.BytesIO(image.data)) as im:
+            # JPEG'lerde kod çözücü doğrudan küçük ölçekte açar (çok daha hızlı)
+            im.draft('RGB', (max_px, max_px))
+            im.thumbnail((max_px, max_px), PILImage.LANCZOS)
+            has_alpha = im.mode in ('RGBA', 'LA') or (im.mode == 'P' and 'transparency' in im.info)
+            out = io.BytesIO()
+            if has_alpha:
+                im.save(out, 'PNG', optimize=True, compress_level=png_compress_level)
+                ext = 'png'
+            else:
+                if im.mode != 'RGB':
+                    im = im.convert('RGB')
+                im.save(out, 'JPEG', quality=jpeg_quality, optimize=True)
+                ext = 'jpeg'
+            width, height = im.size
+    except Exception as e:
+        print(f"Resim küçültülemedi, orijinali kullanılıyor: {e}")
+        return image
+    data = out.getvalue()
+    if len(data) >= len(image.data):
+        return image
+    return ExtractedImage(data, width, height, ext)
+
+
+def prepare_images(images, cell_inches, dpi, jpeg_quality=85, png_compress_level=6, cache=None):
+    """Resimleri ızgara hücresinin boyutuna (`cell_inches` x `dpi` piksel) hazırlar.
+
+    Resimler geldikçe tek tek işlenir; sonuç bir üreteçtir. `cache` (PageCache)
+    verilirse küçültülen resimlerin sonucu içerik özetiyle saklanır; belge
+    yeniden yüklendiğinde değişmeyen resimler yeniden kodlanmaz.
+    """
+    max_px = max(1, int(cell_inches * dpi))
+    settings_key = f'{max_px}:{jpeg_quality}:{png_compress_level}'
+    for image in images:
+        if cache is None or (image.width <= max_px and image.height <= max_px):
+            yield prepare_image(image, max_px, jpeg_quality, png_compress_level)
+            continue
+        key = cache.unit_key('image', content_digest(image.data), settings_key)
+        prepared = cache.get_image(key)
+        if prepared is None:
+            prepared = prepare_image(image, max_px, jpeg_quality, png_compress_level)
+            cache.put_image(key, prepared, original=prepared is image)
+        elif prepared is True:
+            prepared = image
+        yield prepared
@@ -0,0 +1,270 @@
+import asyncio
+import contextvars
+import importlib
+import multiprocessing
+import os
+import pickle
+import signal
+import threading
+import time
+from collections import namedtuple
+
+from .metrics import StageTimer, count, merge_timings
+
+# Alt sürecin süresi ve belleği bu aralıkla denetlenir (saniye)
+WATCH_INTERVAL = 0.05
+
+# Adım üreteçlerinin (bkz. run_steps) alt süreçte çalıştırılmasını istediği çağrı
+IsolatedCall = namedtuple('IsolatedCall', 'func args timeout memory_limit')
+
+
+def _context():
+    """Alt sürecin başlatma yöntemi.
+
+    fork, yüklü kütüphaneleri yeniden yüklemeden miras aldığı için alt süreç
+    hemen başlar; ama süreçte başka iş parçacıkları varken (ASGI'da
+    sync_to_async havuzu, gthread işçileri) çatallanan alt süreç onların
+    tuttuğu kilitleri (logging, sqlite) kilitli devralıp takılabilir. Bu
+    durumda tek iş parçacıklı forkserver sunucusundan çatallanır; sunucu
+    Django'yu ve kütüphaneleri bir kez yükler. forkserver yoksa spawn.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if 'fork' in methods and threading.active_count() == 1:
+        return multiprocessing.get_context('fork')
+    if 'forkserver' in methods:
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['converter.forkserver_preload'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def _rss(pid):
+    """Sürecin yerleşik belleği (bayt); okunamıyorsa (Linux dışı) None."""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _reset_inherited_state():
+    """Fork ile kopyalanan ama alt süreçte çalışmayan durumu sıfırlar."""
+    # Üst sürecin süreç havuzlarının yönetici iş parçacıkları kopyalanmaz; alt süreç
+    # gerekirse kendi havuzunu kurar
+    from . import batch, chunked_pdf, pdf_text
+
+    batch._pool = None
+    chunked_pdf._pool = None
+    pdf_text._pool = None
+
+
+def shutdown_pools():
+    """Bu süreçte açılmış süreç havuzlarını kapatır.
+
+    multiprocessing ile açılmış bir süreç çıkarken daemon olmayan çocuklarını
+    bekler; iş bekleyen havuz işçileri kapatılmazsa süreç hiç sonlanmaz.
+    """
+    from . import batch, chunked_pdf, pdf_text
+
+    for module in (batch, chunked_pdf, pdf_text):
+        pool, module._pool = module._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def _child(conn, payload):
+    """Alt süreçte çalışır: işlevi kendi zamanlayıcısıyla çalıştırıp sonucu borudan gönderir."""
+    # Kendi süreç grubunu açar; öldürülünce açtığı süreçler de birlikte sonlanır
+    if hasattr(os, 'setpgrp'):
+        os.setpgrp()
+    import django
+    from django.apps import apps
+
+    if not apps.ready:  # spawn
+        django.setup()
+    _reset_inherited_state()
+    # İşlev ve argümanlar (ör. views'taki Preview) Django kurulduktan sonra çözülür
+    module, name, args = pickle.loads(payload)
+    func = getattr(importlib.import_module(module), name)
+
+    timer = StageTimer()
+    try:
+        with timer:
+            result = func(*args)
+    except Exception as e:
+        result = str(e)
+    conn.send((result, timer.durations, timer.counts))
+    conn.close()
+    # Ör. sayfa-paralel PDF motorunun havuzu; açık kalırsa süreç çıkamaz ve üst süreç join'de takılır
+    shutdown_pools()
+
+
+def _kill(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        # Windows ya da süreç grubunu henüz açmamış alt süreç
+        process.kill()
+    process.join()
+
+
+def _start(func, args):
+    context = _context()
+    receiver, sender = context.Pipe(duplex=False)
+    payload = pickle.dumps((func.__module__, func.__qualname__, args))
+    process = context.Process(target=_child, args=(sender, payload))
+    process.start()
+    sender.close()
+    return process, receiver
+
+
+def _check(process, deadline, timeout, memory_limit):
+    """Süre ya da bellek sınırı aşıldıysa hata metnini döndürür."""
+    if deadline is not None and time.perf_counter() > deadline:
+        return f"Dönüştürme süre sınırını ({timeout} sn) aştı."
+    if memory_limit and (_rss(process.pid) or 0) > memory_limit:
+        return f"Dönüştürme bellek sınırını ({memory_limit // (1024 * 1024)} MB) aştı."
+    return None
+
+
+def _finish(process, message, error, started):
+    if message is None:
+        count('killed')
+        return error or f"Dönüştürme süreci beklenmedik biçimde sonlandı (çıkış kodu {process.exitcode})."
+    result, durations, counts = message
+    merge_timings(durations, counts)
+    merge_timings({'isolation': max(0.0, time.perf_counter() - started - sum(durations.values()))}, {})
+    return result
+
+
+def run_isolated(func, args, timeout=0, memory_limit=0):
+    """`func(*args)`'ı ayrı bir süreçte çalıştırıp sonucunu döndürür.
+
+    Süre `timeout` saniyeyi ya da sürecin yerleşik belleği `memory_limit`
+    baytı aşarsa (0 = sınırsız) süreç öldürülür ve hata metni döndürülür;
+    sorunlu bir dosya böylece web işçisini kilitleyemez ya da çökertemez.
+    Alt süreçteki aşama süreleri ve sayaçlar etkin zamanlayıcıya eklenir;
+    süreç açma ve bekleme payı 'isolation' aşamasına yazılır.
+    """
+    started = time.perf_counter()
+    process, receiver = _start(func, args)
+    deadline = started + timeout if timeout else None
+    message = error = None
+    try:
+        while message is None and error is None:
+            if receiver.poll(WATCH_INTERVAL):
+                try:
+                    message = receiver.recv()
+                except EOFError:
+                    break
+            elif not process.is_alive() and not receiver.poll():
+                break
+            else:
+                error = _check(process, deadline, timeout, memory_limit)
+    finally:
+        receiver.close()
+        if message is None and process.is_alive():
+            _kill(process)
+    process.join()
+    return _finish(process, message, error, started)
+
+
+async def _readable(fds, timeout):
+    """Tanımlayıcılardan biri okunabilir olana ya da `timeout` dolana kadar döngüyü bekletmeden bekler."""
+    loop = asyncio.get_running_loop()
+    ready = loop.create_future()
+
+    def wake():
+        if not ready.done():
+            ready.set_result(None)
+
+    for fd in fds:
+        loop.add_reader(fd, wake)
+    try:
+        await asyncio.wait_for(ready, timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        for fd in fds:
+            loop.remove_reader(fd)
+
+
+async def run_isolated_async(func, args, timeout=0, memory_limit=0):
+    """run_isolated'ın olay döngüsünde beklenen sürümü.
+
+    Alt sürecin borusu ve bitiş tanımlayıcısı (sentinel) olay döngüsüne
+    kaydedilir; dönüştürme sürerken hiçbir iş parçacığı beklemede tutulmaz.
+    Yalnızca süreci başlatmak (forkserver'a bağlanmak) bir iş parçacığında yapılır.
+    """
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    process, receiver = await loop.run_in_executor(None, _start, func, args)
+    deadline = started + timeout if timeout else None
+    message = error = None
+    try:
+        while message is None and error is None:
+            await _readable([receiver.fileno(), process.sentinel], WATCH_INTERVAL)
+            if receiver.poll():
+                try:
+                    message = receiver.recv()
+                except EOFError:
+                    break
+            elif not process.is_alive():
+                break
+            else:
+                error = _check(process, deadline, timeout, memory_limit)
+    finally:
+        receiver.close()
+        if message is None and process.is_alive():
+            _kill(process)
+    # Sonucu gönderen alt süreç havuzlarını kapatıp çıkana kadar döngü bekletilmez
+    while process.is_alive():
+        await _readable([process.sentinel], WATCH_INTERVAL)
+    process.join()
+    return _finish(process, message, error, started)
+
+
+def _advance(steps, value):
+    """Üreteci bir adım ilerletir; (bitti mi, istenen çağrı ya da dönüş değeri) döndürür."""
+    try:
+        return False, steps.send(value)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+def run_steps(steps):
+    """Alt süreç çağrıları (IsolatedCall) üreten bir adım üretecini sonuna kadar sürer.
+
+    Üreteç her çağrının sonucunu `yield` ifadesinin değeri olarak alır ve
+    sonunda `return` ile dönüş değerini verir. Böylece aynı kod hem burada
+    (eşzamanlı) hem de run_steps_async ile (olay döngüsünde) çalışır.
+    """
+    done, value = _advance(steps, None)
+    while not done:
+        done, value = _advance(steps, run_isolated(*value))
+    return value
+
+
+async def run_steps_async(steps):
+    """Adım üretecini olay döngüsünde sürer.
+
+    Üretecin eşzamanlı kısımları (form ayrıştırma, önbellek, yük kabulü) kısa
+    süreliğine bir iş parçacığında, alt süreç ise run_isolated_async ile olay
+    döngüsünde beklenir. Tüm adımlar aynı contextvars bağlamında çalışır;
+    üretecin açtığı zamanlayıcı adımlar ve alt süreç boyunca etkin kalır.
+    """
+    from asgiref.sync import sync_to_async
+
+    context = contextvars.copy_context()
+    step = sync_to_async(context.run, thread_sensitive=False)
+    done = False
+    try:
+        done, value = await step(_advance, steps, None)
+        while not done:
+            result = await asyncio.get_running_loop().create_task(run_isolated_async(*value), context=context)
+            done, value = await step(_advance, steps, result)
+        return value
+    finally:
+        if not done:
+            # İstemci koptu ya da hata oldu: üretecin finally blokları (çalışma alanı, yük payı) çalışır
+            await step(steps.close)
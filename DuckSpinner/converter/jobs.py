@@ -0,0 +1,118 @@
+import os
+import shutil
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .admission import admission, estimate_cost
+from .metrics import StageTimer, count, record_conversion, stage
+from .models import ConversionJob
+from .workspace import request_workspace
+
+
+def claim_next_job():
+    """Sıradaki işi atomik olarak 'running' durumuna alır; iş yoksa None döndürür."""
+    while True:
+        job = ConversionJob.objects.filter(status=ConversionJob.QUEUED).order_by('created_at').first()
+        if job is None:
+            return None
+        # Aynı işi başka bir süreç daha önce almışsa güncelleme 0 satır döndürür
+        with transaction.atomic():
+            claimed = ConversionJob.objects.filter(pk=job.pk, status=ConversionJob.QUEUED).update(
+                status=ConversionJob.RUNNING, started_at=timezone.now()
+            )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def requeue_interrupted_jobs(stale_after=None):
+    """Çöken işçilerden kalan 'running' işleri tekrar sıraya koyar.
+
+    Yalnızca `stale_after` (verilmezse JOB_STALE_AFTER) saniyeden önce
+    başlamış işler alınır; başka bir canlı işçinin şu an dönüştürdüğü işler
+    (dönüştürme süre sınırıyla kesildiği için bundan kısa sürer) dokunulmadan kalır.
+    """
+    if stale_after is None:
+        stale_after = settings.CONVERTER_JOB_STALE_AFTER
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    return ConversionJob.objects.filter(status=ConversionJob.RUNNING, started_at__lt=cutoff).update(
+        status=ConversionJob.QUEUED, started_at=None
+    )
+
+
+def run_job(job):
+    """Bir işi dönüştürür, sonucu kaydeder ve girdi dosyasını siler."""
+    # views modülü dönüştürme hattını ve önbelleği barındırır
+    from .views import OUTPUT_FORMATS, cache_key_for, conversion_cache, run_conversion
+
+    file_path = job.input_file.path
+    file_ext = os.path.splitext(file_path)[1].lower()
+    input_bytes = job.input_file.size
+    timer = StageTimer()
+    try:
+        with timer, request_workspace(prefix='job-') as workspace:
+            cache_key = None
+            output = None
+            if conversion_cache is not None:
+                with stage('cache_lookup'), open(file_path, 'rb') as f:
+                    cache_key = cache_key_for(iter(lambda: f.read(64 * 1024), b''),
+                                              job.output_format, job.with_images)
+                    output = conversion_cache.get(cache_key)
+                if output is not None:
+                    count('cache_hits')
+
+            if output is None:
+                # Sıradan alınan iş reddedilmez ama maliyeti web isteklerinin yük kabulünde sayılır
+                cost = estimate_cost(file_path, file_ext, input_bytes, job.with_images)
+                with admission.admit(cost, force=True):
+                    result, output = run_conversion(file_path, file_ext, job.output_format, job.with_images,
+                                                    workspace, label=f'job-{file_ext.lstrip(".")}')
+                if result is not True:
+                    raise RuntimeError(result)
+                if cache_key is not None:
+                    with stage('cache_store'):
+                        try:
+                            output.seek(0)
+                            conversion_cache.put(cache_key, output)
+                        except OSError as e:
+                            print(f"Sonuç önbelleğe yazılamadı: {e}")
+
+            with output:
+                output.seek(0, os.SEEK_END)
+                count('output_bytes', output.tell())
+                output.seek(0)
+                file_extension = OUTPUT_FORMATS[job.output_format][1]
+                job.result_file.save(f'converted.{file_extension}', File(output), save=False)
+        job.status = ConversionJob.DONE
+    except Exception as e:
+        job.status = ConversionJob.FAILED
+        job.error = str(e)
+    finally:
+        job.finished_at = timezone.now()
+        job.input_file.delete(save=False)
+        job.save(update_fields=['input_file', 'result_file', 'status', 'error', 'finished_at'])
+    if job.status == ConversionJob.FAILED:
+        result = 'error'
+    else:
+        result = 'cache_hit' if timer.counts.get('cache_hits') else 'ok'
+    record_conversion(timer, file_ext, job.output_format, job.with_images, result, input_bytes)
+    return job
+
+
+def delete_expired_jobs(max_age):
+    """`max_age` saniyeden önce bitmiş işleri dosyalarıyla birlikte siler."""
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    expired = ConversionJob.objects.filter(
+        status__in=[ConversionJob.DONE, ConversionJob.FAILED], finished_at__lt=cutoff
+    )
+    count = 0
+    for job in expired:
+        job_dir = os.path.join(settings.MEDIA_ROOT, 'jobs', str(job.id))
+        job.delete()
+        shutil.rmtree(job_dir, ignore_errors=True)
+        count += 1
+    return count
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from converter.benchmark import KINDS, PRESETS, STAGES, compare, ensure_corpus, environment, run_stages
+
+
+class Command(BaseCommand):
+    help = (
+        "Sentetik DOCX/PPTX/PDF derlemi üretir ve dönüştürme aşamalarının sürelerini ve "
+        "tepe belleğini ölçer. Ağ bağlantısı gerekmez."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--preset', action='append', choices=sorted(PRESETS),
+                            help='Hazır boyut (birden çok kez verilebilir; varsayılan: small ve medium)')
+        parser.add_argument('--pages', type=int, help='Sayfa/slayt sayısı (hazır boyutların yerine)')
+        parser.add_argument('--paragraphs', type=int, default=8, help='Sayfa başına paragraf')
+        parser.add_argument('--images', type=int, default=10, help='Belge başına resim sayısı')
+        parser.add_argument('--image-px', type=int, default=1200, help='Resimlerin kenar uzunluğu (piksel)')
+        parser.add_argument('--kind', action='append', choices=KINDS, help='Girdi türü (varsayılan: hepsi)')
+        parser.add_argument('--stage', action='append', choices=STAGES, help='Ölçülecek aşama (varsayılan: hepsi)')
+        parser.add_argument('--seed', type=int, default=0, help='Derlem üretiminin tohumu')
+        parser.add_argument('--repeat', type=int, default=3, help='Tekrar sayısı (en iyisi raporlanır)')
+        parser.add_argument('--corpus-dir', default=os.path.join(tempfile.gettempdir(), 'duckspinner-benchmark'),
+                            help='Üretilen girdilerin saklandığı dizin')
+        parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+        parser.add_argument('--compare', help='Karşılaştırılacak önceki JSON sonuç dosyası')
+
+    def handle(self, *args, **options):
+        if options['pages']:
+            configs = {'custom': {
+                'pages': options['pages'],
+                'paragraphs': options['paragraphs'],
+                'images': options['images'],
+                'image_px': options['image_px'],
+            }}
+        else:
+            configs = {name: PRESETS[name] for name in options['preset'] or ['small', 'medium']}
+        kinds = options['kind'] or list(KINDS)
+        stages = tuple(options['stage'] or STAGES)
+
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Karşılaştırma dosyası okunamadı: {e}")
+
+        results = []
+        for name, params in configs.items():
+            self.stdout.write(f"Derlem '{name}' hazırlanıyor: {params}")
+            for path in ensure_corpus(options['corpus_dir'], kinds, params, options['seed']):
+                result = run_stages(path, options['repeat'], stages)
+                result['preset'] = name
+                result['params'] = params
+                results.append(result)
+                self.write_result(result)
+
+        report = {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'repeat': options['repeat'],
+            'seed': options['seed'],
+            'environment': environment(),
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Sonuçlar yazıldı: {options['output']}"))
+
+        if baseline is not None:
+            self.stdout.write(
+                f"Karşılaştırma: {baseline['environment'].get('commit')} -> {report['environment']['commit']}"
+            )
+            for row in compare(baseline, report):
+                ratio = row['time_ratio']
+                line = (
+                    f"  {row['input']:<40} {row['stage']:<17} "
+                    f"{row['seconds_before'] * 1000:9.1f} -> {row['seconds_after'] * 1000:9.1f} ms "
+                    f"({f'{ratio:.2f}x' if ratio else '-'})  bellek {row['peak_mb_before']:.1f} -> {row['peak_mb_after']:.1f} MB"
+                )
+                if ratio and ratio > 1.1:
+                    line = self.style.WARNING(line)
+                self.stdout.write(line)
+
+    def write_result(self, result):
+        self.stdout.write(
+            f"{result['input']} ({result['input_bytes'] / 1024:.0f} KB, {result['paragraphs']} paragraf, "
+            f"{result['images']} resim)"
+        )
+        for stage, m in result['stages'].items():
+            self.stdout.write(
+                f"  {stage:<17} {m['best_seconds'] * 1000:9.1f} ms (ort. {m['mean_seconds'] * 1000:.1f})  "
+                f"tepe bellek {m['peak_python_mb']:.1f} MB"
+            )
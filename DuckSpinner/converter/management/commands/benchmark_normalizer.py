@@ -0,0 +1,68 @@
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from converter.normalizer import DEFAULT_WORDS, TextNormalizer
+
+
+def legacy_fix_text_formatting(text):
+    """Eski, kelime başına ayrı re.sub çalıştıran uygulama (karşılaştırma için)."""
+    for word in DEFAULT_WORDS:
+        text = re.sub(rf'\b{word}\b', f' {word} ', text, flags=re.IGNORECASE)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def make_sample(size, seed=0):
+    """Kelime listesinden ve rastgele kelimelerden yaklaşık `size` karakterlik metin üretir."""
+    rng = random.Random(seed)
+    vocabulary = list(DEFAULT_WORDS) + [
+        'patient', 'nurse', 'Therapy', 'hospital', 'dose', 'care', 'Anatomy',
+        'hemşire', 'tedavi', 'ilaç', 'theandof', 'cannot', 'island', 'ASSESSMENT',
+    ]
+    separators = [' ', ' ', ' ', '  ', '\n', '\t', ', ', '. ']
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(vocabulary)
+        sep = rng.choice(separators)
+        parts.append(word)
+        parts.append(sep)
+        length += len(word) + len(sep)
+    return ''.join(parts)[:size]
+
+
+class Command(BaseCommand):
+    help = "Metin düzelticinin hızını eski fix_text_formatting ile karşılaştırır (MB/s)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=4000, help='Örnek paragraf uzunluğu (karakter)')
+        parser.add_argument('--count', type=int, default=500, help='Paragraf sayısı')
+        parser.add_argument('--repeat', type=int, default=3, help='Tekrar sayısı (en iyisi alınır)')
+
+    def handle(self, *args, **options):
+        samples = [make_sample(options['size'], seed=i) for i in range(options['count'])]
+        total_mb = sum(len(s.encode('utf-8')) for s in samples) / (1024 * 1024)
+        normalizer = TextNormalizer()
+
+        for sample in samples:
+            if legacy_fix_text_formatting(sample) != normalizer(sample):
+                self.stderr.write(self.style.ERROR('Çıktılar farklı! Örnek: %r' % sample[:80]))
+                return
+
+        results = {}
+        for name, func in (('legacy', legacy_fix_text_formatting), ('normalizer', normalizer)):
+            best = float('inf')
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                for sample in samples:
+                    func(sample)
+                best = min(best, time.perf_counter() - start)
+            results[name] = best
+            self.stdout.write(f'{name:>10}: {best:.3f} s  {total_mb / best:.2f} MB/s')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Hızlanma: {results["legacy"] / results["normalizer"]:.1f}x ({total_mb:.2f} MB, çıktılar birebir aynı)'
+        ))
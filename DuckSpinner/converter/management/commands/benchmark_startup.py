@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Alt süreçte çalışır: bir gunicorn işçisinin açılışta yaptığını (wsgi uygulamasını yükleme)
+# ölçer, ardından her biçimin ilk kullanımının maliyetini ölçer.
+PROBE = r'''
+import json, os, resource, sys, time
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+start = time.perf_counter()
+from duckspinner.wsgi import application
+boot = time.perf_counter() - start
+report = {'boot_seconds': boot, 'boot_rss_mb': rss_mb()}
+
+from converter.backends import FORMAT_BACKENDS, load_format, loaded_formats
+report['loaded_at_boot'] = loaded_formats()
+first_use = {}
+for name in FORMAT_BACKENDS:
+    t = time.perf_counter()
+    load_format(name)
+    first_use[name] = time.perf_counter() - t
+report['first_use_seconds'] = first_use
+report['all_loaded_rss_mb'] = rss_mb()
+print(json.dumps(report))
+'''
+
+
+class Command(BaseCommand):
+    help = "İşçi açılış süresini ve belleğini tembel (varsayılan) ve ön yüklemeli modlarda ölçer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3, help='Her mod için tekrar sayısı (en iyisi alınır)')
+        parser.add_argument('--json', action='store_true', help='Sonuçları JSON olarak yaz')
+
+    def run_probe(self, preload):
+        env = dict(os.environ, PRELOAD_BACKENDS='true' if preload else 'false',
+                   DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'duckspinner.settings'))
+        out = subprocess.run([sys.executable, '-c', PROBE], cwd=settings.BASE_DIR, env=env,
+                             capture_output=True, text=True, check=True)
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        results = {}
+        for mode, preload in (('lazy', False), ('preload', True)):
+            runs = [self.run_probe(preload) for _ in range(options['repeat'])]
+            results[mode] = min(runs, key=lambda r: r['boot_seconds'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for mode, r in results.items():
+            self.stdout.write(
+                f"{mode:>8}: açılış {r['boot_seconds'] * 1000:7.1f} ms, RSS {r['boot_rss_mb']:6.1f} MB "
+                f"(hepsi yüklenince {r['all_loaded_rss_mb']:.1f} MB)"
+            )
+        lazy = results['lazy']
+        self.stdout.write("İlk kullanım maliyeti (tembel mod):")
+        for name, seconds in lazy['first_use_seconds'].items():
+            self.stdout.write(f"  {name:>10}: {seconds * 1000:7.1f} ms")
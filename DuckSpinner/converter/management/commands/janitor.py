@@ -0,0 +1,53 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from converter.jobs import delete_expired_jobs
+from converter.metrics import registry
+from converter.page_cache import PageCache
+from converter.workspace import disk_metrics, sweep_stale
+
+
+class Command(BaseCommand):
+    help = "Çökmelerden kalan geçici dosyaları ve süresi dolan işleri temizler, disk kullanımını raporlar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age', type=int, default=settings.CONVERTER_JANITOR_MAX_AGE,
+                            help='Bu kadar saniyeden eski geçici dosyalar silinir')
+        parser.add_argument('--job-retention', type=int, default=settings.CONVERTER_JOB_RETENTION,
+                            help='Bitmiş işlerin saklanma süresi (sn)')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Verilirse bu aralıkla (sn) sürekli çalışır')
+        parser.add_argument('--json', action='store_true', help='Ölçümleri JSON satırı olarak yaz')
+
+    def handle(self, *args, **options):
+        while True:
+            report = sweep_stale(options['max_age'])
+            report['expired_jobs'] = delete_expired_jobs(options['job_retention'])
+            # Sunucu süreçleri sayfa önbelleğinin yalnızca kendi yazdıklarını izler; toplam sınır burada uygulanır
+            report['page_cache_evicted'] = PageCache(
+                settings.CONVERTER_PAGE_CACHE_DIR, settings.CONVERTER_PAGE_CACHE_MAX_BYTES
+            ).evict()
+            report['metrics_pruned'] = registry.prune() if registry.directory else 0
+            report.update(disk_metrics())
+            if options['json']:
+                self.stdout.write(json.dumps(report))
+            else:
+                self.stdout.write(
+                    f"Silinen: {report['removed_entries']} kayıt, {report['removed_files']} dosya, "
+                    f"{report['removed_bytes'] / (1024 * 1024):.1f} MB; süresi dolan iş: {report['expired_jobs']}; "
+                    f"sayfa önbelleğinden çıkarılan: {report['page_cache_evicted']}; "
+                    f"sonlanmış süreçlerin metrik dosyası: {report['metrics_pruned']}"
+                )
+                self.stdout.write(
+                    f"Kullanım: çalışma alanı {report['workspace_bytes'] / (1024 * 1024):.1f} MB, "
+                    f"önbellek {report['cache_bytes'] / (1024 * 1024):.1f} MB, "
+                    f"sayfa önbelleği {report['page_cache_bytes'] / (1024 * 1024):.1f} MB, "
+                    f"işler {report['jobs_bytes'] / (1024 * 1024):.1f} MB; "
+                    f"boş disk {report['disk_free_bytes'] / (1024 ** 3):.1f} GB"
+                )
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
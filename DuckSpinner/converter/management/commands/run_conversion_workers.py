@@ -0,0 +1,88 @@
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from converter.isolation import shutdown_pools
+from converter.jobs import claim_next_job, requeue_interrupted_jobs, run_job
+
+
+def _exit(signum, frame):
+    sys.exit(0)
+
+
+def worker_loop(poll_interval):
+    """Alt süreç: sıradaki işleri alıp dönüştürür, iş yoksa bekler."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # terminate() ile gelen SIGTERM yığını çözerek çıkar; run_isolated böylece alt sürecini öldürür
+    signal.signal(signal.SIGTERM, _exit)
+    try:
+        while True:
+            job = claim_next_job()
+            if job is None:
+                time.sleep(poll_interval)
+                continue
+            run_job(job)
+    finally:
+        # PDF sayfa havuzu açık kalırsa işçi çıkamaz
+        shutdown_pools()
+
+
+def start_worker(poll_interval):
+    """İşçi süreci başlatır.
+
+    İşçiler daemon değildir: daemon süreç alt süreç açamaz, oysa dönüştürme
+    run_isolated ile, büyük PDF'lerin metni süreç havuzuyla alt süreçlerde
+    çalışır. Bu yüzden komut kapanırken işçiler açıkça sonlandırılıp beklenir.
+    """
+    worker = multiprocessing.Process(target=worker_loop, args=(poll_interval,))
+    worker.start()
+    return worker
+
+
+class Command(BaseCommand):
+    help = "Arka plan dönüştürme işlerini (ConversionJob) yerel işçi süreçleriyle çalıştırır."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='İşçi süreç sayısı')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Boş kuyrukta bekleme süresi (sn)')
+
+    def handle(self, *args, **options):
+        requeued = requeue_interrupted_jobs()
+        if requeued:
+            self.stdout.write(f'{requeued} yarım kalmış iş tekrar sıraya alındı.')
+
+        # Alt süreçler ana sürecin veritabanı bağlantısını paylaşmamalı
+        connections.close_all()
+        # SIGTERM de Ctrl+C gibi aşağıdaki kapanış yolundan geçer; yoksa işçiler sahipsiz kalır
+        signal.signal(signal.SIGTERM, _exit)
+        workers = [start_worker(options['poll_interval']) for _ in range(options['processes'])]
+        self.stdout.write(self.style.SUCCESS(f'{len(workers)} işçi süreç çalışıyor. Durdurmak için Ctrl+C.'))
+
+        try:
+            last_requeue = time.monotonic()
+            while True:
+                # Çöken işçilerin (bu ya da başka bir komutun) bayatlamış işleri zaman zaman geri alınır
+                if time.monotonic() - last_requeue > settings.CONVERTER_JOB_STALE_AFTER / 2:
+                    requeued = requeue_interrupted_jobs()
+                    if requeued:
+                        self.stdout.write(f'{requeued} yarım kalmış iş tekrar sıraya alındı.')
+                    connections.close_all()
+                    last_requeue = time.monotonic()
+                # Ölen işçiyi yeniden başlat
+                for i, w in enumerate(workers):
+                    if not w.is_alive():
+                        workers[i] = start_worker(options['poll_interval'])
+                time.sleep(5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for w in workers:
+                w.terminate()
+            for w in workers:
+                w.join()
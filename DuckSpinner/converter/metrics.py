@@ -0,0 +1,394 @@
+import copy
+import cProfile
+import glob
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Dönüştürme süreleri için kovalar (saniye)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_current_timer = ContextVar('conversion_timer', default=None)
+
+
+class StageTimer:
+    """Bir dönüştürmenin aşamalarına harcanan süreyi ayrı ayrı toplar.
+
+    Çıkarıcılar ve oluşturucular iç içe (akış halinde) çalıştığı için süreler
+    dışlayıcıdır: bir aşama başka bir aşamayı çağırdığında (ör. oluşturucu bir
+    sonraki bloğu istediğinde) içteki süre dıştakinden düşülür.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.counts = {}
+        self._stack = []
+        self._mark = None
+        self._started = None
+        self._finished = None
+        self._token = None
+
+    def __enter__(self):
+        self._started = self._mark = time.perf_counter()
+        self._token = _current_timer.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        self._finished = time.perf_counter()
+        _current_timer.reset(self._token)
+        self._token = None
+
+    def _switch(self):
+        now = time.perf_counter()
+        if self._stack:
+            name = self._stack[-1]
+            self.durations[name] = self.durations.get(name, 0.0) + now - self._mark
+        self._mark = now
+
+    @contextmanager
+    def stage(self, name):
+        self._switch()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._switch()
+            self._stack.pop()
+
+    def count(self, name, n=1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def merge(self, durations, counts):
+        for name, seconds in durations.items():
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+        for name, n in counts.items():
+            self.count(name, n)
+
+    @property
+    def total(self):
+        if self._started is None:
+            return 0.0
+        return (self._finished or time.perf_counter()) - self._started
+
+    def server_timing(self):
+        """Server-Timing başlığının değeri (süreler milisaniye)."""
+        parts = [f'{name};dur={seconds * 1000:.1f}' for name, seconds in self.durations.items()]
+        parts.append(f'total;dur={self.total * 1000:.1f}')
+        return ', '.join(parts)
+
+
+def stage(name):
+    """Etkin bir zamanlayıcı varsa aşamayı ölçen, yoksa hiçbir şey yapmayan bağlam."""
+    timer = _current_timer.get()
+    return timer.stage(name) if timer is not None else nullcontext()
+
+
+def count(name, n=1):
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.count(name, n)
+
+
+def merge_timings(durations, counts):
+    """Başka bir süreçte ölçülmüş aşama sürelerini ve sayaçları etkin zamanlayıcıya ekler."""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.merge(durations, counts)
+
+
+def timed_iter(name, iterable):
+    """Üretecin her bir sonraki öğesi için harcanan süreyi `name` aşamasına yazar."""
+    iterator = iter(iterable)
+    while True:
+        with stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(label, '')) for label in self.labelnames)
+
+    def _labels(self, key, extra=()):
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ''
+        escaped = (
+            (k, v.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')) for k, v in pairs
+        )
+        return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def merge(self, key, value):
+        self.values[key] = self.values.get(key, 0) + value
+
+    def render(self, values):
+        for key, value in sorted(values.items()):
+            yield f'{self.name}{self._labels(key)} {value}'
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames, buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        # [kova sayıları..., toplam, adet]
+        state = self.values.setdefault(key, [0] * (len(self.buckets) + 2))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[i] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def merge(self, key, value):
+        state = self.values.setdefault(key, [0] * (len(self.buckets) + 2))
+        for i, v in enumerate(value):
+            state[i] += v
+
+    def render(self, values):
+        for key, state in sorted(values.items()):
+            for bound, n in zip(self.buckets, state):
+                yield f'{self.name}_bucket{self._labels(key, [("le", repr(float(bound)))])} {n}'
+            yield f'{self.name}_bucket{self._labels(key, [("le", "+Inf")])} {state[-1]}'
+            yield f'{self.name}_sum{self._labels(key)} {state[-2]}'
+            yield f'{self.name}_count{self._labels(key)} {state[-1]}'
+
+
+def _process_start(pid):
+    """Sürecin başlama zamanı (/proc'taki saat tıkı); okunamazsa None.
+
+    pid'ler yeniden kullanıldığı için bir dosyanın hâlâ aynı sürece ait olup
+    olmadığı pid ile birlikte buna bakılarak anlaşılır.
+    """
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            # İkinci alan (komut adı) boşluk içerebilir; sayım son ')' işaretinden sonra başlar
+            return f.read().rpartition(')')[2].split()[19]
+    except (OSError, IndexError):
+        return None
+
+
+def _process_alive(pid, start):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    current = _process_start(pid)
+    return current is None or start == '0' or current == start
+
+
+class Registry:
+    """Süreç içi metrik kaydı; Prometheus metin biçiminde dışa verilir.
+
+    `directory` verilirse her süreç kendi değerlerini oraya
+    `<pid>-<başlama zamanı>.json` olarak yazar ve dışa verirken tüm süreçlerin
+    değerleri toplanır (gunicorn'un birden çok işçisi ve arka plan işçileri tek
+    bir uç noktadan görünür). Sonlanmış süreçlerin dosyaları her süreç ilk
+    yazışında ve janitor çalıştıkça silinir.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.metrics = {}
+        self._lock = threading.Lock()
+        self._snapshot_pid = None
+        self._snapshot_name = None
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.metrics.setdefault(name, Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.metrics.setdefault(name, Histogram(name, documentation, labelnames, buckets))
+
+    @contextmanager
+    def update(self):
+        """Değerleri kilit altında değiştirir; çıkışta süreç dosyasını yazar."""
+        with self._lock:
+            yield
+            if self.directory:
+                self._write_snapshot(self._snapshot())
+
+    def _snapshot(self):
+        return {
+            name: [[list(key), value] for key, value in metric.values.items()]
+            for name, metric in self.metrics.items()
+        }
+
+    def _own_file(self):
+        """Bu sürecin dosya adı; çatallanan süreçler (gunicorn işçileri) kendi adlarını alır."""
+        pid = os.getpid()
+        if self._snapshot_pid != pid:
+            self._snapshot_pid = pid
+            self._snapshot_name = f'{pid}-{_process_start(pid) or "0"}.json'
+            if self.directory:
+                self.prune()
+        return os.path.join(self.directory, self._snapshot_name)
+
+    def _write_snapshot(self, snapshot):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            own_file = self._own_file()
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, own_file)
+        except OSError as e:
+            print(f"Metrik dosyası yazılamadı: {e}")
+
+    def prune(self):
+        """Sonlanmış süreçlerin dosyalarını siler; silinen dosya sayısını döndürür."""
+        removed = 0
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            pid, _, start = os.path.basename(path)[:-len('.json')].partition('-')
+            try:
+                alive = _process_alive(int(pid), start or '0')
+            except ValueError:
+                continue
+            if alive:
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def _collect(self):
+        """Bu sürecin ve (dizin varsa) diğer süreçlerin değerlerini birleştirir."""
+        with self._lock:
+            own = self._snapshot()
+        merged = {}
+        for name, metric in self.metrics.items():
+            merged[name] = copy.copy(metric)
+            merged[name].values = {}
+        snapshots = [own]
+        if self.directory:
+            own_file = self._own_file()
+            for path in glob.glob(os.path.join(self.directory, '*.json')):
+                if path == own_file:
+                    continue
+                try:
+                    with open(path) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        for snapshot in snapshots:
+            for name, entries in snapshot.items():
+                if name not in merged:
+                    continue
+                for key, value in entries:
+                    merged[name].merge(tuple(key), value)
+        return merged
+
+    def render(self):
+        lines = []
+        for name, metric in self._collect().items():
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            lines.extend(metric.render(metric.values))
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry(settings.CONVERTER_METRICS_DIR or None)
+
+CONVERSION_SECONDS = registry.histogram(
+    'converter_conversion_seconds', 'Dönüştürme süresi (önbellekten dönenler dahil)',
+    ('input_type', 'output_format', 'with_images'),
+)
+STAGE_SECONDS = registry.histogram(
+    'converter_stage_seconds', 'Dönüştürme aşamalarının dışlayıcı süresi',
+    ('stage', 'input_type', 'output_format'),
+)
+CONVERSIONS = registry.counter(
+    'converter_conversions_total', 'Dönüştürme sayısı (result: ok, cache_hit, error, rejected)',
+    ('input_type', 'output_format', 'result'),
+)
+INPUT_BYTES = registry.counter('converter_input_bytes_total', 'Yüklenen dosya baytları', ('input_type',))
+OUTPUT_BYTES = registry.counter('converter_output_bytes_total', 'Üretilen dosya baytları', ('output_format',))
+INPUT_PAGES = registry.counter(
+    'converter_input_pages_total', 'Metni olan kaynak sayfa/slayt sayısı', ('input_type',)
+)
+IMAGES = registry.counter('converter_images_total', 'Çıktıya gömülen resim sayısı', ('input_type',))
+KILLED = registry.counter(
+    'converter_killed_total', 'Süre/bellek sınırını aştığı ya da çöktüğü için sonlanan dönüştürmeler',
+    ('input_type',),
+)
+PAGE_CACHE = registry.counter(
+    'converter_page_cache_total', 'Sayfa önbelleği aramaları (kind: page/slide/image, result: hit/miss)',
+    ('kind', 'result'),
+)
+
+
+def record_conversion(timer, file_ext, output_format, with_images, result, input_bytes):
+    """Biten bir dönüştürmenin süre, aşama ve bayt/sayfa değerlerini kaydeder."""
+    input_type = file_ext.lstrip('.')
+    with registry.update():
+        CONVERSION_SECONDS.observe(
+            timer.total, input_type=input_type, output_format=output_format,
+            with_images='true' if with_images else 'false',
+        )
+        for name, seconds in timer.durations.items():
+            STAGE_SECONDS.observe(seconds, stage=name, input_type=input_type, output_format=output_format)
+        CONVERSIONS.inc(input_type=input_type, output_format=output_format, result=result)
+        INPUT_BYTES.inc(input_bytes, input_type=input_type)
+        OUTPUT_BYTES.inc(timer.counts.get('output_bytes', 0), output_format=output_format)
+        INPUT_PAGES.inc(timer.counts.get('pages', 0), input_type=input_type)
+        IMAGES.inc(timer.counts.get('images', 0), input_type=input_type)
+        KILLED.inc(timer.counts.get('killed', 0), input_type=input_type)
+        for name, value in timer.counts.items():
+            if name.startswith('page_cache_'):
+                kind, _, outcome = name[len('page_cache_'):].rpartition('_')
+                PAGE_CACHE.inc(value, kind=kind, result=outcome)
+
+
+@contextmanager
+def maybe_profile(label):
+    """Örneklenen isteklerde bloğu cProfile ile çalıştırıp sonucu PROFILE_DIR'e yazar."""
+    rate = settings.CONVERTER_PROFILE_SAMPLE_RATE
+    if rate <= 0 or random.random() >= rate:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        try:
+            os.makedirs(settings.CONVERTER_PROFILE_DIR, exist_ok=True)
+            name = f'{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{uuid.uuid4().hex[:8]}-{label}.prof'
+            profiler.dump_stats(os.path.join(settings.CONVERTER_PROFILE_DIR, name))
+        except OSError as e:
+            print(f"Profil yazılamadı: {e}")
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.deprecation import MiddlewareMixin
+
+# Form alanları ve multipart sınırları için yükleme sınırına eklenen pay
+FORM_OVERHEAD = 64 * 1024
+
+
+def upload_too_large_message(limit=None):
+    limit = limit or settings.CONVERTER_MAX_UPLOAD_SIZE
+    return f"Dosya çok büyük. En fazla {limit // (1024 * 1024)} MB yükleyebilirsiniz."
+
+
+def upload_limit(setting='CONVERTER_MAX_UPLOAD_SIZE', json=False):
+    """Görünümün POST gövdesini `setting` ayarındaki boyutla sınırlar (UploadLimitMiddleware uygular).
+
+    `json` ise 413 yanıtı JSON olarak döner. Diğer görünüm süsleyicilerinin
+    üstüne yazılmalıdır.
+    """
+    def decorator(view):
+        view.upload_limit = (setting, json)
+        return view
+    return decorator
+
+
+class UploadLimitMiddleware(MiddlewareMixin):
+    """Sınırı aşan yüklemeyi gövde ayrıştırılmadan, Content-Length'e bakarak 413 ile reddeder.
+
+    CsrfViewMiddleware'den önce gelmelidir: CSRF denetimi request.POST'u
+    okuyunca tüm multipart gövde ayrıştırılıp geçici dosyaya yazılır.
+    WSGI'da gövde hiç okunmaz; ASGI sunucusu gövdeyi görünüme gelmeden
+    önce alır ama yine de ayrıştırılmaz.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        upload = getattr(view_func, 'upload_limit', None)
+        if upload is None or request.method != 'POST':
+            return None
+        setting, json = upload
+        limit = getattr(settings, setting)
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        if content_length <= limit + FORM_OVERHEAD:
+            return None
+        message = upload_too_large_message(limit)
+        if json:
+            return JsonResponse({'error': message}, status=413)
+        return HttpResponse(message, status=413)
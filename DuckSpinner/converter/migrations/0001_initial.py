@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-17 20:10
+
+import converter.models
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConversionJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('original_name', models.CharField(max_length=255)),
+                ('input_file', models.FileField(max_length=255, upload_to=converter.models.job_input_path)),
+                ('output_format', models.CharField(default='pdf', max_length=10)),
+                ('with_images', models.BooleanField(default=False)),
+                ('status', models.CharField(choices=[('queued', 'Sırada'), ('running', 'Dönüştürülüyor'), ('done', 'Tamamlandı'), ('failed', 'Başarısız')], db_index=True, default='queued', max_length=10)),
+                ('result_file', models.FileField(blank=True, max_length=255, upload_to=converter.models.job_result_path)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
@@ -1,3 +1,45 @@
+import os
+import uuid
+
 from django.db import models
 
-# Create your models here.
+
+def job_input_path(instance, filename):
+    return os.path.join('jobs', str(instance.id), 'input' + os.path.splitext(filename)[1].lower())
+
+
+def job_result_path(instance, filename):
+    return os.path.join('jobs', str(instance.id), filename)
+
+
+class ConversionJob(models.Model):
+    """Arka planda, yerel işçi süreçleri tarafından yapılan bir dönüştürme işi."""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Sırada'),
+        (RUNNING, 'Dönüştürülüyor'),
+        (DONE, 'Tamamlandı'),
+        (FAILED, 'Başarısız'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    original_name = models.CharField(max_length=255)
+    input_file = models.FileField(upload_to=job_input_path, max_length=255)
+    output_format = models.CharField(max_length=10, default='pdf')
+    with_images = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    result_file = models.FileField(upload_to=job_result_path, max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f'{self.original_name} ({self.get_status_display()})'
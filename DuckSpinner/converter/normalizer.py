@@ -0,0 +1,76 @@
+import re
+
+# Etrafına boşluk eklenen yaygın kelimeler (sıra, eski replacements sözlüğü ile aynı)
+DEFAULT_WORDS = (
+    'the', 'and', 'an', 'a', 'of', 'in', 'on', 'at', 'to', 'for', 'with',
+    'by', 'from', 'as', 'is', 'are', 'was', 'were', 'be', 'have', 'has',
+    'had', 'do', 'does', 'did', 'will', 'would', 'shall', 'should', 'can',
+    'could', 'may', 'might', 'must',
+)
+
+
+def _trie_pattern(words):
+    """Kelime listesinden ortak önekleri paylaşan (trie biçiminde) bir regex üretir."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ''
+        optional = '' in node
+        if len(alternatives) == 1 and not optional:
+            return alternatives[0]
+        return '(?:%s)%s' % ('|'.join(alternatives), '?' if optional else '')
+
+    return build(trie)
+
+
+class TextNormalizer:
+    """Kelime birleştirme düzeltmesini tek derlenmiş desenle, tek geçişte yapar.
+
+    Eski uygulama her kelime için ayrı bir re.sub çalıştırıp ardından boşlukları
+    topluyordu. Burada bütün kelimeler tek bir trie deseninde birleşir; çıktı
+    eski döngü ile birebir aynıdır.
+    """
+
+    def __init__(self, words=DEFAULT_WORDS):
+        # Büyük/küçük harf farkı olan tekrarlarda eski döngüdeki gibi sonuncusu kazanır
+        unique = {}
+        for w in words:
+            if w:
+                unique[w.lower()] = w
+        self.words = tuple(unique.values())
+        self._pattern = None
+        if self.words:
+            # Kelimeler harfle başlayıp bittiği sürece bakınmalar \b ile aynı işi görür, daha hızlıdır
+            self._pattern = re.compile(r'(?<!\w)%s(?!\w)' % _trie_pattern(self.words), re.IGNORECASE)
+            if not all(re.fullmatch(r'\w(?:.*\w)?', w, re.DOTALL) for w in self.words):
+                self._pattern = re.compile(
+                    r'\b(?:%s)\b' % '|'.join(re.escape(w) for w in self.words), re.IGNORECASE
+                )
+        # Eşleşen yazım -> yerine konacak metin (yeni yazımlar ilk görüldüğünde eklenir)
+        self._replacements = {w: f' {w} ' for w in self.words}
+
+    def _replace(self, match):
+        found = match.group()
+        replacement = self._replacements.get(found)
+        if replacement is None:
+            # 'The', 'THE' veya 'ſ' gibi özel harf katlamaları: hangi kelimeye uyduğunu bul
+            for w in self.words:
+                if re.fullmatch(re.escape(w), found, re.IGNORECASE):
+                    replacement = self._replacements[found] = f' {w} '
+                    break
+        return replacement
+
+    def normalize(self, text):
+        if self._pattern is not None:
+            text = self._pattern.sub(self._replace, text)
+        # Fazla boşlukları temizle (str.split, re'nin \s sınıfı ile aynı karakterleri böler)
+        return ' '.join(text.split())
+
+    __call__ = normalize
@@ -0,0 +1,328 @@
+import io
+import itertools
+import os
+import posixpath
+import zipfile
+
+from .backends import etree
+
+READERS = ('stream', 'library')
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+P = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PR = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+
+def _open_zip(source):
+    """Paketi dosya yolundan ya da dosya benzeri nesneden açar."""
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    return zipfile.ZipFile(source)
+
+
+def _iterparse(stream, depth):
+    """Parçayı artımlı ayrıştırır; `depth` derinliğindeki her öğeyi kapanınca üretir.
+
+    Üretilen öğe tüketildikten sonra ağaçtan çıkarılır; bellekte belgenin
+    tamamı değil yalnızca o anki öğe tutulur. Ayrıştırıcı seçenekleri
+    python-docx/python-pptx'inkilerle aynıdır (boş metin düğümleri atılır).
+    """
+    level = 0
+    for event, elem in etree.iterparse(
+        stream, events=('start', 'end'), remove_blank_text=True, resolve_entities=False,
+    ):
+        if event == 'start':
+            level += 1
+            continue
+        if level == depth:
+            yield elem
+            elem.getparent().remove(elem)
+        level -= 1
+
+
+def _relationships(archive, partname):
+    """Parçanın ilişkilerini {rId: (tür, hedef parça adı)} olarak döndürür."""
+    directory, name = posixpath.split(partname)
+    rels_name = posixpath.join(directory, '_rels', f'{name}.rels')
+    try:
+        root = etree.fromstring(archive.read(rels_name), etree.XMLParser(resolve_entities=False))
+    except KeyError:
+        return {}
+    rels = {}
+    for rel in root.iter(f'{PR}Relationship'):
+        if rel.get('TargetMode') == 'External':
+            continue
+        target = rel.get('Target', '')
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        rels[rel.get('Id')] = (rel.get('Type'), target)
+    return rels
+
+
+def _main_part(archive, root_tag):
+    """Paketin ana belge parçasını bulur; kök öğesi beklenen değilse hata verir."""
+    for rel_type, target in _relationships(archive, '').values():
+        if rel_type == OFFICE_DOCUMENT:
+            break
+    else:
+        raise ValueError("Paketin ana belge parçası bulunamadı")
+    with archive.open(target) as stream:
+        for _, elem in etree.iterparse(stream, events=('start',), resolve_entities=False):
+            if elem.tag != root_tag:
+                raise ValueError(f"Beklenmeyen ana belge türü: {elem.tag}")
+            break
+    return target
+
+
+def _word_run_text(r):
+    """python-docx'teki Run.text ile aynı: metin, sekme, satır sonu ve bölünmez tire."""
+    parts = []
+    for child in r:
+        tag = child.tag
+        if tag == f'{W}t':
+            parts.append(child.text or '')
+        elif tag in (f'{W}tab', f'{W}ptab'):
+            parts.append('\t')
+        elif tag == f'{W}br':
+            # Sayfa ve sütun sonları metne katılmaz
+            if child.get(f'{W}type', 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif tag == f'{W}cr':
+            parts.append('\n')
+        elif tag == f'{W}noBreakHyphen':
+            parts.append('-')
+    return ''.join(parts)
+
+
+def _word_paragraph_text(p):
+    """python-docx'teki Paragraph.text ile aynı: doğrudan çalışmalar ve köprülerin çalışmaları."""
+    parts = []
+    for child in p:
+        if child.tag == f'{W}r':
+            parts.append(_word_run_text(child))
+        elif child.tag == f'{W}hyperlink':
+            parts.extend(_word_run_text(r) for r in child if r.tag == f'{W}r')
+    return ''.join(parts)
+
+
+def iter_word_paragraphs_stream(source):
+    """word/document.xml'i ZIP'ten artımlı okuyarak gövdedeki paragrafların metnini üretir.
+
+    python-docx'in `Document.paragraphs` listesiyle aynı paragrafları (tablo
+    içindekiler hariç, gövdenin doğrudan paragrafları) aynı metinle verir.
+    """
+    with _open_zip(source) as archive:
+        document = _main_part(archive, f'{W}document')
+        # w:document / w:body / w:p
+        with archive.open(document) as stream:
+            for elem in _iterparse(stream, 3):
+                if elem.tag == f'{W}p' and elem.getparent().tag == f'{W}body':
+                    yield _word_paragraph_text(elem)
+
+
+def iter_word_paragraphs_library(source):
+    """python-docx ile paragrafların metnini üretir (yedek okuyucu)."""
+    from docx import Document
+
+    for paragraph in Document(source).paragraphs:
+        yield paragraph.text
+
+
+def _slide_paragraph_text(p):
+    """python-pptx'teki _Paragraph.text ile aynı: satır sonu (a:br) dikey sekme olur."""
+    parts = []
+    for child in p:
+        if child.tag in (f'{A}r', f'{A}fld'):
+            t = child.find(f'{A}t')
+            if t is not None:
+                parts.append(t.text or '')
+        elif child.tag == f'{A}br':
+            parts.append('\v')
+    return ''.join(parts)
+
+
+def _slide_picture(elem):
+    """Şekil python-pptx'te resim (MSO_SHAPE_TYPE.PICTURE) ise gömülü resmin rId'sini döndürür.
+
+    Yer tutucu resimler ve videolar resim sayılmaz (False); gömülü resmi
+    olmayan resim şekli için None döner.
+    """
+    nv_pr = elem.find(f'{P}nvPicPr/{P}nvPr')
+    if nv_pr is not None and (nv_pr.find(f'{P}ph') is not None or nv_pr.find(f'{A}videoFile') is not None):
+        return False
+    blip = elem.find(f'{P}blipFill/{A}blip')
+    return blip.get(f'{R}embed') if blip is not None else None
+
+
+def _slide_shapes(stream):
+    """Bir slayttaki şekillerin (p:sp) metinlerini ve resim şekillerinin (p:pic) rId'lerini, slayttaki sırasıyla döndürür."""
+    texts = []
+    pictures = []
+    # p:sld / p:cSld / p:spTree / p:sp
+    for elem in _iterparse(stream, 4):
+        if elem.getparent().tag != f'{P}spTree':
+            continue
+        if elem.tag == f'{P}pic':
+            rid = _slide_picture(elem)
+            if rid is not False:
+                pictures.append(rid)
+            continue
+        if elem.tag != f'{P}sp':
+            continue
+        body = elem.find(f'{P}txBody')
+        if body is None:
+            continue
+        texts.append('\n'.join(_slide_paragraph_text(p) for p in body if p.tag == f'{A}p'))
+    return texts, pictures
+
+
+class SlideReader:
+    """PPTX'i bir kez açıp slaytları bir kez dolaşan okuyucu.
+
+    `slide_texts` her slayt için şekil metinlerini üretir; `pictures=True` ise
+    aynı geçişte resim şekillerinin parça adlarını (gömülü resmi yoksa None)
+    slayt sırasıyla `self.pictures`'a ekler. Resimlerin baytları ardından
+    `read_picture` ile aynı paketten okunur, paket `close` ile kapanır.
+    `max_slides` verilirse yalnızca ilk o kadar slayt okunur (önizleme).
+    """
+
+    def __init__(self, source, reader='stream', cache=None, pictures=False, max_slides=None):
+        self.source = source
+        self.reader = reader
+        self.cache = cache
+        self.collect_pictures = pictures
+        self.max_slides = max_slides
+        self.pictures = []
+        self._archive = None
+        self._parts = {}
+
+    def _stream(self, source):
+        """Slaytları presentation.xml'deki sırayla okuyup her slayt için şekil metinlerini üretir.
+
+        python-pptx'te `hasattr(shape, 'text')` olan şekillerin (p:sp) `shape.text`
+        değerleriyle aynıdır; gruplar, tablolar ve resimler atlanır. `cache`
+        (PageCache) verilirse metinler ve resim rId'leri slayt XML'inin özetiyle
+        saklanır ve değişmeyen slaytlar yeniden ayrıştırılmaz.
+        """
+        archive = self._archive = _open_zip(source)
+        try:
+            presentation = _main_part(archive, f'{P}presentation')
+            rels = _relationships(archive, presentation)
+            root = etree.fromstring(archive.read(presentation), etree.XMLParser(resolve_entities=False))
+            slide_ids = root.find(f'{P}sldIdLst')
+            partnames = [rels[sld_id.get(f'{R}id')][1] for sld_id in (slide_ids if slide_ids is not None else ())]
+            for partname in partnames[:self.max_slides]:
+                if self.cache is None:
+                    with archive.open(partname) as stream:
+                        texts, pictures = _slide_shapes(stream)
+                else:
+                    data = archive.read(partname)
+                    key = self.cache.unit_key('slide', data)
+                    cached = self.cache.get_text('slide', key)
+                    if cached is None:
+                        texts, pictures = _slide_shapes(io.BytesIO(data))
+                        self.cache.put_text(key, [texts, pictures])
+                    else:
+                        texts, pictures = cached
+                if self.collect_pictures and pictures:
+                    slide_rels = _relationships(archive, partname)
+                    self.pictures.extend(slide_rels.get(rid, (None, None))[1] for rid in pictures)
+                yield texts
+        finally:
+            # Resimler okunacaksa paket close'a kadar açık kalır
+            if not self.collect_pictures:
+                self.close()
+
+    def _library(self, source):
+        """python-pptx ile her slayt için şekil metinlerini üretir (yedek okuyucu)."""
+        from pptx import Presentation
+        from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+        self.close()
+        self.pictures = []
+        for slide in itertools.islice(Presentation(source).slides, self.max_slides):
+            if self.collect_pictures:
+                for shape in slide.shapes:
+                    if shape.shape_type != MSO_SHAPE_TYPE.PICTURE:
+                        continue
+                    try:
+                        part = shape.part.related_part(shape._element.blip_rId)
+                    except Exception:
+                        self.pictures.append(None)
+                        continue
+                    self._parts[part.partname] = part
+                    self.pictures.append(part.partname)
+            yield [shape.text for shape in slide.shapes if hasattr(shape, 'text')]
+
+    def slide_texts(self):
+        """Seçilen okuyucuyla slaytları üretir; 'stream' başarısız olursa python-pptx'e düşülür."""
+        return _with_fallback(self._stream, self._library, self.source, self.reader)
+
+    def read_picture(self, partname):
+        """`pictures`'taki bir parçanın baytlarını döndürür."""
+        if partname in self._parts:
+            return self._parts[partname].blob
+        return self._archive.read(partname)
+
+    def close(self):
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_slide_texts_stream(source, cache=None):
+    """SlideReader'ın akış okuyucusuyla her slayt için şekil metinlerini üretir."""
+    return SlideReader(source, cache=cache)._stream(source)
+
+
+def iter_slide_texts_library(source):
+    """python-pptx ile her slayt için şekil metinlerini üretir (yedek okuyucu)."""
+    return SlideReader(source)._library(source)
+
+
+def _with_fallback(stream_reader, library_reader, source, reader):
+    if reader not in READERS:
+        raise ValueError(f"Bilinmeyen OOXML okuyucusu: {reader}")
+    if reader == 'library':
+        yield from library_reader(source)
+        return
+
+    produced = 0
+    try:
+        for item in stream_reader(source):
+            produced += 1
+            yield item
+    except Exception as e:
+        if produced:
+            raise
+        print(f"OOXML akış okuyucusu başarısız, kütüphaneye dönülüyor: {e}")
+        yield from library_reader(source)
+
+
+def iter_word_paragraphs(source, reader='stream'):
+    """Word paragraflarının metnini seçilen okuyucuyla üretir.
+
+    'stream' başarısız olursa (henüz paragraf üretmeden) python-docx'e
+    düşülür; akışın ortasındaki hata ise tekrar üretmemek için yükseltilir.
+    """
+    return _with_fallback(iter_word_paragraphs_stream, iter_word_paragraphs_library, source, reader)
+
+
+def iter_slide_texts(source, reader='stream', cache=None):
+    """Her slayt için şekil metinlerinin listesini seçilen okuyucuyla üretir (yedek: python-pptx).
+
+    `cache` yalnızca 'stream' okuyucusunda kullanılır.
+    """
+    return SlideReader(source, reader, cache).slide_texts()
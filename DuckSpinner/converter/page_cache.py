@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+
+from .cache import CACHE_VERSION, ConversionCache
+from .images import ExtractedImage
+from .metrics import count
+
+# Kayıt türleri: PDF sayfası metni, slaydın şekil metinleri, hazırlanmış resim
+KINDS = ('page', 'slide', 'image')
+
+
+class PageCache(ConversionCache):
+    """Sayfa, slayt ve resim düzeyindeki ara sonuçları içerik özetine göre saklayan önbellek.
+
+    Sonuç önbelleği yalnızca birebir aynı dosyada işe yarar; biraz düzenlenip
+    yeniden yüklenen belgede burada değişmeyen sayfaların metni ve resimlerin
+    hazırlanmış hali bulunur, yalnızca değişen kısım yeniden işlenir. Kayıtlar
+    küçük ve çok olduğu için boyut sınırı her yazımda değil, dönüştürme
+    sonunda `flush` ile uygulanır; toplam boyut yazımlarla süreç içinde
+    izlendiğinden dizin yalnızca ilk seferde ve sınır aşılınca taranır.
+    Başka süreçlerin yazdıkları janitor'ın `evict` çağrısıyla sınıra çekilir. İsabet ve ıskalar türlerine göre
+    dönüştürmenin sayaçlarına (page_cache_<tür>_hit/miss) yazılır.
+    """
+
+    def __init__(self, root, max_bytes):
+        super().__init__(root, max_bytes)
+        self._written = False
+
+    @staticmethod
+    def unit_key(kind, *parts):
+        """Kayıt türü ve sonucu belirleyen parçalardan (bayt ya da metin) anahtar üretir."""
+        digest = hashlib.sha256(f'{kind}|v{CACHE_VERSION}'.encode())
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode()
+            # Parçaların sınırı belli olsun diye her birinin önüne uzunluğu yazılır
+            digest.update(b'|%d|' % len(part))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def has(self, kind, key):
+        """Kaydın var olup olmadığına okumadan bakar; yoksa ıskayı sayar."""
+        if os.path.exists(self._path(key)):
+            return True
+        count(f'page_cache_{kind}_miss')
+        return False
+
+    def _read(self, kind, key):
+        f = self.get(key)
+        count(f'page_cache_{kind}_{"miss" if f is None else "hit"}')
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def _write(self, key, data):
+        size = self.put(key, data, evict=False)
+        with self._lock:
+            if size and self._size is not None:
+                self._size += size
+            self._written = True
+
+    def get_text(self, kind, key):
+        data = self._read(kind, key)
+        return None if data is None else json.loads(data)
+
+    def put_text(self, key, value):
+        """Metni ya da metin listesini JSON olarak saklar."""
+        self._write(key, json.dumps(value, ensure_ascii=False).encode())
+
+    def get_image(self, key):
+        """Hazırlanmış resmi döndürür; resim olduğu gibi kullanılacaksa True, kayıt yoksa None."""
+        data = self._read('image', key)
+        if data is None:
+            return None
+        header, _, body = data.partition(b'\n')
+        header = json.loads(header)
+        if header.get('original'):
+            return True
+        return ExtractedImage(body, header['width'], header['height'], header['ext'])
+
+    def put_image(self, key, image, original=False):
+        """Hazırlanmış resmi saklar; `original` ise yalnızca "olduğu gibi kullan" işareti yazılır."""
+        if original:
+            self._write(key, b'{"original": true}\n')
+            return
+        header = json.dumps({'width': image.width, 'height': image.height, 'ext': image.ext})
+        self._write(key, header.encode() + b'\n' + image.data)
+
+    def flush(self):
+        """Yazım olduysa ve bilinen toplam boyut sınırı aştıysa (ya da henüz bilinmiyorsa) eski kayıtları siler."""
+        if not self._written:
+            return
+        self._written = False
+        if self._size is None or self._size > self.max_bytes:
+            self.evict()
@@ -0,0 +1,322 @@
+import hashlib
+import io
+import itertools
+import math
+import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager, nullcontext
+
+from .backends import fitz
+from .normalizer import TextNormalizer
+from .workspace import create_workspace, remove_workspace
+
+ENGINES = ('auto', 'fitz', 'parallel', 'pypdf2')
+
+_pool = None
+_pool_size = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    """Sayfa aralıkları için süreç havuzunu ilk kullanımda oluşturur ve saklar."""
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_size != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_size = workers
+        return _pool
+
+
+def _reset_pool(broken):
+    """İşçisi ölen havuzu kapatır; sonraki _get_pool yenisini kurar."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit_all(workers, func, tasks):
+    """Görevleri havuza verir; havuz daha önce bozulduysa yenisini kurup bir kez daha dener."""
+    pool = _get_pool(workers)
+    try:
+        return pool, [pool.submit(func, *args) for args in tasks]
+    except (BrokenProcessPool, RuntimeError):
+        _reset_pool(pool)
+        pool = _get_pool(workers)
+        return pool, [pool.submit(func, *args) for args in tasks]
+
+
+def _result(pool, future):
+    """Görevin sonucu; işçi öldüyse havuz atılır ki sonraki çıkarmalar yenisini kullansın."""
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        raise
+
+
+@contextmanager
+def _spooled(source):
+    """Alt süreçlere gönderilecek PDF yolu; bellekteki kaynak bir kez çalışma alanına yazılır.
+
+    Böylece her aralık görevine bütün PDF baytları değil, yalnızca yol gönderilir.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        yield source
+        return
+    if hasattr(source, 'temporary_file_path'):
+        yield source.temporary_file_path()
+        return
+    workspace = create_workspace('pdf-')
+    try:
+        path = os.path.join(workspace, 'source.pdf')
+        with open(path, 'wb') as f:
+            if isinstance(source, (bytes, bytearray)):
+                f.write(source)
+            else:
+                source.seek(0)
+                shutil.copyfileobj(source, f, 1024 * 1024)
+        yield path
+    finally:
+        remove_workspace(workspace)
+
+
+def open_pdf(source):
+    """PDF'i dosya yolundan, bayt dizisinden ya da dosya benzeri nesneden açar."""
+    if isinstance(source, (str, os.PathLike)):
+        return fitz.open(source)
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype='pdf')
+    source.seek(0)
+    return fitz.open(stream=source.read(), filetype='pdf')
+
+
+def _opened(source, pdf_document):
+    """Verilen açık belgeyi (kapatmadan) ya da kaynaktan yeni açılan belgeyi döndürür."""
+    return nullcontext(pdf_document) if pdf_document is not None else open_pdf(source)
+
+
+def _page_stop(pdf_document, max_pages):
+    """Okunacak sayfa sayısı: `max_pages` verilmişse en çok o kadar (baştan)."""
+    return len(pdf_document) if max_pages is None else min(len(pdf_document), max_pages)
+
+
+def _visited(pages, visit):
+    """Sayfaları aynen geçirirken her birini `visit`'e de verir."""
+    for page in pages:
+        if visit is not None:
+            visit(page)
+        yield page
+
+
+def _clean_pages(contents, normalizer):
+    """Boş sayfaları atlar, kalanları düzeltir. Sıra korunur."""
+    for content in contents:
+        content = content.strip()
+        if content:
+            yield normalizer(content)
+
+
+def _extract_range_fitz(source, start, stop, words):
+    """Alt süreçte çalışır: [start, stop) aralığındaki sayfaların metnini çıkarır."""
+    normalizer = TextNormalizer(words)
+    with open_pdf(source) as pdf_document:
+        return list(_clean_pages((pdf_document[i].get_text() for i in range(start, stop)), normalizer))
+
+
+def _extract_pages_fitz(source, indexes, words):
+    """Alt süreçte çalışır: verilen sayfaların düzeltilmiş metnini ('' = boş sayfa) döndürür."""
+    normalizer = TextNormalizer(words)
+    with open_pdf(source) as pdf_document:
+        return [_page_text(pdf_document[i].get_text(), normalizer) for i in indexes]
+
+
+def _page_text(content, normalizer):
+    content = content.strip()
+    return normalizer(content) if content else ''
+
+
+def page_digest(pdf_document, page, fonts=None):
+    """Sayfanın metnini belirleyen içeriğin özeti.
+
+    İçerik akışları, sayfanın çağırdığı form nesneleri, yazı tipi sözlükleri
+    ile ToUnicode eşlemeleri ve sayfa kutusu özetlenir; metni çıkarmaktan
+    birkaç kat ucuzdur. `fonts` sözlüğü yazı tipi özetlerini sayfalar arasında
+    paylaşmak içindir.
+    """
+    fonts = {} if fonts is None else fonts
+    digest = hashlib.sha256(page.read_contents())
+    for xobject in page.get_xobjects():
+        digest.update(pdf_document.xref_stream(xobject[0]) or b'')
+    for font in page.get_fonts(full=True):
+        xref = font[0]
+        if xref not in fonts:
+            font_digest = hashlib.sha256(repr(font[1:6]).encode())
+            if xref:
+                font_digest.update(pdf_document.xref_object(xref, compressed=True).encode())
+                kind, value = pdf_document.xref_get_key(xref, 'ToUnicode')
+                if kind == 'xref':
+                    font_digest.update(pdf_document.xref_stream(int(value.split()[0])) or b'')
+            fonts[xref] = font_digest.digest()
+        digest.update(fonts[xref])
+    digest.update(repr((tuple(page.rect), page.rotation)).encode())
+    return digest.digest()
+
+
+def iter_pages_cached(
+    source, normalizer, cache, parallel=False, workers=None, pdf_document=None, visit=None, max_pages=None,
+):
+    """Sayfa önbelleğiyle metin üretir: yalnızca özeti önbellekte olmayan sayfalar çıkarılır.
+
+    Özetler önce bütün sayfalar için hesaplanır (her sayfa bu sırada `visit`'e
+    verilir); `parallel` ise eksik sayfalar süreç havuzunda, değilse sırası
+    gelince tek süreçte çıkarılıp saklanır.
+    """
+    workers = workers or os.cpu_count() or 1
+    words = '\n'.join(normalizer.words)
+    with _opened(source, pdf_document) as pdf_document:
+        fonts = {}
+        pages = (pdf_document[i] for i in range(_page_stop(pdf_document, max_pages)))
+        keys = [
+            cache.unit_key('page', page_digest(pdf_document, page, fonts), words)
+            for page in _visited(pages, visit)
+        ]
+        # Eksik sayfalar baştan belirlenir; önbellekteki metinler sırası gelince okunur
+        missing = [i for i, key in enumerate(keys) if not cache.has('page', key)]
+        missing_set = set(missing)
+
+        use_pool = parallel and workers >= 2 and len(missing) >= 2
+        with _spooled(source) if use_pool else nullcontext() as path:
+            futures = []
+            if use_pool:
+                chunk = max(1, math.ceil(len(missing) / (workers * 2)))
+                batches = [missing[start:start + chunk] for start in range(0, len(missing), chunk)]
+                pool, submitted = _submit_all(
+                    workers, _extract_pages_fitz, [(path, indexes, normalizer.words) for indexes in batches],
+                )
+                futures = list(zip(batches, submitted))
+            try:
+                pending = iter(futures)
+                extracted = {}
+                for i, key in enumerate(keys):
+                    text = None if i in missing_set else cache.get_text('page', key)
+                    if text is None:
+                        if futures and i in missing_set:
+                            while i not in extracted:
+                                indexes, future = next(pending)
+                                extracted.update(zip(indexes, _result(pool, future)))
+                            text = extracted.pop(i)
+                        else:
+                            # Tek süreçte çıkarılır (ya da kayıt bu arada silinmişti)
+                            text = _page_text(pdf_document[i].get_text(), normalizer)
+                        cache.put_text(key, text)
+                    if text:
+                        yield text
+            finally:
+                for _, future in futures:
+                    future.cancel()
+
+
+def iter_pages_pypdf2(source, normalizer, max_pages=None):
+    """PyPDF2 ile sayfa sayfa metin çıkarır (yedek motor)."""
+    from PyPDF2 import PdfReader
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    elif not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    reader = PdfReader(source)
+    pages = itertools.islice(reader.pages, max_pages)
+    yield from _clean_pages((page.extract_text() for page in pages), normalizer)
+
+
+def iter_pages_fitz(source, normalizer, pdf_document=None, visit=None, max_pages=None):
+    """PyMuPDF ile tek süreçte, sayfa okundukça metin üretir."""
+    with _opened(source, pdf_document) as pdf_document:
+        pages = (pdf_document[i] for i in range(_page_stop(pdf_document, max_pages)))
+        yield from _clean_pages((page.get_text() for page in _visited(pages, visit)), normalizer)
+
+
+def iter_pages_parallel(source, normalizer, workers=None, pdf_document=None, visit=None, max_pages=None):
+    """Sayfaları aralıklara bölüp tüm çekirdeklerde çıkarır; aralıklar sırayla, biten bitene akar."""
+    workers = workers or os.cpu_count() or 1
+    with _opened(source, pdf_document) as opened:
+        page_count = _page_stop(opened, max_pages)
+    if workers < 2 or page_count < 2:
+        yield from iter_pages_fitz(source, normalizer, pdf_document, visit, max_pages)
+        return
+
+    # Yük dengesi için çekirdek başına iki aralık
+    chunk = max(1, math.ceil(page_count / (workers * 2)))
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    with _spooled(source) as path:
+        pool, futures = _submit_all(workers, _extract_range_fitz, [
+            (path, start, stop, normalizer.words) for start, stop in ranges
+        ])
+        try:
+            for future in futures:
+                yield from _result(pool, future)
+        finally:
+            # Tüketici erken bırakırsa henüz başlamamış aralıklar iptal edilir
+            for future in futures:
+                future.cancel()
+
+
+def iter_pdf_pages(
+    source, normalizer, engine='auto', parallel_min_pages=50, workers=None, cache=None, pdf_document=None, visit=None,
+    max_pages=None,
+):
+    """Seçilen motorla PDF sayfalarının düzeltilmiş metnini sayfa sayfa üretir.
+
+    `source` bir dosya yolu, bayt dizisi ya da dosya benzeri nesne olabilir.
+
+    'auto' küçük dosyalarda fitz'i, `parallel_min_pages` ve üzeri sayfada süreç
+    havuzunu kullanır. `cache` (PageCache) verilirse fitz motorları değişmeyen
+    sayfaların metnini önbellekten alır. fitz henüz hiç sayfa üretmeden başarısız
+    olursa PyPDF2'ye düşülür; akışın ortasındaki hata ise tekrar sayfa üretmemek
+    için yükseltilir.
+
+    `pdf_document` verilirse belge yeniden açılmaz. `visit` bu süreçte dolaşılan
+    her fitz sayfasıyla çağrılır (ör. resim listesini aynı geçişte toplamak
+    için); süreç havuzunun ve PyPDF2'nin sayfaları için çağrılmaz. `max_pages`
+    verilirse yalnızca ilk o kadar sayfa okunur (önizleme).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Bilinmeyen PDF motoru: {engine}")
+    if engine == 'pypdf2':
+        yield from iter_pages_pypdf2(source, normalizer, max_pages)
+        return
+
+    produced = 0
+    try:
+        if engine == 'auto':
+            with _opened(source, pdf_document) as opened:
+                page_count = _page_stop(opened, max_pages)
+            engine = 'parallel' if page_count >= parallel_min_pages else 'fitz'
+        if cache is not None:
+            pages = iter_pages_cached(
+                source, normalizer, cache, engine == 'parallel', workers, pdf_document, visit, max_pages,
+            )
+        elif engine == 'parallel':
+            pages = iter_pages_parallel(source, normalizer, workers, pdf_document, visit, max_pages)
+        else:
+            pages = iter_pages_fitz(source, normalizer, pdf_document, visit, max_pages)
+        for page in pages:
+            produced += 1
+            yield page
+    except Exception as e:
+        if produced:
+            raise
+        print(f"PyMuPDF ile metin çıkarılamadı, PyPDF2 kullanılıyor: {e}")
+        yield from iter_pages_pypdf2(source, normalizer, max_pages)
+
+
+def extract_pdf_pages(source, normalizer, engine='auto', parallel_min_pages=50, workers=None, cache=None):
+    """iter_pdf_pages ile aynı, sonucu liste olarak döndürür."""
+    return list(iter_pdf_pages(source, normalizer, engine, parallel_min_pages, workers, cache))
@@ -0,0 +1,131 @@
+// Dosya seçildiğinde isim gösterme
+document.getElementById('file-upload').addEventListener('change', function(e) {
+    var files = e.target.files;
+    var fileName = files[0] ? files[0].name : 'Dosya seçilmedi';
+    if (files.length > 1) {
+        fileName = files.length + ' dosya seçildi (toplu dönüştürme, ZIP olarak inecek)';
+    }
+    document.getElementById('file-name').textContent = fileName;
+    if (files.length === 1 && !/\.zip$/i.test(files[0].name)) {
+        var suggestedName = e.target.files[0].name.replace(/\.[^/.]+$/, "");
+        document.getElementById('output-name').value = suggestedName;
+    }
+    showPreview();
+});
+
+// Tek dosya seçilince ilk sayfaların küçük resmi hemen istenir; tam dönüştürme
+// ardından "Dönüştür" ile yapılır
+var previewUrl = null;
+function showPreview() {
+    var files = document.getElementById('file-upload').files;
+    var container = document.getElementById('preview');
+    var image = document.getElementById('preview-image');
+    var statusEl = document.getElementById('preview-status');
+    if (previewUrl) {
+        URL.revokeObjectURL(previewUrl);
+        previewUrl = null;
+    }
+    image.removeAttribute('src');
+    if (files.length !== 1 || isBatchUpload()) {
+        container.hidden = true;
+        return;
+    }
+    container.hidden = false;
+    statusEl.textContent = 'Önizleme hazırlanıyor...';
+    var data = new FormData(document.querySelector('.upload-form'));
+    data.append('preview_format', 'png');
+    var selected = files[0];
+    fetch(container.dataset.previewUrl, {method: 'POST', body: data})
+        .then(function(r) {
+            if (!r.ok) {
+                throw new Error(r.status);
+            }
+            var truncated = r.headers.get('X-Preview-Truncated') === 'true';
+            return r.blob().then(function(blob) { return [blob, truncated]; });
+        })
+        .then(function(result) {
+            // Bu arada başka dosya seçildiyse eski önizleme gösterilmez
+            if (document.getElementById('file-upload').files[0] !== selected) {
+                return;
+            }
+            previewUrl = URL.createObjectURL(result[0]);
+            image.src = previewUrl;
+            statusEl.textContent = (result[1] ? 'Kısaltılmış önizleme. ' : 'İlk sayfa önizlemesi. ')
+                + 'Tamamı için "Dönüştür"e basın.';
+        })
+        .catch(function() { statusEl.textContent = 'Önizleme oluşturulamadı.'; });
+}
+
+// Çıktı format switch
+document.getElementById('output_format_switch').addEventListener('change', function() {
+    var label = document.getElementById('output_format_label');
+    if(this.checked) {
+        this.value = 'word';
+        label.textContent = 'Word';
+    } else {
+        this.value = 'pdf';
+        label.textContent = 'PDF';
+    }
+});
+
+// Birden çok dosya ya da ZIP seçildiyse toplu dönüştürme yapılır
+function isBatchUpload() {
+    var files = document.getElementById('file-upload').files;
+    return files.length > 1 || (files.length === 1 && /\.zip$/i.test(files[0].name));
+}
+
+document.querySelector('.upload-form').addEventListener('submit', function(e) {
+    var fileInput = document.getElementById('file-upload');
+    var jobCheckbox = document.getElementById('background_job');
+    if (isBatchUpload()) {
+        // Sonuçlar tek bir ZIP olarak iner
+        this.setAttribute('action', fileInput.dataset.batchUrl);
+        return;
+    }
+    this.removeAttribute('action');
+
+    // Arka planda dönüştürme: işi oluştur, durumunu sorgula, bitince indir
+    if (!jobCheckbox.checked) {
+        return;
+    }
+    e.preventDefault();
+    var statusEl = document.getElementById('job-status');
+    var labels = {queued: 'Sırada bekliyor...', running: 'Dönüştürülüyor...'};
+    statusEl.textContent = 'Yükleniyor...';
+    fetch(jobCheckbox.dataset.jobsUrl, {method: 'POST', body: new FormData(this)})
+        .then(function(r) { return r.json(); })
+        .then(function poll(job) {
+            if (job.error) {
+                statusEl.textContent = 'Hata: ' + job.error;
+            } else if (job.status === 'done') {
+                statusEl.textContent = 'Tamamlandı 💗';
+                window.location = job.download_url;
+            } else {
+                statusEl.textContent = labels[job.status] || job.status;
+                setTimeout(function() {
+                    fetch(job.status_url).then(function(r) { return r.json(); }).then(poll);
+                }, 1500);
+            }
+        })
+        .catch(function() { statusEl.textContent = 'Bağlantı hatası'; });
+});
+
+// Arka plan hemşirelik temalı animasyon
+function createNurseAnimations() {
+    const container = document.getElementById('hearts-and-bubbles');
+    const symbols = ['🩺','🦋','💉','👩‍⚕️','🧴','💗'];
+    setInterval(() => {
+        const symbol = document.createElement('div');
+        symbol.textContent = symbols[Math.floor(Math.random() * symbols.length)];
+        symbol.style.left = Math.random() * 100 + 'vw';
+        symbol.style.fontSize = (0.8 + Math.random() * 1.5) + 'em';
+        container.appendChild(symbol);
+        const duration = 12 + Math.random() * 8;
+        symbol.animate([
+            { transform: `translateY(100vh)` },
+            { transform: `translateY(-50px)` }
+        ], { duration: duration * 1000, easing: 'linear' });
+        setTimeout(() => symbol.remove(), duration * 1000);
+    }, 800);
+}
+createNurseAnimations();
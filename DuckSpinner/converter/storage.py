@@ -0,0 +1,96 @@
+import io
+import os
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+from .backends import PILImage
+
+# Bu dizindeki resimler için küçültülmüş varyantlar üretilir
+RESPONSIVE_PREFIX = 'converter/images/'
+RESPONSIVE_SOURCE_EXTS = ('.jpg', '.jpeg', '.png')
+
+# Pillow kayıt biçimi adları ve kayıt seçenekleri
+VARIANT_FORMATS = {
+    'avif': ('AVIF', {'quality': 55}),
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'png': ('PNG', {'optimize': True}),
+}
+
+
+def variant_name(path, width, ext):
+    """`converter/images/a.jpg` -> `converter/images/a.300w.webp`."""
+    return f'{posixpath.splitext(path)[0]}.{width}w.{ext}'
+
+
+def fallback_ext(path):
+    """Varyantı her tarayıcının açabildiği, kaynağın kendi biçimi."""
+    ext = posixpath.splitext(path)[1].lower().lstrip('.')
+    return 'jpg' if ext == 'jpeg' else ext
+
+
+def _format_available(ext):
+    # AVIF (ve eski sürümlerde WEBP) Pillow derlemesine bağlıdır; yoksa o biçim atlanır
+    from PIL import features
+
+    return ext not in ('avif', 'webp') or features.check(ext)
+
+
+def _encode(image, ext):
+    pil_format, options = VARIANT_FORMATS[ext]
+    if pil_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    out = io.BytesIO()
+    image.save(out, pil_format, **options)
+    return out.getvalue()
+
+
+class OptimizedStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """collectstatic sırasında resimlerin küçültülmüş WebP/AVIF varyantlarını da üreten depolama.
+
+    RESPONSIVE_PREFIX altındaki her JPEG/PNG için RESPONSIVE_IMAGE_WIDTHS
+    genişliklerinde (kaynaktan büyük olmayanlar) her biçimde bir varyant
+    STATIC_ROOT'a yazılır. Varyantlar diğer dosyalarla birlikte adlarına içerik
+    özeti eklenerek manifest'e girer ve sıkıştırılır; `responsive_image`
+    etiketi onları srcset olarak kullanır.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for path, (storage, source_path) in list(paths.items()):
+                if path.startswith(RESPONSIVE_PREFIX) and path.lower().endswith(RESPONSIVE_SOURCE_EXTS):
+                    for name in self._write_variants(storage, source_path, path):
+                        paths[name] = (self, name)
+        yield from super().post_process(paths, dry_run, **options)
+
+    def _write_variants(self, storage, source_path, path):
+        with storage.open(source_path) as f:
+            image = PILImage.open(f)
+            image.load()
+        exts = [ext for ext in settings.CONVERTER_RESPONSIVE_IMAGE_FORMATS if _format_available(ext)]
+        exts.append(fallback_ext(path))
+        names = []
+        for width in settings.CONVERTER_RESPONSIVE_IMAGE_WIDTHS:
+            if width >= image.width:
+                continue
+            resized = image.resize((width, round(image.height * width / image.width)), PILImage.LANCZOS)
+            for ext in exts:
+                name = variant_name(path, width, ext)
+                if self.exists(name):
+                    self.delete(name)
+                self._save(name, ContentFile(_encode(resized, ext)))
+                names.append(name)
+        return names
+
+    def variants(self, path):
+        """Yoldaki resmin üretilmiş varyantları: {biçim: [(ad, genişlik), ...]}; yoksa boş."""
+        found = {}
+        for ext in [*settings.CONVERTER_RESPONSIVE_IMAGE_FORMATS, fallback_ext(path)]:
+            for width in settings.CONVERTER_RESPONSIVE_IMAGE_WIDTHS:
+                name = variant_name(path, width, ext)
+                if os.path.exists(self.path(name)):
+                    found.setdefault(ext, []).append((name, width))
+        return found
@@ -0,0 +1,37 @@
+from django import template
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from ..storage import fallback_ext
+
+register = template.Library()
+
+# <source> sırası tarayıcının tercih sırasıdır: önce en küçük dosyayı veren biçim
+SOURCE_TYPES = (('avif', 'image/avif'), ('webp', 'image/webp'))
+
+
+def _srcset(variants):
+    return ', '.join(f'{static(name)} {width}w' for name, width in variants)
+
+
+@register.simple_tag
+def responsive_image(path, sizes, alt='', **attrs):
+    """Resmi, collectstatic'te üretilen varyantlarıyla <picture> olarak yazar.
+
+    Varyant yoksa (DEBUG'da collectstatic çalışmadan ya da başka bir
+    depolamayla) yalnızca asıl resmin <img> etiketi yazılır.
+    """
+    variants = getattr(staticfiles_storage, 'variants', lambda path: {})(path)
+    fallback = variants.pop(fallback_ext(path), None)
+    extra = format_html_join('', ' {}="{}"', attrs.items())
+    if not fallback:
+        return format_html('<img src="{}" alt="{}"{}>', static(path), alt, extra)
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((content_type, _srcset(variants[ext]), sizes) for ext, content_type in SOURCE_TYPES if ext in variants),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" alt="{}"{}></picture>',
+        sources, static(fallback[-1][0]), _srcset(fallback), sizes, alt, extra,
+    )
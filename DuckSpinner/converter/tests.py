@@ -1,3 +1,1331 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import multiprocessing
+import tempfile
+import time
+import zipfile
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.http.multipartparser import MultiPartParser
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template import Context, Template
+from django.test import AsyncRequestFactory, Client, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+from asgiref.sync import async_to_sync, sync_to_async
+from lxml import etree
+
+from . import batch, benchmark, cache, isolation, metrics, ooxml, pdf_text, views
+from .admission import AdmissionController
+from .batch import BatchError, BatchStream, collect_inputs
+from .jobs import claim_next_job, delete_expired_jobs, requeue_interrupted_jobs, run_job
+from .cache import ConversionCache
+from .page_cache import PageCache
+from .storage import _format_available
+from .isolation import run_isolated, run_isolated_async, shutdown_pools
+from .management.commands.run_conversion_workers import start_worker
+from .middleware import UploadLimitMiddleware, upload_limit
+from .models import ConversionJob
+from .docx_writer import create_word_bulk
+from .document import FlowableStream, ImageBlock, ParagraphBlock
+from .images import ExtractedImage
+from .normalizer import DEFAULT_WORDS, TextNormalizer
+from .chunked_pdf import create_pdf_chunked
+from .fitz_writer import create_pdf_with_fitz
+from .views import create_pdf_with_images, create_word_with_images
+from .workspace import request_workspace, sweep_stale
+
+
+def legacy_fix_text_formatting(text, words=DEFAULT_WORDS):
+    """TextNormalizer'dan önceki kelime başına re.sub döngüsü (karşılaştırma için)."""
+    for word in words:
+        text = re.sub(r'\b%s\b' % re.escape(word), f' {word} ', text, flags=re.IGNORECASE)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+class TextNormalizerTests(SimpleTestCase):
+    SAMPLES = [
+        '',
+        '   ',
+        'The cat and THE dog',
+        'theand anthe a-of in,on at.to',
+        'Forward thinking is what we do; Shall we?',
+        'Withdraw from the bank, as it was done by them.',
+        'çok\tsatır\n\nboşluk   ve  the end',
+        'Mayıs ayında canlı yayın may be later',
+        'ſhall ſhould The Kelvin in Straße',
+        'a' * 50 + ' of ' + 'an' * 10,
+    ]
+
+    def test_matches_legacy_loop(self):
+        normalizer = TextNormalizer()
+        for text in self.SAMPLES:
+            with self.subTest(text=text):
+                self.assertEqual(normalizer(text), legacy_fix_text_formatting(text))
+
+    def test_custom_words(self):
+        words = ('foo', 'Bar', 'bar', 'c++', 'x.y')
+        normalizer = TextNormalizer(words)
+        for text in ['foobar Foo BAR c++ x.y xzy', 'BARfoo bar-foo']:
+            with self.subTest(text=text):
+                # Eski döngüde de büyük/küçük harf tekrarlarında sonraki kelime kazanır
+                self.assertEqual(normalizer(text), legacy_fix_text_formatting(text, words))
+
+    def test_no_words_only_collapses_whitespace(self):
+        self.assertEqual(TextNormalizer(())('  a \n b  '), 'a b')
+
+
+class OoxmlReaderTests(SimpleTestCase):
+    """Akış okuyucuları python-docx/python-pptx ile aynı metni vermelidir."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def _docx(self):
+        from docx import Document
+
+        path = os.path.join(self.dir, 'special.docx')
+        doc = Document()
+        doc.add_paragraph('Sekme\tve satır\nsonu')
+        doc.add_paragraph('')
+        paragraph = doc.add_paragraph('Birden ')
+        paragraph.add_run('fazla ').bold = True
+        paragraph.add_run('çalışma & <özel> karakter')
+        table = doc.add_table(rows=1, cols=2)
+        table.cell(0, 0).text = 'tablo içi atlanır'
+        doc.add_page_break()
+        doc.add_paragraph('  baştaki ve sondaki boşluk  ')
+        doc.save(path)
+        return path
+
+    def _pptx(self):
+        from pptx import Presentation
+        from pptx.util import Inches
+
+        path = os.path.join(self.dir, 'special.pptx')
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = 'Başlık\vdikey sekme'
+        box = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(4), Inches(1))
+        box.text_frame.text = 'ilk paragraf\nikinci\tparagraf'
+        slide.shapes.add_textbox(Inches(1), Inches(3), Inches(4), Inches(1))
+        slide.shapes.add_table(2, 2, Inches(1), Inches(4), Inches(4), Inches(1))
+        prs.slides.add_slide(prs.slide_layouts[6])
+        prs.save(path)
+        return path
+
+    def test_word_paragraphs_match_python_docx(self):
+        generated = os.path.join(self.dir, 'generated.docx')
+        benchmark.generate_docx(generated, pages=3, paragraphs=4, images=2, image_px=32)
+        for path in (generated, self._docx()):
+            with self.subTest(path=os.path.basename(path)):
+                self.assertEqual(
+                    list(ooxml.iter_word_paragraphs_stream(path)),
+                    list(ooxml.iter_word_paragraphs_library(path)),
+                )
+
+    def test_slide_texts_match_python_pptx(self):
+        generated = os.path.join(self.dir, 'generated.pptx')
+        benchmark.generate_pptx(generated, pages=3, paragraphs=2, images=2, image_px=32)
+        for path in (generated, self._pptx()):
+            with self.subTest(path=os.path.basename(path)):
+                self.assertEqual(
+                    list(ooxml.iter_slide_texts_stream(path)),
+                    list(ooxml.iter_slide_texts_library(path)),
+                )
+
+
+class BulkDocxWriterTests(SimpleTestCase):
+    """Toplu yazıcı python-docx ile aynı paketi üretmelidir."""
+
+    def _blocks(self):
+        images = [ExtractedImage(benchmark._image(i, 40, 0), 40, 40, 'png') for i in range(4)]
+        return [
+            ParagraphBlock('Sekme\tve satır\nsonu'),
+            ParagraphBlock(''),
+            ParagraphBlock('  özel & <karakter> '),
+            # 10 resim: iki ızgara, tekrarlanan resimler ve açılamayan bir resim
+            *(ImageBlock(images[i % 4]) for i in range(9)),
+            ImageBlock(ExtractedImage(b'bozuk', 1, 1, 'png')),
+            ParagraphBlock('son paragraf'),
+        ]
+
+    def _package(self, writer):
+        buffer = io.BytesIO()
+        self.assertIs(writer(iter(self._blocks()), buffer), True)
+        return zipfile.ZipFile(buffer)
+
+    def test_matches_python_docx(self):
+        expected = self._package(create_word_with_images)
+        actual = self._package(create_word_bulk)
+        self.assertEqual(sorted(actual.namelist()), sorted(expected.namelist()))
+        for name in ('word/document.xml', 'word/_rels/document.xml.rels'):
+            with self.subTest(name=name):
+                self.assertEqual(actual.read(name), expected.read(name))
+        for name in expected.namelist():
+            if name.startswith('word/media/'):
+                self.assertEqual(actual.read(name), expected.read(name))
+        # Resimler baştan yazıldığı için toplu yazıcı bütün resim türlerini önceden bildirir
+        types = [
+            {(e.tag, tuple(sorted(e.attrib.items()))) for e in etree.fromstring(package.read('[Content_Types].xml'))}
+            for package in (expected, actual)
+        ]
+        self.assertLessEqual(types[0], types[1])
+
+
+class PdfTextPoolTests(SimpleTestCase):
+    """Sayfa-paralel PDF motoru: havuzun yeniden kurulması ve alt süreçlere yol gönderilmesi."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.workspace_root = os.path.join(tmp.name, 'workspace')
+        override = self.settings(CONVERTER_WORKSPACE_ROOT=self.workspace_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.path = os.path.join(tmp.name, 'doc.pdf')
+        benchmark.generate_pdf(self.path, pages=6, paragraphs=3, images=0, image_px=32)
+        self.normalizer = TextNormalizer()
+        self.expected = pdf_text.extract_pdf_pages(self.path, self.normalizer, engine='fitz')
+        self.addCleanup(self._shutdown_pool)
+
+    def _shutdown_pool(self):
+        if pdf_text._pool is not None:
+            pdf_text._pool.shutdown()
+            pdf_text._pool = None
+
+    def test_file_like_source_is_spooled_once(self):
+        with open(self.path, 'rb') as f:
+            source = io.BytesIO(f.read())
+        with mock.patch.object(
+            ProcessPoolExecutor, 'submit', autospec=True, side_effect=ProcessPoolExecutor.submit,
+        ) as submit:
+            pages = pdf_text.extract_pdf_pages(source, self.normalizer, engine='parallel', workers=2)
+        self.assertEqual(pages, self.expected)
+        self.assertGreater(submit.call_count, 1)
+        # Görevlere PDF baytları değil, tek bir geçici dosyanın yolu gider
+        paths = {call.args[2] for call in submit.call_args_list}
+        self.assertEqual(len(paths), 1)
+        self.assertIsInstance(paths.pop(), str)
+        self.assertEqual(os.listdir(self.workspace_root), [])
+
+    def test_broken_pool_is_rebuilt(self):
+        pool = pdf_text._get_pool(2)
+        with self.assertRaises(BrokenProcessPool):
+            pdf_text._result(pool, pool.submit(os._exit, 1))
+        self.assertIsNot(pdf_text._get_pool(2), pool)
+        pages = pdf_text.extract_pdf_pages(self.path, self.normalizer, engine='parallel', workers=2)
+        self.assertEqual(pages, self.expected)
+
+    def test_pool_broken_elsewhere_is_replaced_on_submit(self):
+        pool = pdf_text._get_pool(2)
+        with self.assertRaises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result()
+        pages = pdf_text.extract_pdf_pages(self.path, self.normalizer, engine='parallel', workers=2)
+        self.assertEqual(pages, self.expected)
+        self.assertIsNot(pdf_text._pool, pool)
+
+
+class ConversionCacheTests(SimpleTestCase):
+    """Sonuç önbelleği: isabet, anahtarı değiştiren ayarlar, LRU silme ve atomik yazım."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.cache = ConversionCache(os.path.join(tmp.name, 'cache'), 10 * 1024 * 1024)
+
+    def _upload(self):
+        path = os.path.join(self.dir, 'doc.docx')
+        benchmark.generate_docx(path, pages=1, paragraphs=3, images=0, image_px=32)
+        with open(path, 'rb') as f:
+            return SimpleUploadedFile('doc.docx', f.read())
+
+    @staticmethod
+    def _content(response):
+        return b''.join(response.streaming_content)
+
+    def test_hit_skips_extraction(self):
+        upload = self._upload()
+        with self.settings(CONVERTER_ISOLATION=False), \
+                mock.patch.object(views, 'conversion_cache', self.cache), \
+                mock.patch.object(views, 'page_cache', None), \
+                mock.patch.object(views, 'convert_document', wraps=views.convert_document) as convert:
+            first = self._content(views.convert_upload(upload, '.docx', 'pdf', False))
+            second = self._content(views.convert_upload(upload, '.docx', 'pdf', False))
+        self.assertEqual(convert.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_key_changes_with_output_settings(self):
+        chunks = [b'%PDF-1.4 ayni icerik']
+
+        def key(output_format='pdf', with_images=False, pdf_writer='reportlab'):
+            return views.cache_key_for(chunks, output_format, with_images, pdf_writer)
+
+        base = key()
+        self.assertEqual(key(), base)
+        self.assertNotEqual(key(output_format='word'), base)
+        self.assertNotEqual(key(with_images=True), base)
+        self.assertNotEqual(key(pdf_writer='fitz'), base)
+        word_keys = set()
+        for word_writer in views.WORD_WRITERS:
+            with self.settings(CONVERTER_WORD_WRITER=word_writer):
+                word_keys.add(key(output_format='word'))
+        self.assertEqual(len(word_keys), len(views.WORD_WRITERS))
+        with mock.patch.object(cache, 'CACHE_VERSION', cache.CACHE_VERSION + 1):
+            self.assertNotEqual(key(), base)
+
+    def test_evicts_least_recently_used_by_total_bytes(self):
+        small = ConversionCache(self.cache.root, 250)
+        for age, key in enumerate(('c', 'b', 'a')):
+            small.put(key * 64, b'x' * 100, evict=False)
+            os.utime(small._path(key * 64), (1000 - age * 100, 1000 - age * 100))
+        # 'a' en eski; okunması onu en yeni yapar, sınırı aşınca en eski kalan 'b' silinir
+        small.get('a' * 64).close()
+        small.evict()
+        self.assertIsNotNone(small.get('a' * 64))
+        self.assertIsNone(small.get('b' * 64))
+        self.assertIsNotNone(small.get('c' * 64))
+        self.assertLessEqual(small.stats()['bytes'], 250)
+
+    def test_overwrite_is_atomic(self):
+        key = 'd' * 64
+        self.cache.put(key, b'eski')
+        with self.cache.get(key) as reader:
+            self.cache.put(key, io.BytesIO(b'yeni sonuc'))
+            # Açık okuyucu eski içeriği sonuna kadar görür
+            self.assertEqual(reader.read(), b'eski')
+
+        class Failing(io.BytesIO):
+            def read(self, *args):
+                raise OSError('disk dolu')
+
+        with self.assertRaises(OSError):
+            self.cache.put(key, Failing())
+        with self.cache.get(key) as f:
+            self.assertEqual(f.read(), b'yeni sonuc')
+        self.assertEqual([n for n in os.listdir(os.path.dirname(self.cache._path(key))) if n.startswith('.tmp-')], [])
+
+
+def _claim_all(queue):
+    """Alt süreçte çalışır: kuyruk boşalana kadar iş alıp kimliklerini gönderir."""
+    connections.close_all()
+    claimed = []
+    while (job := claim_next_job()) is not None:
+        claimed.append(job.pk)
+    queue.put(claimed)
+    connections.close_all()
+
+
+class ConversionJobTests(TransactionTestCase):
+    """Arka plan işleri: işçi sürecinde çalıştırma, atomik alma, yeniden sıraya koyma ve süre dolumu."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        override = self.settings(
+            MEDIA_ROOT=os.path.join(tmp.name, 'media'),
+            CONVERTER_WORKSPACE_ROOT=os.path.join(tmp.name, 'workspaces'),
+            CONVERTER_ISOLATION=True,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        for name in ('conversion_cache', 'page_cache'):
+            patcher = mock.patch.object(views, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _job(self, name, generate, output_format='pdf', **params):
+        path = os.path.join(self.dir, name)
+        generate(path, **params)
+        with open(path, 'rb') as f:
+            return ConversionJob.objects.create(
+                original_name=name, input_file=SimpleUploadedFile(name, f.read()), output_format=output_format,
+            )
+
+    def _run_in_worker(self, job, timeout=60):
+        # İşçi süreç fork ile açılır; bu sürecin bağlantısını paylaşmamalı
+        connections.close_all()
+        worker = start_worker(0.05)
+        try:
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                job.refresh_from_db()
+                if job.status in (ConversionJob.DONE, ConversionJob.FAILED):
+                    break
+                time.sleep(0.1)
+        finally:
+            worker.terminate()
+            worker.join(10)
+        # SIGTERM ile işçi, açtığı havuzlarla birlikte kapanır
+        self.assertFalse(worker.is_alive())
+        return job
+
+    def test_isolated_job_runs_in_worker(self):
+        job = self._job('doc.docx', benchmark.generate_docx, pages=2, paragraphs=3, images=0, image_px=32)
+        job = self._run_in_worker(job)
+        self.assertEqual((job.status, job.error), (ConversionJob.DONE, ''))
+        with job.result_file.open('rb') as f:
+            self.assertEqual(f.read(5), b'%PDF-')
+
+    def test_parallel_pdf_engine_runs_in_worker(self):
+        job = self._job('big.pdf', benchmark.generate_pdf, pages=4, paragraphs=2, images=0, image_px=32)
+        expected = pdf_text.extract_pdf_pages(job.input_file.path, TextNormalizer(), engine='fitz')
+        # Süreç havuzu açılamazsa PyPDF2'ye sessizce düşülürdü; burada yedeğe düşmek hata metni üretir
+        with self.settings(CONVERTER_ISOLATION=False, CONVERTER_PDF_ENGINE='parallel', CONVERTER_PDF_WORKERS=2), \
+                mock.patch.object(pdf_text, 'iter_pages_pypdf2', side_effect=RuntimeError('PyPDF2 yedeği kullanıldı')):
+            job = self._run_in_worker(job)
+        self.assertEqual((job.status, job.error), (ConversionJob.DONE, ''))
+        text = ' '.join(pdf_text.extract_pdf_pages(job.result_file.path, TextNormalizer(), engine='fitz'))
+        self.assertNotIn('PyPDF2', text)
+        self.assertIn(expected[0][:60], text)
+
+    def test_run_job_records_failure(self):
+        job = self._job('doc.docx', benchmark.generate_docx, pages=1, paragraphs=1, images=0, image_px=32)
+        input_path = job.input_file.path
+        job.status = ConversionJob.RUNNING
+        job.save()
+        with mock.patch.object(views, 'run_conversion', return_value=('bozuk dosya', None)):
+            run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (ConversionJob.FAILED, 'bozuk dosya'))
+        self.assertIsNotNone(job.finished_at)
+        self.assertFalse(os.path.exists(input_path))
+
+    def test_each_job_is_claimed_once(self):
+        jobs = [ConversionJob.objects.create(original_name=f'{i}.pdf', input_file=f'jobs/{i}.pdf') for i in range(12)]
+        connections.close_all()
+        queue = multiprocessing.Queue()
+        claimers = [multiprocessing.Process(target=_claim_all, args=(queue,)) for _ in range(3)]
+        for claimer in claimers:
+            claimer.start()
+        claimed = [pk for _ in claimers for pk in queue.get(timeout=60)]
+        for claimer in claimers:
+            claimer.join()
+        self.assertCountEqual(claimed, [job.pk for job in jobs])
+        self.assertEqual(ConversionJob.objects.filter(status=ConversionJob.RUNNING).count(), len(jobs))
+
+    def test_claim_skips_job_taken_by_another_worker(self):
+        first = ConversionJob.objects.create(original_name='a.pdf', input_file='jobs/a.pdf')
+        second = ConversionJob.objects.create(original_name='b.pdf', input_file='jobs/b.pdf')
+        original_first = QuerySet.first
+
+        def taken_meanwhile(queryset):
+            # Sorgu ile güncelleme arasında başka bir işçi aynı işi alır
+            job = original_first(queryset)
+            if job is not None and job.pk == first.pk:
+                ConversionJob.objects.filter(pk=job.pk).update(status=ConversionJob.RUNNING)
+            return job
+
+        with mock.patch.object(QuerySet, 'first', autospec=True, side_effect=taken_meanwhile):
+            claimed = claim_next_job()
+        self.assertEqual(claimed.pk, second.pk)
+        self.assertEqual(claimed.status, ConversionJob.RUNNING)
+        self.assertIsNotNone(claimed.started_at)
+
+    def test_requeues_only_stale_running_jobs(self):
+        now = timezone.now()
+        stale = ConversionJob.objects.create(
+            original_name='a.pdf', status=ConversionJob.RUNNING, started_at=now - timedelta(hours=2),
+        )
+        live = ConversionJob.objects.create(original_name='b.pdf', status=ConversionJob.RUNNING, started_at=now)
+        queued = ConversionJob.objects.create(original_name='c.pdf')
+        self.assertEqual(requeue_interrupted_jobs(stale_after=3600), 1)
+        statuses = dict(ConversionJob.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {
+            stale.pk: ConversionJob.QUEUED, live.pk: ConversionJob.RUNNING, queued.pk: ConversionJob.QUEUED,
+        })
+        stale.refresh_from_db()
+        self.assertIsNone(stale.started_at)
+
+    def test_deletes_expired_jobs_with_files(self):
+        old = timezone.now() - timedelta(days=2)
+        expired = [
+            ConversionJob.objects.create(original_name='a.pdf', status=status, finished_at=old)
+            for status in (ConversionJob.DONE, ConversionJob.FAILED)
+        ]
+        kept = [
+            ConversionJob.objects.create(original_name='b.pdf', status=ConversionJob.DONE, finished_at=timezone.now()),
+            ConversionJob.objects.create(original_name='c.pdf', status=ConversionJob.RUNNING, started_at=old),
+        ]
+        job_dir = os.path.join(settings.MEDIA_ROOT, 'jobs', str(expired[0].pk))
+        os.makedirs(job_dir)
+        open(os.path.join(job_dir, 'converted.pdf'), 'wb').close()
+        self.assertEqual(delete_expired_jobs(86400), 2)
+        self.assertCountEqual(ConversionJob.objects.values_list('pk', flat=True), [job.pk for job in kept])
+        self.assertFalse(os.path.exists(job_dir))
+
+
+def _hog_memory(size):
+    """Bellek sınırı testi için belleği gerçekten dolduran (sayfaları yazan) işlev."""
+    data = b'x' * size
+    time.sleep(60)
+    return len(data)
+
+
+def _sleep_forever(*args):
+    time.sleep(60)
+
+
+class IsolationTests(SimpleTestCase):
+    """run_isolated ile alt süreçte çalışan dönüştürmeler."""
+
+    def test_child_with_process_pool_exits(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'doc.pdf')
+        benchmark.generate_pdf(path, pages=4, paragraphs=2, images=0, image_px=32)
+        normalizer = TextNormalizer()
+        # Alt süreç kendi sayfa havuzunu açar; havuz kapatılmazsa süreç sonlanmaz ve çağrı dönmez
+        pages = run_isolated(pdf_text.extract_pdf_pages, (path, normalizer, 'parallel', 50, 2), timeout=60)
+        self.assertEqual(pages, pdf_text.extract_pdf_pages(path, normalizer, engine='fitz'))
+
+    def _assert_killed(self, run, message):
+        started = time.monotonic()
+        with metrics.StageTimer() as timer:
+            result = run()
+        self.assertIn(message, result)
+        self.assertLess(time.monotonic() - started, 20)
+        self.assertEqual(timer.counts.get('killed'), 1)
+
+    def test_timeout_kills_child(self):
+        self._assert_killed(lambda: run_isolated(time.sleep, (60,), timeout=0.5), 'süre sınırını (0.5 sn)')
+
+    def test_memory_limit_kills_child(self):
+        self._assert_killed(
+            lambda: run_isolated(_hog_memory, (256 * 1024 * 1024,), memory_limit=64 * 1024 * 1024),
+            'bellek sınırını (64 MB)',
+        )
+
+    def test_async_timeout_kills_child(self):
+        run = async_to_sync(run_isolated_async)
+        self._assert_killed(lambda: run(time.sleep, (60,), timeout=0.5), 'süre sınırını (0.5 sn)')
+
+    def test_async_result_and_timings(self):
+        with metrics.StageTimer() as timer:
+            self.assertEqual(async_to_sync(run_isolated_async)(divmod, (7, 2)), (3, 1))
+        self.assertIn('isolation', timer.durations)
+
+    def test_start_method(self):
+        with mock.patch.object(isolation.threading, 'active_count', return_value=1):
+            self.assertEqual(isolation._context().get_start_method(), 'fork')
+        # İş parçacıkları varken fork, onların tuttuğu kilitleri alt sürece kilitli kopyalardı
+        with mock.patch.object(isolation.threading, 'active_count', return_value=3):
+            context = isolation._context()
+        self.assertEqual(context.get_start_method(), 'forkserver')
+        from multiprocessing import forkserver
+
+        self.assertEqual(forkserver._forkserver._preload_modules, ['converter.forkserver_preload'])
+
+
+class PowerPointImageTests(SimpleTestCase):
+    """python-pptx'in tanımadığı resim türleri eski sürümdeki gibi ızgaraya verilir."""
+
+    def _pptx_with_media(self, replacements):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        generated = os.path.join(tmp.name, 'generated.pptx')
+        benchmark.generate_pptx(generated, pages=1, paragraphs=1, images=len(replacements), image_px=32)
+        path = os.path.join(tmp.name, 'media.pptx')
+        with zipfile.ZipFile(generated) as source, zipfile.ZipFile(path, 'w') as target:
+            media = sorted(name for name in source.namelist() if name.startswith('ppt/media/'))
+            data = dict(zip(media, replacements))
+            for info in source.infolist():
+                target.writestr(info, data.get(info.filename, source.read(info)))
+        return path
+
+    def test_unknown_picture_types_are_kept(self):
+        from PIL import Image
+
+        webp = io.BytesIO()
+        Image.new('RGB', (20, 10), 'red').save(webp, 'WEBP')
+        svg = b'<svg xmlns="http://www.w3.org/2000/svg" width="5" height="5"/>'
+        path = self._pptx_with_media([webp.getvalue(), svg])
+        for reader in ooxml.READERS:
+            with self.subTest(reader=reader), self.settings(CONVERTER_OOXML_READER=reader):
+                with views.PowerPointExtractor(path, with_images=True) as extractor:
+                    list(extractor.blocks())
+                    images = sorted(extractor.images(), key=lambda image: image.ext)
+                self.assertEqual([(image.ext, image.width, image.height) for image in images],
+                                 [('jpg', 0, 0), ('webp', 20, 10)])
+                self.assertEqual(images[0].data, svg)
+
+
+@mock.patch.object(MultiPartParser, 'parse', side_effect=AssertionError('gövde ayrıştırıldı'))
+class UploadLimitMiddlewareTests(SimpleTestCase):
+    """Sınırı aşan yüklemeler gövde ayrıştırılmadan, CSRF denetiminden önce reddedilir."""
+
+    def setUp(self):
+        override = self.settings(CONVERTER_MAX_UPLOAD_SIZE=1024, CONVERTER_MAX_BATCH_UPLOAD_SIZE=2048)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.client = Client(enforce_csrf_checks=True)
+
+    def _post(self, url, size):
+        return self.client.post(url, {'document': SimpleUploadedFile('doc.pdf', b'x' * size)})
+
+    def test_oversized_upload_is_rejected_before_csrf(self, parse):
+        response = self._post('/', 200 * 1024)
+        self.assertEqual(response.status_code, 413)
+        self.assertContains(response, 'Dosya çok büyük', status_code=413)
+        parse.assert_not_called()
+
+    def test_json_views_answer_in_json(self, parse):
+        response = self._post('/jobs/', 200 * 1024)
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('error', response.json())
+
+    def test_view_specific_limit(self, parse):
+        # Toplu yükleme kendi sınırını kullanır (form payı dahil)
+        self.assertEqual(self._post('/batch/', 2048 + 32 * 1024).status_code, 403)
+        self.assertEqual(self._post('/batch/', 2048 + 128 * 1024).status_code, 413)
+
+    def test_small_upload_reaches_csrf_check(self, parse):
+        self.assertEqual(self._post('/', 512).status_code, 403)
+        parse.assert_not_called()
+
+    def test_views_without_limit_pass_through(self, parse):
+        request = RequestFactory().post('/', CONTENT_LENGTH=str(10 ** 9))
+        middleware = UploadLimitMiddleware(lambda request: HttpResponse())
+
+        def plain_view(request):
+            return HttpResponse()
+
+        self.assertIsNone(middleware.process_view(request, plain_view, (), {}))
+        limited = upload_limit()(plain_view)
+        self.assertEqual(middleware.process_view(request, limited, (), {}).status_code, 413)
+        get = RequestFactory().get('/', CONTENT_LENGTH=str(10 ** 9))
+        self.assertIsNone(middleware.process_view(get, limited, (), {}))
+
+
+class WorkspaceTests(TestCase):
+    """İstek çalışma alanlarının silinmesi ve eski geçici dosyaların süpürülmesi."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        media = os.path.join(tmp.name, 'media')
+        self.root = os.path.join(media, 'workspaces')
+        self.cache_dir = os.path.join(media, 'conversion_cache')
+        override = self.settings(
+            MEDIA_ROOT=media,
+            CONVERTER_WORKSPACE_ROOT=self.root,
+            FILE_UPLOAD_TEMP_DIR=os.path.join(self.root, 'uploads'),
+            CONVERTER_CACHE_DIR=self.cache_dir,
+            CONVERTER_PAGE_CACHE_DIR=os.path.join(media, 'page_cache'),
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _make(self, *parts, age=0, size=10):
+        path = os.path.join(*parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+        return path
+
+    def test_request_workspace_removed_on_exception(self):
+        with self.assertRaises(ValueError):
+            with request_workspace() as path:
+                self._make(path, 'output.pdf')
+                raise ValueError('dönüştürme hatası')
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(os.listdir(self.root), [])
+
+    def test_sweep_stale_only_removes_old_entries(self):
+        old_dir = os.path.join(self.root, 'req-old')
+        self._make(old_dir, 'output.pdf', size=100)
+        os.utime(old_dir, (time.time() - 7200, time.time() - 7200))
+        fresh_dir = os.path.join(self.root, 'req-new')
+        self._make(fresh_dir, 'output.pdf')
+        old_upload = self._make(self.root, 'uploads', 'old.upload', age=7200)
+        fresh_upload = self._make(self.root, 'uploads', 'new.upload')
+        old_tmp = self._make(self.cache_dir, 'ab', '.tmp-old', age=7200)
+        old_entry = self._make(self.cache_dir, 'ab', 'abcdef', age=7200)
+
+        report = sweep_stale(3600)
+
+        self.assertEqual(report['removed_entries'], 3)
+        self.assertEqual(report['removed_bytes'], 120)
+        for path in (old_dir, old_upload, old_tmp):
+            self.assertFalse(os.path.exists(path), path)
+        # Yeni dosyalara, uploads dizinine ve önbellek kayıtlarına dokunulmaz
+        for path in (fresh_dir, fresh_upload, old_entry):
+            self.assertTrue(os.path.exists(path), path)
+
+    def test_janitor_sweeps_and_expires_jobs(self):
+        old_upload = self._make(self.root, 'uploads', 'old.upload', age=7200)
+        job = ConversionJob.objects.create(
+            status=ConversionJob.DONE, original_name='a.pdf', output_format='docx',
+        )
+        ConversionJob.objects.filter(pk=job.pk).update(finished_at=timezone.now() - timedelta(days=2))
+        out = io.StringIO()
+        call_command('janitor', '--max-age', '3600', '--job-retention', '3600', '--json', stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['removed_entries'], 1)
+        self.assertEqual(report['expired_jobs'], 1)
+        self.assertFalse(os.path.exists(old_upload))
+        self.assertFalse(ConversionJob.objects.exists())
+
+
+class BatchInputTests(SimpleTestCase):
+    """Toplu yükleme: ZIP'lerin güvenli açılması, manifest ve yük kabulü payının bırakılması."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.workspace = os.path.join(tmp.name, 'workspace')
+        os.makedirs(self.workspace)
+        override = self.settings(
+            CONVERTER_WORKSPACE_ROOT=os.path.join(tmp.name, 'workspaces'),
+            CONVERTER_MAX_BATCH_UPLOAD_SIZE=1024 * 1024,
+            CONVERTER_BATCH_WORKERS=1,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        self.admission = AdmissionController(0, os.path.join(tmp.name, 'admission'))
+        patcher = mock.patch.object(batch, 'admission', self.admission)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutdown_pools)
+
+    def _zip(self, members):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, data in members.items():
+                archive.writestr(name, data)
+        return SimpleUploadedFile('upload.zip', buffer.getvalue())
+
+    def _pdf(self, name, pages=2):
+        path = os.path.join(self.dir, name)
+        benchmark.generate_pdf(path, pages=pages, paragraphs=2, images=0, image_px=32)
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_zip_members_stay_inside_workspace(self):
+        upload = self._zip({
+            '../../evil.pdf': b'%PDF-1.4',
+            '/etc/abs.docx': b'PK',
+            'a/../../b/./rapor.pdf': b'%PDF-1.4',
+            '.gizli.pdf': b'%PDF-1.4',
+            'klasor/': b'',
+            'notlar.txt': b'metin',
+        })
+        inputs = collect_inputs([upload], self.workspace, views.SUPPORTED_EXTENSIONS)
+        self.assertEqual([name for name, _, _ in inputs], ['evil.pdf', 'etc/abs.docx', 'a/b/rapor.pdf', 'notlar.txt'])
+        self.assertEqual(inputs[-1][1:], (None, "Desteklenmeyen dosya formatı."))
+        for _, path, _ in inputs[:-1]:
+            self.assertEqual(os.path.dirname(path), self.workspace)
+        self.assertEqual(os.listdir(self.dir), ['workspace'])
+
+    def test_zip_bomb_rejected_within_budget(self):
+        upload = self._zip({'bomba.pdf': b'\0' * (8 * 1024 * 1024)})
+        self.assertLess(upload.size, 64 * 1024)
+        with self.assertRaises(BatchError):
+            collect_inputs([upload], self.workspace, views.SUPPORTED_EXTENSIONS)
+        # Sınır aşılınca yazma durur; açılmış içeriğin tamamı diske inmez
+        written = sum(os.path.getsize(os.path.join(self.workspace, n)) for n in os.listdir(self.workspace))
+        self.assertLessEqual(written, settings.CONVERTER_MAX_BATCH_UPLOAD_SIZE)
+
+    def test_budget_is_shared_by_all_files(self):
+        uploads = [SimpleUploadedFile(f'{i}.pdf', b'x' * (400 * 1024)) for i in range(3)]
+        with self.assertRaises(BatchError):
+            collect_inputs(uploads, self.workspace, views.SUPPORTED_EXTENSIONS)
+
+    def _stream(self, members):
+        inputs = collect_inputs([self._zip(members)], self.workspace, views.SUPPORTED_EXTENSIONS)
+        ticket = self.admission.acquire(batch.batch_cost(inputs, False))
+        return BatchStream(inputs, self.workspace, 'pdf', False, 'docx', ticket=ticket)
+
+    def test_manifest_lists_every_input(self):
+        stream = self._stream({
+            'rapor.pdf': self._pdf('rapor.pdf'),
+            'alt/rapor.pdf': self._pdf('rapor2.pdf'),
+            'RAPOR.pdf': self._pdf('rapor3.pdf'),
+            'bozuk.pdf': b'bu bir PDF degil',
+            'notlar.txt': b'metin',
+        })
+        data = b''.join(stream)
+        stream.close()
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            manifest = json.loads(archive.read('manifest.json'))
+            names = archive.namelist()
+        self.assertEqual((manifest['converted'], manifest['failed']), (3, 2))
+        files = {entry['input']: entry for entry in manifest['files']}
+        self.assertEqual(list(files), ['rapor.pdf', 'alt/rapor.pdf', 'RAPOR.pdf', 'bozuk.pdf', 'notlar.txt'])
+        self.assertEqual(files['rapor.pdf']['output'], 'rapor.docx')
+        self.assertEqual(files['alt/rapor.pdf']['output'], 'alt/rapor.docx')
+        self.assertEqual(files['RAPOR.pdf']['output'], 'RAPOR (2).docx')
+        for name in ('bozuk.pdf', 'notlar.txt'):
+            self.assertEqual(files[name]['status'], 'error')
+            self.assertTrue(files[name]['error'])
+        self.assertEqual(sorted(names), ['RAPOR (2).docx', 'alt/rapor.docx', 'manifest.json', 'rapor.docx'])
+        self.assertFalse(os.path.exists(self.workspace))
+        self.assertEqual(self.admission.in_flight(), 0)
+
+    def test_ticket_released_when_client_disconnects(self):
+        stream = self._stream({f'{i}.pdf': self._pdf(f'{i}.pdf') for i in range(3)})
+        self.assertGreater(self.admission.in_flight(), 0)
+        next(iter(stream))
+        stream.close()
+        self.assertEqual(self.admission.in_flight(), 0)
+        self.assertFalse(os.path.exists(self.workspace))
+
+    def test_ticket_released_when_stream_never_starts(self):
+        stream = self._stream({'rapor.pdf': self._pdf('rapor.pdf')})
+        stream.close()
+        self.assertEqual(self.admission.in_flight(), 0)
+        self.assertFalse(os.path.exists(self.workspace))
+
+
+class LazyImportTests(SimpleTestCase):
+    """Ağır kütüphaneler ancak kendi biçimleri ilk kez işlendiğinde yüklenir."""
+
+    HEAVY = ('fitz', 'PyPDF2', 'docx', 'pptx', 'reportlab', 'PIL', 'lxml')
+
+    def _loaded_after(self, code):
+        script = (
+            "import os, sys, django\n"
+            "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'duckspinner.settings')\n"
+            "django.setup()\n"
+            f"{code}\n"
+            f"print(' '.join(sorted({{m.split('.')[0] for m in sys.modules}} & set({self.HEAVY!r}))))\n"
+        )
+        result = subprocess.run([sys.executable, '-c', script], cwd=settings.BASE_DIR,
+                                capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return set(result.stdout.split())
+
+    def test_views_import_no_backends(self):
+        code = (
+            "import duckspinner.urls, converter.views\n"
+            "from django.core.handlers.wsgi import WSGIHandler\n"
+            "WSGIHandler()"
+        )
+        self.assertEqual(self._loaded_after(code), set())
+
+    def test_load_format_imports_only_its_backends(self):
+        # python-pptx ve reportlab resimler için PIL'i, python-docx/pptx XML için lxml'i kendileri yükler
+        expected = {
+            'word': {'docx', 'lxml'},
+            'powerpoint': {'pptx', 'lxml', 'PIL'},
+            'pdf': {'fitz', 'PyPDF2'},
+            'pdf_output': {'reportlab', 'PIL'},
+            'images': {'PIL'},
+        }
+        for name, modules in expected.items():
+            with self.subTest(name):
+                code = f"import converter.views\nfrom converter.backends import load_format\nload_format({name!r})"
+                self.assertEqual(self._loaded_after(code), modules)
+
+
+def _pdf_pages(data):
+    import fitz
+
+    with fitz.open(stream=data, filetype='pdf') as pdf_document:
+        return [page.get_text() for page in pdf_document]
+
+
+class FlowableStreamTests(SimpleTestCase):
+    """Akışla beslenen build(), hikâyenin liste olarak verildiği eski yolla aynı PDF'i üretir."""
+
+    def _blocks(self):
+        for i in range(120):
+            yield ParagraphBlock(f'Paragraf {i}: ' + 'uzun bir cümle daha ' * (i % 7 + 1))
+            if i % 10 == 0:
+                yield ImageBlock(ExtractedImage(benchmark._image(i, 48, 0), 48, 48, 'jpg'))
+
+    def test_matches_list_build(self):
+        streamed = io.BytesIO()
+        self.assertIs(create_pdf_with_images(self._blocks(), streamed), True)
+        baseline = io.BytesIO()
+        with mock.patch.object(views, 'FlowableStream', list):
+            self.assertIs(create_pdf_with_images(self._blocks(), baseline), True)
+        streamed_pages = _pdf_pages(streamed.getvalue())
+        self.assertGreater(len(streamed_pages), 3)
+        self.assertEqual(streamed_pages, _pdf_pages(baseline.getvalue()))
+
+    def test_long_keep_with_next_chain(self):
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+        body = ParagraphStyle('body', fontSize=11, leading=14)
+        heading = ParagraphStyle('heading', parent=body, keepWithNext=1)
+
+        def story():
+            for i in range(40):
+                yield Paragraph(f'Dolgu {i}', body)
+            for i in range(FlowableStream.LOOKAHEAD * 2):
+                yield Paragraph(f'Baslik {i}', heading)
+            yield Paragraph('Basliklara bagli metin', body)
+
+        def build(flowables):
+            buffer = io.BytesIO()
+            SimpleDocTemplate(buffer).build(flowables)
+            return _pdf_pages(buffer.getvalue())
+
+        pages = build(list(story()))
+        # Zincir sayfa sonuna denk gelir ve bütünüyle sonraki sayfaya taşınır
+        self.assertIn('Baslik 0', pages[1])
+        self.assertEqual(build(FlowableStream(story())), pages)
+
+
+class StageTimerTests(SimpleTestCase):
+    def test_nested_stages_are_exclusive(self):
+        clock = iter([0.0, 1.0, 3.0, 6.0, 10.0, 12.0])
+        with mock.patch.object(metrics.time, 'perf_counter', lambda: next(clock)):
+            with metrics.StageTimer() as timer:
+                with metrics.stage('write'):
+                    with metrics.stage('extract'):
+                        pass
+        self.assertEqual(timer.durations, {'write': 6.0, 'extract': 3.0})
+        self.assertEqual(timer.total, 12.0)
+        self.assertEqual(timer.server_timing(), 'write;dur=6000.0, extract;dur=3000.0, total;dur=12000.0')
+
+    def test_counts_and_merged_timings(self):
+        with metrics.StageTimer() as timer:
+            self.assertEqual(list(metrics.timed_iter('extract', 'abc')), ['a', 'b', 'c'])
+            metrics.count('pages', 2)
+            metrics.merge_timings({'extract': 1.5}, {'pages': 3, 'images': 1})
+        self.assertGreaterEqual(timer.durations['extract'], 1.5)
+        self.assertEqual(timer.counts, {'pages': 5, 'images': 1})
+        # Etkin zamanlayıcı yokken ölçüm çağrıları bir şey yapmaz
+        with metrics.stage('extract'):
+            metrics.count('pages')
+        self.assertEqual(timer.counts['pages'], 5)
+
+
+class MetricsRegistryTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def _registry(self, directory=None):
+        registry = metrics.Registry(directory)
+        conversions = registry.counter('test_conversions_total', 'Dönüştürmeler', ('input_type', 'result'))
+        seconds = registry.histogram('test_seconds', 'Süre', ('input_type',), buckets=(0.5, 2))
+        return registry, conversions, seconds
+
+    def test_prometheus_text(self):
+        registry, conversions, seconds = self._registry()
+        with registry.update():
+            conversions.inc(input_type='pdf', result='ok')
+            conversions.inc(2, input_type='docx', result='hata "x"\n')
+            seconds.observe(0.25, input_type='pdf')
+            seconds.observe(1.5, input_type='pdf')
+        self.assertEqual(registry.render(), '\n'.join([
+            '# HELP test_conversions_total Dönüştürmeler',
+            '# TYPE test_conversions_total counter',
+            'test_conversions_total{input_type="docx",result="hata \\"x\\"\\n"} 2',
+            'test_conversions_total{input_type="pdf",result="ok"} 1',
+            '# HELP test_seconds Süre',
+            '# TYPE test_seconds histogram',
+            'test_seconds_bucket{input_type="pdf",le="0.5"} 1',
+            'test_seconds_bucket{input_type="pdf",le="2.0"} 2',
+            'test_seconds_bucket{input_type="pdf",le="+Inf"} 2',
+            'test_seconds_sum{input_type="pdf"} 1.75',
+            'test_seconds_count{input_type="pdf"} 2',
+        ]) + '\n')
+
+    def _dead_pid(self):
+        process = multiprocessing.Process(target=int)
+        process.start()
+        process.join()
+        return process.pid
+
+    def _snapshot(self, name, value):
+        with open(os.path.join(self.dir, name), 'w') as f:
+            json.dump({'test_conversions_total': [[['pdf', 'ok'], value]]}, f)
+
+    def test_snapshots_are_keyed_by_pid_and_start_time(self):
+        registry, conversions, _ = self._registry(self.dir)
+        parent = os.getppid()
+        parent_start = metrics._process_start(parent)
+        self._snapshot(f'{parent}-{parent_start}.json', 10)
+        self._snapshot(f'{parent}-{int(parent_start) + 1}.json', 100)  # pid yeniden kullanılmış
+        self._snapshot(f'{self._dead_pid()}-1.json', 1000)
+        with registry.update():
+            conversions.inc(input_type='pdf', result='ok')
+        own = f'{os.getpid()}-{metrics._process_start(os.getpid())}.json'
+        self.assertEqual(sorted(os.listdir(self.dir)), sorted([own, f'{parent}-{parent_start}.json']))
+        self.assertIn('test_conversions_total{input_type="pdf",result="ok"} 11', registry.render())
+
+    def test_prune_removes_dead_processes(self):
+        registry, _, _ = self._registry(self.dir)
+        dead = self._dead_pid()
+        self._snapshot(f'{dead}.json', 1)  # eski biçim: yalnızca pid
+        self._snapshot(f'{dead}-5.json', 1)
+        self._snapshot(f'{os.getpid()}-{metrics._process_start(os.getpid())}.json', 1)
+        self.assertEqual(registry.prune(), 2)
+        self.assertEqual(len(os.listdir(self.dir)), 1)
+
+
+class PdfWriterTextTests(SimpleTestCase):
+    """reportlab ve fitz oluşturucuları metni düz metin olarak, aynı biçimde yazar."""
+
+    TEXTS = [
+        'a < b && c > d',
+        '<b>kalin degil</b> <font size=40>buyuk degil</font>',
+        'Tom &amp; Jerry &lt;aynen&gt; &#60; "tirnak" \'tek\'',
+        '<br/>satir<para>',
+    ]
+
+    def _text(self, writer):
+        buffer = io.BytesIO()
+        self.assertIs(writer([ParagraphBlock(text) for text in self.TEXTS], buffer), True)
+        return ' '.join(' '.join(_pdf_pages(buffer.getvalue())).split())
+
+    def test_writers_extract_same_text(self):
+        expected = ' '.join(self.TEXTS)
+        self.assertEqual(self._text(create_pdf_with_fitz), expected)
+        self.assertEqual(self._text(create_pdf_with_images), expected)
+
+
+class ChunkedPdfTests(SimpleTestCase):
+    """Parça parça oluşturulup birleştirilen PDF, tek parça çıktıyla aynı sayfaları içerir."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = self.settings(CONVERTER_WORKSPACE_ROOT=tmp.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(shutdown_pools)
+        self.images = [ExtractedImage(benchmark._image(i, 40, 1), 40, 40, 'jpg') for i in range(30)]
+
+    def _blocks(self, paragraphs=40):
+        for i in range(paragraphs):
+            yield ParagraphBlock(f'Paragraf {i} ' + 'metin ' * 30)
+        for image in self.images:
+            yield ImageBlock(image)
+
+    def _pages(self, data):
+        import fitz
+
+        with fitz.open(stream=data, filetype='pdf') as pdf_document:
+            return [(page.get_text(), len(page.get_images())) for page in pdf_document]
+
+    def _build(self, writer, paragraphs=40, **chunking):
+        buffer = io.BytesIO()
+        if chunking:
+            result = create_pdf_chunked(self._blocks(paragraphs), buffer, writer, **chunking)
+        else:
+            result = writer(self._blocks(paragraphs), buffer)
+        self.assertIs(result, True)
+        return self._pages(buffer.getvalue())
+
+    def test_image_chunks_match_single_build(self):
+        for writer in (create_pdf_with_images, create_pdf_with_fitz):
+            with self.subTest(writer.__name__):
+                expected = self._build(writer)
+                # 40 paragraf + 30 resim: metin sayfaları ve 4 ızgara sayfası
+                self.assertEqual([n for _, n in expected if n], [9, 9, 9, 3])
+                self.assertEqual(self._build(writer, max_images=9), expected)
+
+    def test_parallel_chunks_match_single_build(self):
+        expected = self._build(create_pdf_with_images)
+        self.assertEqual(self._build(create_pdf_with_images, max_images=9, workers=2), expected)
+
+    def test_leading_blank_page_dropped_only_when_blank(self):
+        # Yalnızca resimlerden oluşan belge: reportlab her parçada önce boş bir sayfa açar,
+        # fitz açmaz; ilk parçanınki tek parça çıktıda da vardır
+        for writer in (create_pdf_with_images, create_pdf_with_fitz):
+            with self.subTest(writer.__name__):
+                expected = self._build(writer, paragraphs=0)
+                chunked = self._build(writer, paragraphs=0, max_images=9)
+                self.assertEqual(chunked, expected)
+                self.assertEqual([n for _, n in chunked[-4:]], [9, 9, 9, 3])
+
+    def test_paragraph_chunks_keep_all_text(self):
+        expected = self._build(create_pdf_with_images)
+        chunked = self._build(create_pdf_with_images, max_paragraphs=15)
+        text = lambda pages: ' '.join(''.join(t for t, _ in pages).split())
+        self.assertEqual(text(chunked), text(expected))
+        self.assertEqual(sum(n for _, n in chunked), 30)
+        # Metin parçaları yeni sayfada başlar, ama boş sayfa kalmaz
+        self.assertTrue(all(t.strip() or n for t, n in chunked))
+
+
+class HomeAsyncTests(SimpleTestCase):
+    """home_async dönüştürmeyi alt süreçte, olay döngüsünde bekleyerek yapar."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        override = self.settings(CONVERTER_WORKSPACE_ROOT=os.path.join(tmp.name, 'workspaces'))
+        override.enable()
+        self.addCleanup(override.disable)
+        self.admission = AdmissionController(0, os.path.join(tmp.name, 'admission'))
+        for name, value in (('conversion_cache', None), ('page_cache', None), ('admission', self.admission)):
+            patcher = mock.patch.object(views, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _post(self, **data):
+        path = os.path.join(self.dir, 'doc.docx')
+        benchmark.generate_docx(path, pages=2, paragraphs=3, images=0, image_px=32)
+        with open(path, 'rb') as f:
+            data['document'] = SimpleUploadedFile('doc.docx', f.read())
+        return AsyncRequestFactory().post('/', data)
+
+    @async_to_sync
+    async def _convert(self, request):
+        response = await views.home_async(request)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        return response, content
+
+    def test_converts_in_child_process(self):
+        response, content = self._convert(self._post(output_format='pdf'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(content.startswith(b'%PDF'))
+        self.assertEqual(int(response['Content-Length']), len(content))
+        self.assertIn('isolation;dur=', response['Server-Timing'])
+        self.assertIn('extract', response['Server-Timing'])
+        self.assertEqual(os.listdir(settings.CONVERTER_WORKSPACE_ROOT), [])
+
+    @async_to_sync
+    async def _convert_beside(self, request):
+        """Tek iş parçacıklı varsayılan havuzla dönüştürürken başka bir sync_to_async çağrısının bekleme süresi."""
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+        conversion = asyncio.ensure_future(views.home_async(request))
+        await asyncio.sleep(0.5)
+        started = time.monotonic()
+        await sync_to_async(int, thread_sensitive=False)()
+        waited = time.monotonic() - started
+        return await conversion, waited
+
+    def test_conversion_does_not_hold_a_thread(self):
+        with self.settings(CONVERTER_CONVERSION_TIMEOUT=2), \
+                mock.patch.object(views, 'convert_to_file', _sleep_forever):
+            response, waited = self._convert_beside(self._post(output_format='word'))
+        self.assertLess(waited, 1)
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('süre sınırını', response.content.decode())
+        self.assertEqual(os.listdir(settings.CONVERTER_WORKSPACE_ROOT), [])
+        self.assertEqual(self.admission.in_flight(), 0)
+
+    @async_to_sync
+    async def _cancel_after(self, request, delay):
+        conversion = asyncio.ensure_future(views.home_async(request))
+        await asyncio.sleep(delay)
+        conversion.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await conversion
+
+    def test_disconnect_kills_child_and_releases_ticket(self):
+        with mock.patch.object(views, 'convert_to_file', _sleep_forever), \
+                mock.patch.object(isolation, '_kill', side_effect=isolation._kill) as kill:
+            self._cancel_after(self._post(output_format='word'), 0.5)
+        kill.assert_called_once()
+        self.assertEqual(os.listdir(settings.CONVERTER_WORKSPACE_ROOT), [])
+        self.assertEqual(self.admission.in_flight(), 0)
+
+
+class PageCacheTests(SimpleTestCase):
+    """Sayfa önbelleği: ortak sayfaların belgeler arasında yeniden kullanılması ve boyut takibi."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.cache = PageCache(os.path.join(tmp.name, 'page_cache'), 10 * 1024 * 1024)
+        self.normalizer = TextNormalizer()
+
+    def _path(self, name):
+        return os.path.join(self.dir, name)
+
+    def _counts(self, extract):
+        with metrics.StageTimer() as timer:
+            result = list(extract())
+        return result, timer.counts
+
+    def test_pdf_pages_reused_across_documents(self):
+        import fitz
+
+        original, other, edited = self._path('a.pdf'), self._path('b.pdf'), self._path('edited.pdf')
+        benchmark.generate_pdf(original, pages=6, paragraphs=3, images=0, image_px=32)
+        benchmark.generate_pdf(other, pages=1, paragraphs=3, images=0, image_px=32, seed=7)
+        # Düzenlenmiş belge: yeni bir ilk sayfa ve özgün belgenin 2-5. sayfaları
+        with fitz.open(original) as a, fitz.open(other) as b, fitz.open() as c:
+            c.insert_pdf(b)
+            c.insert_pdf(a, from_page=1, to_page=4)
+            c.save(edited)
+
+        _, counts = self._counts(lambda: pdf_text.iter_pages_cached(original, self.normalizer, self.cache))
+        self.assertEqual(counts, {'page_cache_page_miss': 6})
+        pages, counts = self._counts(lambda: pdf_text.iter_pages_cached(edited, self.normalizer, self.cache))
+        self.assertEqual(counts, {'page_cache_page_miss': 1, 'page_cache_page_hit': 4})
+        self.assertEqual(pages, pdf_text.extract_pdf_pages(edited, self.normalizer, engine='fitz'))
+
+    def test_slides_reused_across_documents(self):
+        short, longer = self._path('a.pptx'), self._path('b.pptx')
+        # Aynı tohumla üretilen sunumların ilk üç slaydı aynıdır
+        benchmark.generate_pptx(short, pages=3, paragraphs=2, images=0, image_px=32)
+        benchmark.generate_pptx(longer, pages=5, paragraphs=2, images=0, image_px=32)
+        self._counts(lambda: ooxml.SlideReader(short, cache=self.cache).slide_texts())
+        slides, counts = self._counts(lambda: ooxml.SlideReader(longer, cache=self.cache).slide_texts())
+        self.assertEqual(counts, {'page_cache_slide_hit': 3, 'page_cache_slide_miss': 2})
+        self.assertEqual(slides, list(ooxml.SlideReader(longer).slide_texts()))
+
+    def _disk_size(self):
+        return sum(size for _, size, _ in self.cache._entries())
+
+    def test_size_tracking_across_flushes(self):
+        self.cache.max_bytes = 1000
+        with mock.patch.object(self.cache, 'evict', wraps=self.cache.evict) as evict:
+            for i in range(8):
+                self.cache.put_text(self.cache.unit_key('page', str(i)), 'x' * 100)
+            # İlk flush boyutu bilmediği için dizini tarar
+            self.cache.flush()
+            self.assertEqual(evict.call_count, 1)
+            self.assertEqual(self.cache._size, self._disk_size())
+
+            # Sınırın altında kalan yazımlar yalnızca sayılır, dizin taranmaz
+            self.cache.put_text(self.cache.unit_key('page', 'a'), 'x' * 50)
+            self.cache.flush()
+            self.assertEqual(evict.call_count, 1)
+            self.assertEqual(self.cache._size, self._disk_size())
+
+            # Sınır aşılınca en eski kayıtlar silinir ve boyut yeniden doğru olur
+            for i in range(8, 12):
+                self.cache.put_text(self.cache.unit_key('page', str(i)), 'x' * 100)
+            self.cache.flush()
+            self.assertEqual(evict.call_count, 2)
+            self.assertEqual(self.cache._size, self._disk_size())
+            self.assertLessEqual(self.cache._size, 1000)
+
+            # Yazım olmadıysa flush hiçbir şey yapmaz
+            self.cache.flush()
+            self.assertEqual(evict.call_count, 2)
+
+
+class SlideReaderTests(SimpleTestCase):
+    """SlideReader: resimlerin toplanması, slayt sınırı ve python-pptx'e düşme."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'pictures.pptx')
+        benchmark.generate_pptx(self.path, pages=4, paragraphs=1, images=4, image_px=32)
+
+    def _read(self, reader='stream', **options):
+        with ooxml.SlideReader(self.path, reader, pictures=True, **options) as slides:
+            texts = list(slides.slide_texts())
+            return texts, [slides.read_picture(name) for name in slides.pictures]
+
+    def test_pictures_match_python_pptx(self):
+        texts, pictures = self._read('stream')
+        self.assertEqual(len(pictures), 4)
+        self.assertEqual((texts, pictures), self._read('library'))
+        # Önbellekten okunan slaytların resimleri de aynı parçalardan gelir
+        cache = PageCache(os.path.join(os.path.dirname(self.path), 'page_cache'), 10 * 1024 * 1024)
+        self.assertEqual(self._read('stream', cache=cache), (texts, pictures))
+        self.assertEqual(self._read('stream', cache=cache), (texts, pictures))
+
+    def test_max_slides(self):
+        texts, pictures = self._read('stream')
+        for reader in ooxml.READERS:
+            with self.subTest(reader):
+                self.assertEqual(self._read(reader, max_slides=2), (texts[:2], pictures[:2]))
+
+    def test_falls_back_to_python_pptx_before_first_slide(self):
+        expected = self._read('library')
+        with mock.patch.object(ooxml, '_slide_shapes', side_effect=etree.XMLSyntaxError('bozuk', None, 1, 1)):
+            self.assertEqual(self._read('stream'), expected)
+
+    def test_failure_after_first_slide_is_raised(self):
+        calls = []
+
+        def fail_second(stream):
+            calls.append(stream)
+            if len(calls) == 2:
+                raise etree.XMLSyntaxError('bozuk', None, 1, 1)
+            return shapes(stream)
+
+        shapes = ooxml._slide_shapes
+        # Üretilmiş slaytlar tekrar üretilmesin diye yedek okuyucuya geçilmez
+        with mock.patch.object(ooxml, '_slide_shapes', side_effect=fail_second), \
+                mock.patch.object(ooxml.SlideReader, '_library', side_effect=AssertionError('yedek')):
+            with self.assertRaises(etree.XMLSyntaxError):
+                self._read('stream')
+
+    def test_unknown_reader(self):
+        with self.assertRaises(ValueError):
+            self._read('xml')
+
+
+class ResponsiveImageTests(SimpleTestCase):
+    """collectstatic resim varyantlarını üretir; responsive_image onları özetli adlarıyla kullanır."""
+
+    IMAGE = 'converter/images/hello_kitty_maskot_yildizli.jpg'
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = self.settings(
+            STATIC_ROOT=tmp.name,
+            STATICFILES_DIRS=[],
+            CONVERTER_RESPONSIVE_IMAGE_WIDTHS=[150, 300, 4096],
+            CONVERTER_RESPONSIVE_IMAGE_FORMATS=['avif', 'webp'],
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0, ignore_patterns=['admin'])
+        # AVIF/WEBP Pillow derlemesinde yoksa üretilmez
+        self.formats = [ext for ext in ('avif', 'webp') if _format_available(ext)]
+
+    def test_variants_written_and_hashed(self):
+        from PIL import Image
+
+        variants = staticfiles_storage.variants(self.IMAGE)
+        # Kaynaktan (1024 px) geniş varyant üretilmez
+        self.assertEqual(variants, {
+            ext: [(f'converter/images/hello_kitty_maskot_yildizli.{width}w.{ext}', width) for width in (150, 300)]
+            for ext in [*self.formats, 'jpg']
+        })
+        for ext, names in variants.items():
+            for name, width in names:
+                hashed = staticfiles_storage.stored_name(name)
+                self.assertRegex(hashed, r'\.%dw\.[0-9a-f]{12}\.%s$' % (width, ext))
+                with staticfiles_storage.open(hashed) as f, Image.open(f) as image:
+                    self.assertEqual((image.format, image.width), (
+                        {'avif': 'AVIF', 'webp': 'WEBP', 'jpg': 'JPEG'}[ext], width,
+                    ))
+
+    def test_tag_renders_picture(self):
+        html = Template(
+            "{% load responsive %}{% responsive_image path '150px' alt='Kedi' class='kitty-icon' %}"
+        ).render(Context({'path': self.IMAGE}))
+        url = r'/static/converter/images/hello_kitty_maskot_yildizli\.%dw\.[0-9a-f]{12}\.%s %dw'
+        srcset = lambda ext: ', '.join(url % (width, ext, width) for width in (150, 300))
+        sources = ''.join(
+            r'<source type="image/%s" srcset="%s" sizes="150px">' % (ext, srcset(ext)) for ext in self.formats
+        )
+        self.assertRegex(html, (
+            r'^<picture>%s'
+            r'<img src="/static/converter/images/hello_kitty_maskot_yildizli\.300w\.[0-9a-f]{12}\.jpg" '
+            r'srcset="%s" sizes="150px" alt="Kedi" class="kitty-icon"></picture>$'
+        ) % (sources, srcset('jpg')))
@@ -0,0 +1,16 @@
+import os
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+class WorkspaceTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """Büyük yüklemeleri FILE_UPLOAD_TEMP_DIR'e yazar; dizini ilk yüklemede oluşturur.
+
+    Dizin uygulama açılırken oluşturulmaz; check, collectstatic gibi komutlar
+    (ör. derleme makinesinde) diske dokunmaz.
+    """
+
+    def new_file(self, *args, **kwargs):
+        os.makedirs(settings.FILE_UPLOAD_TEMP_DIR, exist_ok=True)
+        super().new_file(*args, **kwargs)
@@ -1,174 +1,277 @@
 from django.shortcuts import render
-from django.http import HttpResponse, FileResponse
-from django.core.files.storage import FileSystemStorage
-from docx import Document
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image, Table, TableStyle
-from reportlab.lib.units import inch
-from pptx import Presentation
-from pptx.enum.shapes import MSO_SHAPE_TYPE
-from PyPDF2 import PdfReader
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.http import HttpResponse, FileResponse, JsonResponse, Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
+from django.utils.http import content_disposition_header
+from asgiref.sync import sync_to_async
+from django.conf import settings
 import os
 import io
-import re
-from PIL import Image as PILImage
-import fitz  # PyMuPDF
+import html
+import logging
+import tempfile
+import time
+from collections import namedtuple
+# Ağır kütüphaneler (python-docx, reportlab, python-pptx, PyPDF2, PyMuPDF, PIL) modül
+# yüklenirken değil, ilgili biçim ilk kullanıldığında yüklenir (bkz. backends.py)
+from .normalizer import TextNormalizer, DEFAULT_WORDS
+from .pdf_text import iter_pdf_pages, open_pdf
+from .ooxml import SlideReader, iter_word_paragraphs
+from .cache import ConversionCache
+from .page_cache import PageCache
+from .models import ConversionJob
+from .images import ExtractedImage, ImageDeduplicator, prepare_images
+from .document import FlowableStream, ImageBlock, PageBreakBlock, ParagraphBlock, image_blocks, page_blocks
+from .fitz_writer import create_pdf_with_fitz
+from .docx_writer import create_word_bulk
+from .chunked_pdf import create_pdf_chunked
+from .metrics import StageTimer, count, maybe_profile, record_conversion, registry, stage, timed_iter
+from .workspace import create_workspace, remove_workspace, request_workspace
+from .batch import BatchError, BatchStream, batch_cost, collect_inputs
+from .admission import Overloaded, admission, estimate_cost
+from .isolation import IsolatedCall, run_steps, run_steps_async
+from .middleware import upload_limit, upload_too_large_message
+from .backends import PILImage, load_format
+
+logger = logging.getLogger(__name__)
+
+class _TimedNormalizer(TextNormalizer):
+    """Harcadığı süreyi etkin dönüştürmenin 'normalize' aşamasına yazan düzeltici."""
+
+    def normalize(self, text):
+        with stage('normalize'):
+            return super().normalize(text)
+
+    __call__ = normalize
+
+# Kelime listesi ayarlardan değiştirilebilir
+_normalizer = _TimedNormalizer(settings.CONVERTER_NORMALIZER_WORDS or DEFAULT_WORDS)
 
 def fix_text_formatting(text):
     """Metni düzeltir ve kelime birleştirme sorunlarını çözer."""
-    # Yaygın kelime birleştirme sorunlarını düzelt
-    replacements = {
-        r'\bthe\b': ' the ',
-        r'\band\b': ' and ',
-        r'\ban\b': ' an ',
-        r'\ba\b': ' a ',
-        r'\bof\b': ' of ',
-        r'\bin\b': ' in ',
-        r'\bon\b': ' on ',
-        r'\bat\b': ' at ',
-        r'\bto\b': ' to ',
-        r'\bfor\b': ' for ',
-        r'\bwith\b': ' with ',
-        r'\bby\b': ' by ',
-        r'\bfrom\b': ' from ',
-        r'\bas\b': ' as ',
-        r'\bis\b': ' is ',
-        r'\bare\b': ' are ',
-        r'\bwas\b': ' was ',
-        r'\bwere\b': ' were ',
-        r'\bbe\b': ' be ',
-        r'\bhave\b': ' have ',
-        r'\bhas\b': ' has ',
-        r'\bhad\b': ' had ',
-        r'\bdo\b': ' do ',
-        r'\bdoes\b': ' does ',
-        r'\bdid\b': ' did ',
-        r'\bwill\b': ' will ',
-        r'\bwould\b': ' would ',
-        r'\bshall\b': ' shall ',
-        r'\bshould\b': ' should ',
-        r'\bcan\b': ' can ',
-        r'\bcould\b': ' could ',
-        r'\bmay\b': ' may ',
-        r'\bmight\b': ' might ',
-        r'\bmust\b': ' must ',
-    }
-    
-    for pattern, replacement in replacements.items():
-        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-    
-    # Fazla boşlukları temizle
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    return _normalizer.normalize(text)
+
+def _extraction_error(e):
+    """Okunamayan dosyada eski davranış korunur (hata metni belgeye yazılır); hata 'extract_errors' olarak sayılır.
+
+    Toplu dönüştürme bu sayaçla dosyayı manifest'te başarısız gösterir.
+    """
+    print(f"Dosya okunurken hata: {e}")
+    count('extract_errors')
+    return ParagraphBlock(str(e))
+
+def extract_blocks_from_word(source, max_chars=None):
+    """Word dosyasının (yol ya da dosya benzeri nesne) paragraflarını blok olarak akıtır.
 
-def extract_text_from_word(file_path):
-    """Word dosyasından metni çıkarır."""
+    `max_chars` verilirse bu kadar karaktere ulaşan paragraftan sonra durulur (önizleme).
+    """
     try:
-        doc = Document(file_path)
-        text = []
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text.append(fix_text_formatting(paragraph.text.strip()))
-        return "\n\n".join(text)
+        chars = 0
+        for text in iter_word_paragraphs(source, settings.CONVERTER_OOXML_READER):
+            text = text.strip()
+            if text:
+                yield ParagraphBlock(fix_text_formatting(text))
+                chars += len(text)
+                if max_chars is not None and chars >= max_chars:
+                    break
     except Exception as e:
-        return str(e)
+        yield _extraction_error(e)
 
-def extract_text_from_powerpoint(file_path):
-    """PowerPoint dosyasından metni çıkarır."""
-    try:
-        prs = Presentation(file_path)
-        text = []
+# python-pptx'in resim türü -> uzantı eşlemesi (pptx.parts.image.Image.ext ile aynı)
+PPTX_IMAGE_EXTS = {'BMP': 'bmp', 'GIF': 'gif', 'JPEG': 'jpg', 'PNG': 'png', 'TIFF': 'tiff', 'WMF': 'wmf'}
 
-        for slide in prs.slides:
-            for shape in slide.shapes:
-                if hasattr(shape, "text"):
-                    if shape.text.strip():
-                        text.append(fix_text_formatting(shape.text.strip()))
+class PowerPointExtractor:
+    """PowerPoint dosyasını bir kez açıp slaytları bir kez dolaşan çıkarıcı.
 
-        return "\n\n".join(text)
-    except Exception as e:
-        return str(e)
+    `blocks` metni slayt slayt akıtırken resim şekillerinin parçalarını
+    toplar; `images` resimleri ardından aynı paketten, tekrarları eleyerek
+    üretir. `cache` (PageCache) verilirse değişmeyen slaytlar yeniden
+    ayrıştırılmaz; `max_pages` verilirse yalnızca ilk o kadar slayt okunur.
+    """
 
-def extract_text_from_pdf(file_path):
-    """PDF dosyasından metni çıkarır."""
-    try:
-        reader = PdfReader(file_path)
-        text = []
-        for page in reader.pages:
-            content = page.extract_text()
-            if content.strip():
-                text.append(fix_text_formatting(content.strip()))
-        return "\n\n".join(text)
-    except Exception as e:
-        return str(e)
+    def __init__(self, source, with_images=False, deduplicator=None, cache=None, max_pages=None):
+        self.deduplicator = deduplicator or ImageDeduplicator()
+        self.reader = SlideReader(
+            source, settings.CONVERTER_OOXML_READER, cache, pictures=with_images, max_slides=max_pages,
+        )
 
-def extract_images_from_powerpoint(file_path):
-    """PowerPoint'ten resimleri çıkarır."""
-    try:
-        prs = Presentation(file_path)
-        images = []
-        temp_dir = os.path.join(os.path.dirname(file_path), 'temp_images')
-        os.makedirs(temp_dir, exist_ok=True)
-        
-        for slide_number, slide in enumerate(prs.slides):
-            for shape in slide.shapes:
-                if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+    def blocks(self):
+        """Metni slayt slayt, aralarına sayfa sonu koyarak akıtır."""
+        try:
+            def slide_texts(texts):
+                for text in texts:
+                    text = text.strip()
+                    if text:
+                        yield fix_text_formatting(text)
+
+            yield from page_blocks(slide_texts(texts) for texts in self.reader.slide_texts())
+        except Exception as e:
+            yield _extraction_error(e)
+
+    def images(self):
+        """`blocks`'un topladığı resimleri bellekte, tekrarları eleyerek tek tek üretir."""
+        try:
+            for partname in self.reader.pictures:
+                try:
+                    if partname is None:
+                        raise ValueError("Resim şeklinin gömülü resmi yok")
+                    # Aynı resim parçası (ör. her slayttaki logo) bir kez işlenir
+                    if self.deduplicator.seen_source(partname):
+                        continue
+                    data = self.reader.read_picture(partname)
+                    # Boyut ve tür, python-pptx'teki gibi yalnızca resim başlığından okunur
                     try:
-                        image_path = os.path.join(temp_dir, f'slide_{slide_number}.png')
-                        with open(image_path, 'wb') as f:
-                            f.write(shape.image.blob)
-                        images.append(image_path)
-                    except Exception as shape_error:
-                        print(f"Resim işlenirken hata: {shape_error}")
+                        with PILImage.open(io.BytesIO(data)) as im:
+                            image_format, (width, height) = im.format, im.size
+                    except Exception:
+                        image_format, width, height = None, 0, 0
+                    ext = PPTX_IMAGE_EXTS.get(image_format)
+                    if ext is None:
+                        # Eski sürümdeki gibi resim yine de ızgaraya verilir (ör. WEBP, SVG);
+                        # açamayan oluşturucu hücreyi boş bırakır
+                        ext = (image_format or os.path.splitext(partname)[1].lstrip('.')).lower()
+                        print(f"python-pptx'in tanımadığı resim türü ({ext}) olduğu gibi ekleniyor: {partname}")
+                    extracted = ExtractedImage(data, width, height, ext)
+                except Exception as shape_error:
+                    print(f"Resim işlenirken hata: {shape_error}")
+                    continue
+                if self.deduplicator.add(extracted):
+                    yield extracted
+        except Exception as e:
+            print(f"PowerPoint'ten resim çıkarılırken hata: {e}")
+        finally:
+            self.close()
+
+    def close(self):
+        self.reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class PdfExtractor:
+    """PDF'i bir kez açıp sayfaları bir kez dolaşan çıkarıcı.
+
+    `blocks` metni sayfa sayfa akıtırken dolaşılan sayfaların resim listesini
+    toplar; `images` resimleri ardından aynı belgeden üretir. Süreç havuzunda
+    ya da PyPDF2 ile okunan sayfaların listesi `images`'ta alınır. `max_pages`
+    verilirse metin ve resimler yalnızca ilk o kadar sayfadan alınır.
+    """
+
+    def __init__(self, source, with_images=False, deduplicator=None, cache=None, max_pages=None):
+        self.source = source
+        self.with_images = with_images
+        self.deduplicator = deduplicator or ImageDeduplicator()
+        self.cache = cache
+        self.max_pages = max_pages
+        self._document = None
+        self._page_images = {}
+
+    def _open(self):
+        if self._document is None:
+            self._document = open_pdf(self.source)
+        return self._document
+
+    def _visit(self, page):
+        self._page_images[page.number] = page.get_images()
+
+    def blocks(self):
+        """Metni sayfa okundukça, her sayfa bir paragraf olacak şekilde akıtır."""
+        try:
+            try:
+                pdf_document = self._open()
+            except Exception:
+                pdf_document = None  # fitz açamıyorsa iter_pdf_pages PyPDF2'ye düşer
+            pages = iter_pdf_pages(
+                self.source,
+                _normalizer,
+                engine=settings.CONVERTER_PDF_ENGINE,
+                parallel_min_pages=settings.CONVERTER_PDF_PARALLEL_MIN_PAGES,
+                workers=settings.CONVERTER_PDF_WORKERS,
+                cache=self.cache,
+                pdf_document=pdf_document,
+                visit=self._visit if self.with_images and pdf_document is not None else None,
+                max_pages=self.max_pages,
+            )
+            yield from page_blocks([page] for page in pages)
+        except Exception as e:
+            yield _extraction_error(e)
+
+    def images(self):
+        """Resimleri bellekte, tekrarları eleyerek tek tek üretir."""
+        try:
+            pdf_document = self._open()
+            page_count = len(pdf_document)
+            if self.max_pages is not None:
+                page_count = min(page_count, self.max_pages)
+            for page_num in range(page_count):
+                image_list = self._page_images.pop(page_num, None)
+                if image_list is None:
+                    image_list = pdf_document[page_num].get_images()
+
+                for img in image_list:
+                    xref, width, height = img[0], img[2], img[3]
+                    # Çok küçük resimleri (örn. ikonlar) çıkarmadan atla; boyutlar fitz'in bilgisinden gelir
+                    if width <= 100 or height <= 100:
                         continue
-        
-        return images
-    except Exception as e:
-        print(f"PowerPoint'ten resim çıkarılırken hata: {e}")
-        return []
+                    # Birden çok sayfada kullanılan xref yalnızca bir kez çıkarılır
+                    if self.deduplicator.seen_source(xref):
+                        continue
+                    base_image = pdf_document.extract_image(xref)
+                    extracted = ExtractedImage(
+                        base_image["image"], base_image["width"], base_image["height"], base_image["ext"]
+                    )
+                    if self.deduplicator.add(extracted):
+                        yield extracted
+        except Exception as e:
+            print(f"PDF'ten resim çıkarılırken hata: {e}")
+        finally:
+            self.close()
 
-def extract_images_from_pdf(file_path):
-    """PDF'ten resimleri çıkarır."""
-    try:
-        images = []
-        temp_dir = os.path.join(os.path.dirname(file_path), 'temp_images')
-        os.makedirs(temp_dir, exist_ok=True)
-        
-        # PyMuPDF ile PDF'i aç
-        pdf_document = fitz.open(file_path)
-        
-        for page_num in range(len(pdf_document)):
-            page = pdf_document[page_num]
-            image_list = page.get_images()
-            
-            for img_index, img in enumerate(image_list):
-                xref = img[0]
-                base_image = pdf_document.extract_image(xref)
-                image_bytes = base_image["image"]
-                
-                # Resmi kaydet
-                image_path = os.path.join(temp_dir, f'pdf_image_{page_num}_{img_index}.png')
-                with open(image_path, 'wb') as image_file:
-                    image_file.write(image_bytes)
-                
-                # Resmi PIL ile aç ve boyutunu kontrol et
-                with PILImage.open(image_path) as img:
-                    width, height = img.size
-                    # Çok küçük resimleri (örn. ikonlar) atla
-                    if width > 100 and height > 100:
-                        images.append(image_path)
-        
-        pdf_document.close()
-        return images
-    except Exception as e:
-        print(f"PDF'ten resim çıkarılırken hata: {e}")
-        return []
+    def close(self):
+        if self._document is not None:
+            self._document.close()
+            self._document = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def extract_blocks_from_powerpoint(source, cache=None):
+    """PowerPoint dosyasının metnini slayt slayt, aralarına sayfa sonu koyarak akıtır."""
+    with PowerPointExtractor(source, cache=cache) as extractor:
+        yield from extractor.blocks()
 
-def create_pdf_with_images(text, images, buffer):
-    """Metni ve resimleri PDF'e dönüştürür."""
+def extract_blocks_from_pdf(source, cache=None):
+    """PDF dosyasının metnini sayfa okundukça, her sayfa bir paragraf olacak şekilde akıtır."""
+    with PdfExtractor(source, cache=cache) as extractor:
+        yield from extractor.blocks()
+
+def extract_images_from_powerpoint(source, deduplicator=None):
+    """PowerPoint'ten resimleri bellekte, tekrarları eleyerek tek tek üretir (resimler slaytlar dolaşılarak bulunur)."""
+    with PowerPointExtractor(source, True, deduplicator) as extractor:
+        for _ in extractor.reader.slide_texts():
+            pass
+        yield from extractor.images()
+
+def extract_images_from_pdf(source, deduplicator=None):
+    """PDF'ten resimleri bellekte, tekrarları eleyerek tek tek üretir."""
+    with PdfExtractor(source, True, deduplicator) as extractor:
+        yield from extractor.images()
+
+def create_pdf_with_images(blocks, buffer):
+    """Blok akışındaki metni ve resimleri PDF'e dönüştürür."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image, Table, TableStyle
     try:
         doc = SimpleDocTemplate(
             buffer,
@@ -189,114 +292,97 @@ def create_pdf_with_images(text, images, buffer):
             spaceAfter=6
         )
 
-        story = []
-        paragraphs = text.split("\n\n")
-
-        # Önce metinleri ekle
-        for paragraph in paragraphs:
-            if paragraph.strip():
-                p = Paragraph(paragraph.strip(), normal_style)
-                story.append(p)
-                story.append(Spacer(1, 10))
-
-        # Sonra resimleri 3x3 grid olarak ekle (her sayfada 9 resim)
-        if images:
-            # Tekrarlanan resimleri engelle
-            unique_images = []
-            seen_images = set()
-            
-            for img_path in images:
-                # Resmin hash'ini al (boyut ve ilk birkaç byte'a bakarak)
-                try:
-                    with open(img_path, 'rb') as f:
-                        img_data = f.read()
-                        img_hash = hash(img_data[:1000])  # İlk 1000 byte'ı kullan
-                        if img_hash not in seen_images:
-                            seen_images.add(img_hash)
-                            unique_images.append(img_path)
-                except:
-                    continue
-
-            # Her sayfada 9 resim olacak şekilde grid oluştur
-            for i in range(0, len(unique_images), 9):
-                page_images = unique_images[i:i+9]
-                grid_data = []
-                for j in range(0, 9, 3):
-                    row = []
-                    for img_path in page_images[j:j+3]:
-                        try:
-                            img = Image(img_path)
-                            # Resim boyutunu büyüt
-                            img._restrictSize(3*inch, 3*inch)
-                            row.append(img)
-                        except:
-                            row.append('')
-                    # Eğer satırda 3'ten az resim varsa boş kutu ekle
-                    while len(row) < 3:
+        def image_grid(page_images):
+            grid_data = []
+            for j in range(0, 9, 3):
+                row = []
+                for image in page_images[j:j+3]:
+                    try:
+                        img = Image(io.BytesIO(image.data), width=image.width, height=image.height)
+                        # Resim boyutunu büyüt
+                        img._restrictSize(3*inch, 3*inch)
+                        row.append(img)
+                    except:
                         row.append('')
-                    grid_data.append(row)
-                
-                table = Table(grid_data, colWidths=[3.2*inch]*3)
-                table.setStyle(TableStyle([
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 5),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-                    ('TOPPADDING', (0, 0), (-1, -1), 5),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-                ]))
-                story.append(PageBreak())
-                story.append(table)
-
-        doc.build(story)
+                # Eğer satırda 3'ten az resim varsa boş kutu ekle
+                while len(row) < 3:
+                    row.append('')
+                grid_data.append(row)
+
+            table = Table(grid_data, colWidths=[3.2*inch]*3)
+            table.setStyle(TableStyle([
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('LEFTPADDING', (0, 0), (-1, -1), 5),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 5),
+                ('TOPPADDING', (0, 0), (-1, -1), 5),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+            ]))
+            return table
+
+        def story():
+            # Metinler paragraf paragraf; resimler 3x3 grid olarak (her sayfada 9 resim).
+            # Tekrarlar convert_document içindeki ortak aşamada elenmiş olarak gelir.
+            # Kaynaktaki sayfa sonları, çıktı düzeni değişmesin diye burada yok sayılır.
+            page_images = []
+            for block in blocks:
+                if isinstance(block, ParagraphBlock):
+                    # Metin düz metindir; Paragraph'ın işaretleme olarak yorumlamaması için kaçırılır (fitz yolundaki gibi)
+                    yield Paragraph(html.escape(block.text, quote=False), normal_style)
+                    yield Spacer(1, 10)
+                elif isinstance(block, ImageBlock):
+                    page_images.append(block.image)
+                    if len(page_images) == 9:
+                        yield PageBreak()
+                        yield image_grid(page_images)
+                        page_images = []
+            if page_images:
+                yield PageBreak()
+                yield image_grid(page_images)
+
+        # Hikâye bir listede biriktirilmez; reportlab öğeleri işledikçe akıştan çekilir
+        doc.build(FlowableStream(story()))
         return True
     except Exception as e:
         print(f"PDF oluşturulurken hata: {e}")
         return str(e)
 
-def create_word_with_images(text, images, buffer):
-    """Metni ve resimleri Word dosyasına dönüştürür."""
+def create_word_with_images(blocks, buffer):
+    """Blok akışındaki metni ve resimleri Word dosyasına dönüştürür."""
+    from docx import Document
     try:
         doc = Document()
-        # Metinleri ekle
-        paragraphs = text.split("\n\n")
-        for paragraph in paragraphs:
-            if paragraph.strip():
-                doc.add_paragraph(paragraph.strip())
-        
-        # Sonra resimleri 3x3 grid olarak ekle (her sayfada 9 resim)
-        if images:
+
+        def add_image_grid(page_images):
             from docx.shared import Inches
-            # Tekrarlanan resimleri engelle
-            unique_images = []
-            seen_images = set()
-            
-            for img_path in images:
+
+            doc.add_page_break()
+            table = doc.add_table(rows=3, cols=3)
+            table.autofit = True
+            for idx, image in enumerate(page_images):
+                row = idx // 3
+                col = idx % 3
+                cell = table.cell(row, col)
                 try:
-                    with open(img_path, 'rb') as f:
-                        img_data = f.read()
-                        img_hash = hash(img_data[:1000])
-                        if img_hash not in seen_images:
-                            seen_images.add(img_hash)
-                            unique_images.append(img_path)
+                    run = cell.paragraphs[0].add_run()
+                    # Resim boyutunu büyüt
+                    run.add_picture(io.BytesIO(image.data), width=Inches(3))
                 except:
-                    continue
+                    cell.text = ''
 
-            for i in range(0, len(unique_images), 9):
-                page_images = unique_images[i:i+9]
-                doc.add_page_break()
-                table = doc.add_table(rows=3, cols=3)
-                table.autofit = True
-                for idx, img_path in enumerate(page_images):
-                    row = idx // 3
-                    col = idx % 3
-                    cell = table.cell(row, col)
-                    try:
-                        run = cell.paragraphs[0].add_run()
-                        # Resim boyutunu büyüt
-                        run.add_picture(img_path, width=Inches(3))
-                    except:
-                        cell.text = ''
+        # Metinler geldikçe eklenir; resimler 3x3 grid olarak (her sayfada 9 resim).
+        # Kaynaktaki sayfa sonları, çıktı düzeni değişmesin diye burada yok sayılır.
+        page_images = []
+        for block in blocks:
+            if isinstance(block, ParagraphBlock):
+                doc.add_paragraph(block.text)
+            elif isinstance(block, ImageBlock):
+                page_images.append(block.image)
+                if len(page_images) == 9:
+                    add_image_grid(page_images)
+                    page_images = []
+        if page_images:
+            add_image_grid(page_images)
         
         doc.save(buffer)
         return True
@@ -304,66 +390,669 @@ def create_word_with_images(text, images, buffer):
         print(f"Word dosyası oluşturulurken hata: {e}")
         return str(e)
 
+# Çıktı formatı -> (içerik türü, dosya uzantısı)
+OUTPUT_FORMATS = {
+    'pdf': ('application/pdf', 'pdf'),
+    'word': ('application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'docx'),
+}
+
+SUPPORTED_EXTENSIONS = ['.doc', '.docx', '.ppt', '.pptx', '.pdf']
+
+# PDF çıktısını oluşturan motor -> oluşturucu (ayardan ya da istekteki pdf_writer alanından seçilir)
+PDF_WRITERS = {
+    'reportlab': create_pdf_with_images,
+    'fitz': create_pdf_with_fitz,
+}
+
+# Word çıktısını oluşturan yazıcı -> oluşturucu (WORD_WRITER ayarından seçilir)
+WORD_WRITERS = {
+    'python-docx': create_word_with_images,
+    'bulk': create_word_bulk,
+}
+
+# Izgaradaki bir resmin en büyük kenarı (create_pdf_with_images ve create_word_with_images ile aynı)
+IMAGE_CELL_INCHES = 3
+
+# Aynı dosyanın tekrar yüklenmesinde sonucu diskten döndüren önbellek
+conversion_cache = (
+    ConversionCache(settings.CONVERTER_CACHE_DIR, settings.CONVERTER_CACHE_MAX_BYTES)
+    if settings.CONVERTER_CACHE_ENABLED else None
+)
+
+# Düzenlenip yeniden yüklenen belgelerde değişmeyen sayfaları ve resimleri saklayan önbellek
+page_cache = (
+    PageCache(settings.CONVERTER_PAGE_CACHE_DIR, settings.CONVERTER_PAGE_CACHE_MAX_BYTES)
+    if settings.CONVERTER_PAGE_CACHE_ENABLED else None
+)
+
+def cache_key_for(chunks, output_format, with_images, pdf_writer=None, preview=None):
+    """Önbellek anahtarını, çıktıyı etkileyen resim ayarlarını, PDF/Word yazıcısını ve parça ayarlarını da katarak üretir.
+
+    Çıkarılan metni değiştiren PDF motoru ve düzelticinin kelime listesi de
+    anahtara girer; ayar değişince eski sonuçlar kullanılmaz.
+    """
+    extra = (
+        f'{settings.CONVERTER_IMAGE_DPI}:{settings.CONVERTER_IMAGE_JPEG_QUALITY}:'
+        f'{settings.CONVERTER_IMAGE_PNG_COMPRESS_LEVEL}:{settings.CONVERTER_PDF_ENGINE}:'
+        + '\n'.join(_normalizer.words)
+    )
+    if preview is not None:
+        # Önizleme PDF üzerinden üretilir; sayfa sayısı ve küçük resim çözünürlüğü de anahtara girer
+        output_format = f'preview-{preview.format}'
+        extra += f':{preview.pages}:{settings.CONVERTER_PREVIEW_DPI}'
+    if output_format == 'pdf' or preview is not None:
+        extra += (
+            f':{pdf_writer or settings.CONVERTER_PDF_WRITER}:'
+            f'{settings.CONVERTER_PDF_CHUNK_IMAGES}:{settings.CONVERTER_PDF_CHUNK_PARAGRAPHS}'
+        )
+    else:
+        extra += f':{settings.CONVERTER_WORD_WRITER}'
+    return conversion_cache.make_key(chunks, output_format, with_images, extra)
+
+def _counted_pages(blocks):
+    """Blokları aynen geçirirken metni olan kaynak sayfaları metrikler için sayar."""
+    pages = 0
+    try:
+        for block in blocks:
+            if isinstance(block, PageBreakBlock):
+                pages += 1
+            elif pages == 0:
+                pages = 1
+            yield block
+    finally:
+        count('pages', pages)
+
+# Önizleme: ilk `pages` sayfa/slayt, `deadline` (time.monotonic) anına kadar; `format` png ya da pdf
+Preview = namedtuple('Preview', ['pages', 'deadline', 'format'])
+
+# Önizleme çıktı türü -> (içerik türü, dosya uzantısı)
+PREVIEW_FORMATS = {
+    'png': ('image/png', 'png'),
+    'pdf': ('application/pdf', 'pdf'),
+}
+
+# Word'de sayfa bilgisi yoktur; önizlemede bu kadar karakter bir sayfa sayılır
+WORD_PREVIEW_CHARS_PER_PAGE = 3000
+
+def _until_deadline(items, deadline, boundary=None):
+    """Öğeleri son süreye kadar geçirir; süre dolunca ilk sınırda (`boundary(öğe)`) keser.
+
+    Kesilen önizleme 'preview_truncated' olarak sayılır; sayfa ortasında
+    kesilmesin diye metin blokları sayfa sonlarında kesilir. Önizleme boş
+    kalmasın diye ilk öğe süreye bakılmadan geçirilir.
+    """
+    first = True
+    try:
+        for item in items:
+            if not first and (boundary is None or boundary(item)) and time.monotonic() > deadline:
+                count('preview_truncated')
+                return
+            first = False
+            yield item
+    finally:
+        if hasattr(items, 'close'):
+            items.close()
+
+def document_blocks(source, file_ext, with_images, deduplicator, preview=None):
+    """Dosyanın metin bloklarını, istenirse ardından resim bloklarını akıtır.
+
+    `preview` (Preview) verilirse yalnızca ilk sayfalar okunur ve süre
+    dolunca okuma kesilir.
+    """
+    max_pages = preview.pages if preview is not None else None
+    # Dosya tipine göre metni çıkar (her aşamanın süresi etkin zamanlayıcıya yazılır)
+    if file_ext in ['.doc', '.docx']:
+        max_chars = max_pages * WORD_PREVIEW_CHARS_PER_PAGE if max_pages is not None else None
+        blocks = extract_blocks_from_word(source, max_chars)
+        if preview is not None:
+            blocks = _until_deadline(blocks, preview.deadline)
+        yield from _counted_pages(timed_iter('extract_text', blocks))
+        return
+    # PowerPoint ve PDF dosyası bir kez açılır; resimler metin okunurken toplanan listeden çıkarılır
+    extractor_class = PowerPointExtractor if file_ext in ['.ppt', '.pptx'] else PdfExtractor
+    with extractor_class(source, with_images, deduplicator, page_cache, max_pages) as extractor:
+        blocks = extractor.blocks()
+        if preview is not None:
+            blocks = _until_deadline(blocks, preview.deadline, lambda block: isinstance(block, PageBreakBlock))
+        yield from _counted_pages(timed_iter('extract_text', blocks))
+        if not with_images:
+            return
+        images = extractor.images()
+        if preview is not None:
+            images = _until_deadline(images, preview.deadline)
+        images = timed_iter('extract_images', images)
+
+        # Resimleri ızgara hücresine göre küçült (IMAGE_DPI=0 ise orijinaller gömülür)
+        if settings.CONVERTER_IMAGE_DPI:
+            images = prepare_images(
+                images,
+                IMAGE_CELL_INCHES,
+                max(72, settings.CONVERTER_IMAGE_DPI),
+                jpeg_quality=settings.CONVERTER_IMAGE_JPEG_QUALITY,
+                png_compress_level=settings.CONVERTER_IMAGE_PNG_COMPRESS_LEVEL,
+                cache=page_cache,
+            )
+            images = timed_iter('prepare_images', images)
+        for block in image_blocks(images):
+            count('images')
+            yield block
+
+def convert_document(source, file_ext, output_format, with_images, buffer, pdf_writer=None, preview=None):
+    """Dosyadan metni (ve istenirse resimleri) çıkarıp istenen formatta buffer'a yazar.
+
+    `source` bir dosya yolu ya da baştan okunabilen dosya benzeri nesnedir.
+    `pdf_writer` verilmezse PDF çıktısı PDF_WRITER ayarındaki motorla oluşturulur;
+    PDF_CHUNK_* ayarları açıksa çıktı parça parça oluşturulup birleştirilir.
+    Çıkarıcı blokları ürettikçe oluşturucu onları tüketir; belge hiçbir aşamada
+    tek bir metin olarak birleştirilmez. `preview` için bkz. document_blocks.
+    """
+    # Tekrarlanan resimler çıkarılırken elenir
+    deduplicator = ImageDeduplicator()
+    blocks = document_blocks(source, file_ext, with_images, deduplicator, preview)
+
+    # Çıktı formatına göre dönüştür
+    if output_format == 'pdf':
+        pdf_writer = pdf_writer or settings.CONVERTER_PDF_WRITER
+        with stage('build_pdf' if pdf_writer == 'reportlab' else f'build_pdf_{pdf_writer}'):
+            if settings.CONVERTER_PDF_CHUNK_IMAGES or settings.CONVERTER_PDF_CHUNK_PARAGRAPHS:
+                result = create_pdf_chunked(
+                    blocks, buffer, PDF_WRITERS[pdf_writer],
+                    max_paragraphs=settings.CONVERTER_PDF_CHUNK_PARAGRAPHS,
+                    max_images=settings.CONVERTER_PDF_CHUNK_IMAGES,
+                    workers=settings.CONVERTER_PDF_CHUNK_WORKERS,
+                )
+            else:
+                result = PDF_WRITERS[pdf_writer](blocks, buffer)
+    else:  # word
+        word_writer = settings.CONVERTER_WORD_WRITER
+        with stage('build_docx' if word_writer == 'python-docx' else f'build_docx_{word_writer}'):
+            result = WORD_WRITERS[word_writer](blocks, buffer)
+    blocks.close()
+    if page_cache is not None:
+        # Dönüştürmede yazılan sayfa kayıtlarından sonra boyut sınırı bir kez uygulanır
+        page_cache.flush()
+
+    if deduplicator.duplicates:
+        logger.info("%d tekrarlanan resim atlandı", deduplicator.duplicates)
+    return result
+
+def convert_preview(source, file_ext, with_images, buffer, pdf_writer, preview):
+    """İlk sayfaları küçük bir PDF'e dönüştürür; `preview.format` png ise PDF'in ilk sayfasının küçük resmini yazar."""
+    if preview.format == 'pdf':
+        return convert_document(source, file_ext, 'pdf', with_images, buffer, pdf_writer, preview)
+    pdf = io.BytesIO()
+    result = convert_document(source, file_ext, 'pdf', with_images, pdf, pdf_writer, preview)
+    if result is not True:
+        return result
+    with stage('render_preview'):
+        try:
+            with open_pdf(pdf.getvalue()) as pdf_document:
+                pixmap = pdf_document[0].get_pixmap(dpi=settings.CONVERTER_PREVIEW_DPI)
+                buffer.write(pixmap.tobytes('png'))
+        except Exception as e:
+            print(f"Önizleme resmi oluşturulurken hata: {e}")
+            return str(e)
+    return True
+
+def convert_to_file(source, file_ext, output_format, with_images, output_path, pdf_writer=None, label=None,
+                    preview=None):
+    """Dönüştürmeyi (ya da önizlemeyi) çalıştırıp çıktıyı `output_path`'e yazar (izole alt süreçte çalışabilir)."""
+    # PROFILE_SAMPLE_RATE ile örneklenen dönüştürmeler cProfile altında çalışır
+    with open(output_path, 'wb') as output, maybe_profile(label or file_ext.lstrip('.')):
+        if preview is not None:
+            return convert_preview(source, file_ext, with_images, output, pdf_writer, preview)
+        return convert_document(source, file_ext, output_format, with_images, output, pdf_writer)
+
+def backend_formats(file_ext, output_format, with_images):
+    """Dönüştürmenin kullanacağı kütüphane grupları (backends.FORMAT_BACKENDS anahtarları)."""
+    if file_ext in ['.doc', '.docx']:
+        yield 'word'
+    elif file_ext in ['.ppt', '.pptx']:
+        yield 'powerpoint'
+    else:
+        yield 'pdf'
+    if output_format == 'pdf':
+        # Parça parça oluşturulan PDF'ler PyMuPDF ile birleştirilir
+        yield from ('pdf_output', 'pdf')
+    else:
+        yield 'word'
+    if with_images:
+        yield 'images'
+
+def run_conversion(source, file_ext, output_format, with_images, workspace, pdf_writer=None, label=None,
+                   isolate=None, preview=None):
+    """Dönüştürmeyi çalıştırır; (sonuç, sonu gösteren okunabilir çıktı dosyası ya da None) döndürür.
+
+    `isolate` (verilmezse CONVERSION_ISOLATION ayarı) açıksa dönüştürme süre ve
+    bellek sınırlı bir alt süreçte çalışır ve çıktıyı çalışma alanındaki dosyaya
+    yazar; kapalıysa istek sürecinde, eşiği aşınca diske taşan geçici dosyaya yazılır.
+    `preview` verilirse `output_format` yok sayılır, önizleme üretilir ve alt
+    süreç PREVIEW_TIMEOUT'ta öldürülür.
+    """
+    return run_steps(conversion_steps(source, file_ext, output_format, with_images, workspace, pdf_writer,
+                                      label, isolate, preview))
+
+def conversion_steps(source, file_ext, output_format, with_images, workspace, pdf_writer=None, label=None,
+                     isolate=None, preview=None):
+    """run_conversion'ın adım üreteci (bkz. isolation.run_steps); alt süreç çağrısını üretir."""
+    if isolate is None:
+        isolate = settings.CONVERTER_ISOLATION
+    if preview is not None:
+        output_format = 'pdf'
+        extension = PREVIEW_FORMATS[preview.format][1]
+        timeout = settings.CONVERTER_PREVIEW_TIMEOUT
+    else:
+        extension = OUTPUT_FORMATS[output_format][1]
+        timeout = settings.CONVERTER_CONVERSION_TIMEOUT
+    if not isolate:
+        output = tempfile.SpooledTemporaryFile(max_size=settings.CONVERTER_OUTPUT_SPOOL_SIZE, dir=workspace)
+        with maybe_profile(label or file_ext.lstrip('.')):
+            if preview is not None:
+                result = convert_preview(source, file_ext, with_images, output, pdf_writer, preview)
+            else:
+                result = convert_document(source, file_ext, output_format, with_images, output, pdf_writer)
+    else:
+        # Kütüphaneler üst süreçte yüklenir ki alt süreç onları fork ile hazır bulsun;
+        # yoksa içe aktarma süresi her dönüştürmede yeniden ödenir
+        for name in backend_formats(file_ext, output_format, with_images):
+            load_format(name)
+        output_path = os.path.join(workspace, f'output.{extension}')
+        result = yield IsolatedCall(
+            convert_to_file,
+            (source, file_ext, output_format, with_images, output_path, pdf_writer, label, preview),
+            timeout,
+            settings.CONVERTER_CONVERSION_MEMORY_LIMIT,
+        )
+        output = open(output_path, 'rb') if result is True else None
+        if output is not None:
+            output.seek(0, os.SEEK_END)
+    if result is not True and output is not None:
+        output.close()
+        output = None
+    return result, output
+
+def overloaded_response(e):
+    """Yük sınırı dolduğunda dönen 429 yanıtı."""
+    response = HttpResponse(str(e), status=429)
+    response['Retry-After'] = str(e.retry_after)
+    return response
+
+async def _read_chunks(f, chunk_size):
+    """Dosyayı her okumayı iş parçacığında yaparak, olay döngüsünü bekletmeden akıtır."""
+    read = sync_to_async(f.read, thread_sensitive=False)
+    try:
+        while True:
+            chunk = await read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
+
+def converted_response(f, output_format, asynchronous=False):
+    """Dönüştürülmüş dosyayı parça parça akan bir indirme yanıtı olarak döndürür.
+
+    `asynchronous` ise yanıt zaman uyumsuz bir akıştır; ASGI'de FileResponse'un
+    eşzamanlı akışı gönderilmeden önce tamamen belleğe okunurdu.
+    """
+    content_type, file_extension = OUTPUT_FORMATS[output_format]
+    if asynchronous:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(0)
+        response = StreamingHttpResponse(
+            _read_chunks(f, settings.CONVERTER_RESPONSE_CHUNK_SIZE), content_type=content_type
+        )
+        response['Content-Length'] = str(size)
+        response['Content-Disposition'] = content_disposition_header(True, f'converted.{file_extension}')
+        return response
+    response = FileResponse(f, as_attachment=True, filename=f'converted.{file_extension}')
+    response.block_size = settings.CONVERTER_RESPONSE_CHUNK_SIZE
+    response['Content-Type'] = content_type
+    return response
+
+def upload_source(uploaded_file):
+    """Yüklemeyi kopyalamadan okunabilir kaynağa çevirir.
+
+    Küçük yüklemeler bellekte (InMemoryUploadedFile) kalır ve oradan okunur;
+    büyükleri Django zaten geçici dosyaya akıtır, o dosyanın yolu kullanılır.
+    """
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        return uploaded_file.temporary_file_path()
+    uploaded_file.seek(0)
+    return uploaded_file.file
+
+def convert_upload(uploaded_file, file_ext, output_format, with_images, pdf_writer=None):
+    """Doğrulanmış yüklemeyi (önbellekten ya da dönüştürerek) indirme yanıtına çevirir."""
+    return run_steps(convert_upload_steps(uploaded_file, file_ext, output_format, with_images, pdf_writer))
+
+def convert_upload_steps(uploaded_file, file_ext, output_format, with_images, pdf_writer=None, asynchronous=False):
+    """convert_upload'ın adım üreteci.
+
+    `asynchronous` ise (home_async) dönüştürme her zaman alt süreçte çalışır ve
+    yanıt zaman uyumsuz akar.
+    """
+    # Aynı içerik daha önce dönüştürüldüyse hiçbir çıkarıcı çalıştırmadan döndür
+    cache_key = None
+    if conversion_cache is not None:
+        with stage('cache_lookup'):
+            cache_key = cache_key_for(uploaded_file.chunks(), output_format, with_images, pdf_writer)
+            cached = conversion_cache.get(cache_key)
+        if cached is not None:
+            count('cache_hits')
+            count('output_bytes', os.fstat(cached.fileno()).st_size)
+            return converted_response(cached, output_format, asynchronous)
+
+    # Düğümün yükü doluysa dönüştürmeye başlamadan 429 döndürülür. Maliyet sayfa/slayt
+    # sayısından ve boyuttan içerik okunmadan tahmin edilir; pay dönüştürme bitince bırakılır.
+    source = upload_source(uploaded_file)
+    with stage('admission'):
+        cost = estimate_cost(source, file_ext, uploaded_file.size, with_images)
+        try:
+            ticket = admission.acquire(cost)
+        except Overloaded as e:
+            return overloaded_response(e)
+
+    # Her istek kendi çalışma dizininde çalışır; dizin yanıt hazırlanınca silinir.
+    # Çıktı dosyası açık kaldığı için dizin silinse de yanıt akmaya devam eder.
+    try:
+        with request_workspace() as workspace:
+            result, output = yield from conversion_steps(
+                source, file_ext, output_format, with_images, workspace, pdf_writer,
+                f'{file_ext.lstrip(".")}-{output_format}', isolate=True if asynchronous else None,
+            )
+    finally:
+        admission.release(ticket)
+
+    if result is not True:
+        return HttpResponse(f"Dönüştürme sırasında bir hata oluştu: {result}", status=500)
+
+    count('output_bytes', output.tell())
+    if cache_key is not None:
+        with stage('cache_store'):
+            try:
+                output.seek(0)
+                conversion_cache.put(cache_key, output)
+            except OSError as e:
+                print(f"Sonuç önbelleğe yazılamadı: {e}")
+    output.seek(0)
+    return converted_response(output, output_format, asynchronous)
+
+@upload_limit()
 def home(request):
+    return run_steps(home_steps(request))
+
+@upload_limit()
+async def home_async(request):
+    """ASGI dağıtımları için home() (ASYNC_VIEWS=true ile kök adrese bağlanır).
+
+    Yüklemeyi ASGI sunucusu olay döngüsünde, istemciyi beklerken işçiyi
+    tutmadan alır. Formun ayrıştırılması, önbellek ve yük kabulü kısa süreliğine
+    bir iş parçacığında; çıkarma/oluşturma işi alt süreçte (diğer çekirdeklerde)
+    çalışır ve olay döngüsünde beklenir, yanıt zaman uyumsuz akar. Böylece tek
+    bir uvicorn işçisi çok sayıda yavaş yükleme, dönüştürme ve indirmeyi aynı
+    anda taşıyabilir.
+    """
+    return await run_steps_async(home_steps(request, asynchronous=True))
+
+def home_steps(request, asynchronous=False):
+    """GET'te formu gösterir, POST'ta yüklenen dosyayı dönüştürür (home ve home_async için ortak adımlar)."""
+    # Boyutu aşan yüklemeler gövde okunmadan UploadLimitMiddleware'de reddedilir
     if request.method == 'POST' and request.FILES['document']:
         uploaded_file = request.FILES['document']
-        fs = FileSystemStorage()
-        name = fs.save(uploaded_file.name, uploaded_file)
-        file_path = fs.path(name)
-        
+        if uploaded_file.size > settings.CONVERTER_MAX_UPLOAD_SIZE:
+            return HttpResponse(upload_too_large_message(), status=413)
+
         # Dosya uzantısını kontrol et
-        file_ext = os.path.splitext(name)[1].lower()
-        
+        file_ext = os.path.splitext(uploaded_file.name)[1].lower()
+        if file_ext not in SUPPORTED_EXTENSIONS:
+            return HttpResponse("Desteklenmeyen dosya formatı. Lütfen Word (.doc, .docx), PowerPoint (.ppt, .pptx) veya PDF (.pdf) dosyası yükleyin.", status=400)
+
         # Çıktı formatını kontrol et
-        output_format = request.POST.get('output_format', 'pdf')
+        output_format = 'pdf' if request.POST.get('output_format', 'pdf') == 'pdf' else 'word'
         
         # Resimli dönüştürme isteği mi kontrol et
         with_images = request.POST.get('with_images', '') == 'true'
-        
-        # Dosya tipine göre metni çıkar
-        if file_ext in ['.doc', '.docx']:
-            text = extract_text_from_word(file_path)
-            images = []
-        elif file_ext in ['.ppt', '.pptx']:
-            text = extract_text_from_powerpoint(file_path)
-            images = extract_images_from_powerpoint(file_path) if with_images else []
-        elif file_ext == '.pdf':
-            text = extract_text_from_pdf(file_path)
-            images = extract_images_from_pdf(file_path) if with_images else []
-        else:
-            fs.delete(name)
-            return HttpResponse("Desteklenmeyen dosya formatı. Lütfen Word (.doc, .docx), PowerPoint (.ppt, .pptx) veya PDF (.pdf) dosyası yükleyin.", status=400)
-        
-        # Çıktı formatına göre dönüştür
-        buffer = io.BytesIO()
-        if output_format == 'pdf':
-            result = create_pdf_with_images(text, images, buffer)
-            content_type = 'application/pdf'
-            file_extension = 'pdf'
-        else:  # word
-            result = create_word_with_images(text, images, buffer)
-            content_type = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-            file_extension = 'docx'
-        
-        # Geçici dosyaları temizle
-        fs.delete(name)
-        if 'temp_dir' in locals():
-            for img_path in images:
-                try:
-                    os.remove(img_path)
-                except:
-                    pass
-            try:
-                os.rmdir(os.path.dirname(images[0]))
-            except:
-                pass
-        
-        if result is True:
-            buffer.seek(0)
-            response = FileResponse(buffer, as_attachment=True, filename=f'converted.{file_extension}')
-            response['Content-Type'] = content_type
-            return response
+
+        # PDF motoru istekte seçilebilir (boşsa PDF_WRITER ayarı)
+        pdf_writer = request.POST.get('pdf_writer') or settings.CONVERTER_PDF_WRITER
+        if pdf_writer not in PDF_WRITERS:
+            return HttpResponse(f"Bilinmeyen PDF motoru: {pdf_writer}", status=400)
+
+        # Aşama süreleri Server-Timing başlığına ve /metrics'e yazılır
+        timer = StageTimer()
+        with timer:
+            response = yield from convert_upload_steps(uploaded_file, file_ext, output_format, with_images,
+                                                       pdf_writer, asynchronous)
+        if response.status_code == 429:
+            result = 'rejected'
+        elif response.status_code != 200:
+            result = 'error'
         else:
-            return HttpResponse(f"Dönüştürme sırasında bir hata oluştu: {result}", status=500)
+            result = 'cache_hit' if timer.counts.get('cache_hits') else 'ok'
+        record_conversion(timer, file_ext, output_format, with_images, result, uploaded_file.size)
+        if settings.CONVERTER_SERVER_TIMING:
+            response['Server-Timing'] = timer.server_timing()
+        return response
     
-    return render(request, 'converter/home.html', {'range': range(9)})
\ No newline at end of file
+    return home_page(request)
+
+# Saklanan ana sayfada CSRF belirtecinin yerini tutan işaret
+CSRF_PLACEHOLDER = '__csrf_token_placeholder__'
+_home_page = None
+
+def home_page(request):
+    """Ana sayfanın GET yanıtı.
+
+    HOME_PAGE_CACHE açıksa şablon süreç başına bir kez, istek olmadan ve
+    CSRF belirteci yerine bir işaretle oluşturulur; her istekte yalnızca
+    işaretin yerine isteğin belirteci yazılır (get_token çerezi de ayarlar).
+    """
+    global _home_page
+    if not settings.CONVERTER_HOME_PAGE_CACHE:
+        return render(request, 'converter/home.html', {'range': range(9)})
+    if _home_page is None:
+        _home_page = render_to_string('converter/home.html', {'range': range(9), 'csrf_token': CSRF_PLACEHOLDER})
+    return HttpResponse(_home_page.replace(CSRF_PLACEHOLDER, get_token(request)))
+
+
+def preview_response(f, preview_format, truncated):
+    """Önizlemeyi tarayıcıda gösterilecek (indirilmeyecek) yanıt olarak döndürür."""
+    content_type, file_extension = PREVIEW_FORMATS[preview_format]
+    response = FileResponse(f, filename=f'preview.{file_extension}', content_type=content_type)
+    response['X-Preview-Truncated'] = 'true' if truncated else 'false'
+    return response
+
+def preview_upload(uploaded_file, file_ext, with_images, pdf_writer, preview, timer):
+    """Doğrulanmış yüklemenin önizlemesini (önbellekten ya da üreterek) yanıta çevirir.
+
+    Süre dolduğu için kesilen önizleme (daha az sayfa) önbelleğe yazılmaz.
+    """
+    cache_key = None
+    if conversion_cache is not None:
+        with stage('cache_lookup'):
+            cache_key = cache_key_for(uploaded_file.chunks(), 'pdf', with_images, pdf_writer, preview)
+            cached = conversion_cache.get(cache_key)
+        if cached is not None:
+            count('cache_hits')
+            count('output_bytes', os.fstat(cached.fileno()).st_size)
+            return preview_response(cached, preview.format, truncated=False)
+
+    # Önizleme en çok `preview.pages` sayfa okuduğu için yük kabulünde o kadar sayılır
+    source = upload_source(uploaded_file)
+    with stage('admission'):
+        try:
+            ticket = admission.acquire(preview.pages)
+        except Overloaded as e:
+            return overloaded_response(e)
+    try:
+        with request_workspace() as workspace:
+            result, output = run_conversion(source, file_ext, 'pdf', with_images, workspace, pdf_writer,
+                                            f'{file_ext.lstrip(".")}-preview', preview=preview)
+    finally:
+        admission.release(ticket)
+
+    if result is not True:
+        return HttpResponse(f"Önizleme sırasında bir hata oluştu: {result}", status=500)
+
+    count('output_bytes', output.tell())
+    truncated = bool(timer.counts.get('preview_truncated'))
+    if cache_key is not None and not truncated:
+        with stage('cache_store'):
+            try:
+                output.seek(0)
+                conversion_cache.put(cache_key, output)
+            except OSError as e:
+                print(f"Önizleme önbelleğe yazılamadı: {e}")
+    output.seek(0)
+    return preview_response(output, preview.format, truncated)
+
+@upload_limit()
+@require_POST
+def preview(request):
+    """Yüklenen dosyanın yalnızca ilk sayfalarını dönüştürüp PNG küçük resmi ya da küçük bir PDF döndürür.
+
+    En çok PREVIEW_PAGES sayfa/slayt okunur; PREVIEW_BUDGET saniye dolunca
+    okuma sayfa sonunda kesilir ve o ana kadarki sayfalar gösterilir
+    (X-Preview-Truncated: true). Tam dönüştürme ardından aynı formla ana
+    sayfaya gönderilir.
+    """
+    started = time.monotonic()
+    uploaded_file = request.FILES.get('document')
+    if uploaded_file is None:
+        return HttpResponse("Dosya bulunamadı.", status=400)
+    if uploaded_file.size > settings.CONVERTER_MAX_UPLOAD_SIZE:
+        return HttpResponse(upload_too_large_message(), status=413)
+    file_ext = os.path.splitext(uploaded_file.name)[1].lower()
+    if file_ext not in SUPPORTED_EXTENSIONS:
+        return HttpResponse("Desteklenmeyen dosya formatı. Lütfen Word (.doc, .docx), PowerPoint (.ppt, .pptx) veya PDF (.pdf) dosyası yükleyin.", status=400)
+
+    with_images = request.POST.get('with_images', '') == 'true'
+    preview_format = request.POST.get('preview_format', 'png')
+    if preview_format not in PREVIEW_FORMATS:
+        return HttpResponse(f"Bilinmeyen önizleme türü: {preview_format}", status=400)
+    pdf_writer = request.POST.get('pdf_writer') or settings.CONVERTER_PDF_WRITER
+    if pdf_writer not in PDF_WRITERS:
+        return HttpResponse(f"Bilinmeyen PDF motoru: {pdf_writer}", status=400)
+    try:
+        pages = int(request.POST.get('pages') or settings.CONVERTER_PREVIEW_PAGES)
+    except ValueError:
+        return HttpResponse("Sayfa sayısı bir tam sayı olmalı.", status=400)
+    pages = max(1, min(pages, settings.CONVERTER_PREVIEW_PAGES))
+
+    # Süre isteğin başından sayılır; yüklemenin okunması ve alt süreç de bütçeye dahildir
+    preview_request = Preview(pages, started + settings.CONVERTER_PREVIEW_BUDGET, preview_format)
+    timer = StageTimer()
+    with timer:
+        response = preview_upload(uploaded_file, file_ext, with_images, pdf_writer, preview_request, timer)
+    if response.status_code == 429:
+        result = 'rejected'
+    elif response.status_code != 200:
+        result = 'error'
+    else:
+        result = 'cache_hit' if timer.counts.get('cache_hits') else 'ok'
+    record_conversion(timer, file_ext, f'preview_{preview_format}', with_images, result, uploaded_file.size)
+    if settings.CONVERTER_SERVER_TIMING:
+        response['Server-Timing'] = timer.server_timing()
+    return response
+
+
+@upload_limit('CONVERTER_MAX_BATCH_UPLOAD_SIZE')
+@require_POST
+def batch_convert(request):
+    """Birden çok dosyayı ya da bir ZIP'i paralel dönüştürür, sonuçları ZIP olarak akıtır."""
+    uploaded_files = request.FILES.getlist('documents') or request.FILES.getlist('document')
+    if not uploaded_files:
+        return HttpResponse("Dosya bulunamadı.", status=400)
+
+    output_format = 'pdf' if request.POST.get('output_format', 'pdf') == 'pdf' else 'word'
+    with_images = request.POST.get('with_images', '') == 'true'
+
+    # Çalışma alanı akış bitince ya da yanıt kapanınca BatchStream tarafından silinir
+    workspace = create_workspace(prefix='batch-')
+    try:
+        inputs = collect_inputs(uploaded_files, workspace, SUPPORTED_EXTENSIONS)
+    except BatchError as e:
+        remove_workspace(workspace)
+        return HttpResponse(str(e), status=400)
+    except Exception:
+        remove_workspace(workspace)
+        raise
+
+    # Tek dosyalık dönüştürmedeki gibi yük doluysa akışa başlamadan 429 döner; tüm dosyaların
+    # maliyeti akış bitene (ya da yanıt kapanana) kadar ayrılır
+    try:
+        ticket = admission.acquire(batch_cost(inputs, with_images))
+    except Overloaded as e:
+        remove_workspace(workspace)
+        return overloaded_response(e)
+
+    response = StreamingHttpResponse(
+        BatchStream(inputs, workspace, output_format, with_images, OUTPUT_FORMATS[output_format][1],
+                    conversion_cache, cache_key_for, ticket),
+        content_type='application/zip',
+    )
+    response['Content-Disposition'] = 'attachment; filename="converted.zip"'
+    return response
+
+def job_payload(request, job):
+    """İşin durumunu JSON'a uygun sözlük olarak döndürür."""
+    payload = {
+        'id': str(job.id),
+        'status': job.status,
+        'original_name': job.original_name,
+        'output_format': job.output_format,
+        'with_images': job.with_images,
+        'created_at': job.created_at.isoformat(),
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'status_url': request.build_absolute_uri(reverse('job_status', args=[job.id])),
+    }
+    if job.status == ConversionJob.DONE:
+        payload['download_url'] = request.build_absolute_uri(reverse('job_download', args=[job.id]))
+    elif job.status == ConversionJob.FAILED:
+        payload['error'] = job.error
+    return payload
+
+@upload_limit(json=True)
+@require_POST
+def job_create(request):
+    """Dosyayı kaydedip bir dönüştürme işi oluşturur ve hemen iş numarasını döndürür."""
+    uploaded_file = request.FILES.get('document')
+    if uploaded_file is None:
+        return JsonResponse({'error': "Dosya bulunamadı."}, status=400)
+    if uploaded_file.size > settings.CONVERTER_MAX_UPLOAD_SIZE:
+        return JsonResponse({'error': upload_too_large_message()}, status=413)
+
+    file_ext = os.path.splitext(uploaded_file.name)[1].lower()
+    if file_ext not in SUPPORTED_EXTENSIONS:
+        return JsonResponse({'error': "Desteklenmeyen dosya formatı. Lütfen Word (.doc, .docx), PowerPoint (.ppt, .pptx) veya PDF (.pdf) dosyası yükleyin."}, status=400)
+
+    job = ConversionJob(
+        original_name=uploaded_file.name[:255],
+        output_format='pdf' if request.POST.get('output_format', 'pdf') == 'pdf' else 'word',
+        with_images=request.POST.get('with_images', '') == 'true',
+    )
+    job.input_file.save(uploaded_file.name, uploaded_file, save=False)
+    job.save()
+    return JsonResponse(job_payload(request, job), status=202)
+
+@require_GET
+def job_status(request, job_id):
+    job = get_object_or_404(ConversionJob, pk=job_id)
+    return JsonResponse(job_payload(request, job))
+
+@require_GET
+def job_download(request, job_id):
+    job = get_object_or_404(ConversionJob, pk=job_id)
+    if job.status != ConversionJob.DONE or not job.result_file:
+        raise Http404("Dönüştürme henüz tamamlanmadı.")
+    return converted_response(job.result_file.open('rb'), job.output_format)
+
+
+@require_GET
+def metrics(request):
+    """Dönüştürme metriklerini Prometheus metin biçiminde döndürür."""
+    token = settings.CONVERTER_METRICS_TOKEN
+    if token and request.META.get('HTTP_AUTHORIZATION', '') != f'Bearer {token}':
+        return HttpResponse("Yetkisiz.", status=401)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+def _tree_size(path):
+    """Bir dizindeki dosyaların toplam boyutunu ve sayısını döndürür."""
+    total = files = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+                files += 1
+            except OSError:
+                pass
+    return total, files
+
+
+def _remove(path):
+    """Dosyayı ya da dizini siler; silinen bayt ve dosya sayısını döndürür."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        size, files = _tree_size(path)
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            size, files = os.lstat(path).st_size, 1
+            os.remove(path)
+        except OSError:
+            return 0, 0
+    return size, files
+
+
+def create_workspace(prefix='req-'):
+    """Çalışma alanı kökünde yeni, boş bir geçici dizin oluşturur."""
+    root = settings.CONVERTER_WORKSPACE_ROOT
+    os.makedirs(root, exist_ok=True)
+    return tempfile.mkdtemp(prefix=prefix, dir=root)
+
+
+def remove_workspace(path):
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@contextmanager
+def request_workspace(prefix='req-'):
+    """İsteğe özel geçici çalışma dizini açar; iş bitince (hata olsa da) siler.
+
+    Eşzamanlı dönüştürmeler ayrı dizinlerde çalıştığı için birbirlerinin
+    dosyalarının üzerine yazamaz.
+    """
+    path = create_workspace(prefix)
+    try:
+        yield path
+    finally:
+        remove_workspace(path)
+
+
+def sweep_stale(max_age):
+    """Çökmelerden geriye kalmış, `max_age` saniyeden eski geçici dosyaları siler.
+
+    Taranan yerler: çalışma dizinleri, yükleme geçici dosyaları, sonuç ve
+    sayfa önbelleklerinin yarım kalmış yazımları ve eski sürümlerin ortak
+    temp_images dizini.
+    """
+    cutoff = time.time() - max_age
+    candidates = []
+
+    roots = [settings.CONVERTER_WORKSPACE_ROOT, settings.FILE_UPLOAD_TEMP_DIR]
+    for root in roots:
+        if root and os.path.isdir(root):
+            candidates.extend(entry.path for entry in os.scandir(root) if entry.name != 'uploads')
+
+    for cache_dir in (settings.CONVERTER_CACHE_DIR, settings.CONVERTER_PAGE_CACHE_DIR):
+        if os.path.isdir(cache_dir):
+            for shard in os.scandir(cache_dir):
+                if shard.is_dir():
+                    candidates.extend(e.path for e in os.scandir(shard.path) if e.name.startswith('.tmp-'))
+
+    legacy_dir = os.path.join(settings.MEDIA_ROOT, 'temp_images')
+    if os.path.isdir(legacy_dir):
+        candidates.append(legacy_dir)
+
+    removed_bytes = removed_files = removed_entries = 0
+    for path in candidates:
+        try:
+            if os.lstat(path).st_mtime > cutoff:
+                continue
+        except OSError:
+            continue
+        size, files = _remove(path)
+        removed_bytes += size
+        removed_files += files
+        removed_entries += 1
+    return {
+        'removed_entries': removed_entries,
+        'removed_files': removed_files,
+        'removed_bytes': removed_bytes,
+    }
+
+
+def disk_metrics():
+    """Çalışma alanı, önbellek ve iş dizinlerinin kapladığı yer ile diskteki boş alan."""
+    metrics = {}
+    for name, path in (
+        ('workspace', settings.CONVERTER_WORKSPACE_ROOT),
+        ('cache', settings.CONVERTER_CACHE_DIR),
+        ('page_cache', settings.CONVERTER_PAGE_CACHE_DIR),
+        ('jobs', os.path.join(settings.MEDIA_ROOT, 'jobs')),
+    ):
+        size, files = _tree_size(path) if os.path.isdir(path) else (0, 0)
+        metrics[f'{name}_bytes'] = size
+        metrics[f'{name}_files'] = files
+    usage_root = settings.MEDIA_ROOT if os.path.isdir(settings.MEDIA_ROOT) else settings.BASE_DIR
+    usage = shutil.disk_usage(usage_root)
+    metrics['disk_total_bytes'] = usage.total
+    metrics['disk_free_bytes'] = usage.free
+    return metrics
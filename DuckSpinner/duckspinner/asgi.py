@@ -5,6 +5,13 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+
+ASGI'da görünümler iş parçacığı havuzunda çalışır; bu süreçten os.fork()
+ile alt süreç açmak güvenli değildir (diğer iş parçacıklarının tuttuğu
+kilitler alt sürece kilitli kopyalanır). İzole dönüştürmeler bu yüzden
+çok iş parçacıklı süreçte forkserver ile başlatılır (converter.isolation);
+sunucu ilk dönüştürmede bir kez açılır. Sunucuyu başlatan betik
+(uvicorn gibi) ana modülü `if __name__ == '__main__'` ile korumalıdır.
 """
 
 import os
@@ -14,3 +21,11 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'duckspinner.settings')
 
 application = get_asgi_application()
+
+# İsteğe bağlı: tüm dönüştürme kütüphanelerini şimdi yükle (bkz. wsgi.py)
+from django.conf import settings  # noqa: E402
+
+if settings.CONVERTER_PRELOAD_BACKENDS:
+    from converter.backends import preload  # noqa: E402
+
+    preload()
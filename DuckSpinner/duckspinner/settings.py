@@ -47,6 +47,8 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    # Büyük yüklemeleri CSRF denetimi gövdeyi ayrıştırmadan önce reddeder
+    'converter.middleware.UploadLimitMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -81,6 +83,10 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # İşçi süreçleri aynı anda yazabildiği için kilit beklemesi uzun tutulur
+        'OPTIONS': {'timeout': 20},
+        # Testler işçi süreçlerini de çalıştırır; bellekteki veritabanını alt süreçler göremez
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
@@ -122,12 +128,138 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Django 5.1 STATICFILES_STORAGE'ı okumaz; depolama STORAGES ile seçilir. Dosya adlarına içerik
+# özeti eklenir, whitenoise bunları süresiz (immutable) önbelleklenebilir olarak sunar
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'converter.storage.OptimizedStaticFilesStorage'},
+}
+# collectstatic converter/images altındaki resimlerin bu genişliklerde (px) ve biçimlerde
+# varyantlarını üretir; ana sayfa bunları srcset ile sunar (AVIF, Pillow destekliyorsa)
+CONVERTER_RESPONSIVE_IMAGE_WIDTHS = [int(w) for w in os.getenv('RESPONSIVE_IMAGE_WIDTHS', '150,300').split(',') if w]
+CONVERTER_RESPONSIVE_IMAGE_FORMATS = [f for f in os.getenv('RESPONSIVE_IMAGE_FORMATS', 'avif,webp').split(',') if f]
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Dönüştürücü ayarları
+# Dönüştürme kütüphaneleri varsayılan olarak ilk kullanımda yüklenir; True ise wsgi
+# yüklenirken hepsi birden yüklenir (gunicorn.conf.py aynı değişkenle preload_app'i açar)
+CONVERTER_PRELOAD_BACKENDS = os.getenv('PRELOAD_BACKENDS', 'False').lower() == 'true'
+# Metin düzeltmede etrafına boşluk eklenecek kelimeler (virgülle ayrılmış, boşsa varsayılan liste)
+CONVERTER_NORMALIZER_WORDS = [w.strip() for w in os.getenv('NORMALIZER_WORDS', '').split(',') if w.strip()]
+# Word/PowerPoint metin okuyucusu: stream (XML'i ZIP'ten artımlı okur, hata olursa kütüphaneye döner)
+# ya da library (python-docx/python-pptx)
+CONVERTER_OOXML_READER = os.getenv('OOXML_READER', 'stream')
+# PDF metin motoru: auto (fitz, büyük dosyada paralel), fitz, parallel veya pypdf2
+CONVERTER_PDF_ENGINE = os.getenv('PDF_ENGINE', 'auto')
+# auto modunda paralel çıkarmaya geçilecek en az sayfa sayısı
+CONVERTER_PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '50'))
+# Paralel çıkarmadaki süreç sayısı (0 = çekirdek sayısı)
+CONVERTER_PDF_WORKERS = int(os.getenv('PDF_WORKERS', '0')) or None
+# PDF çıktısını oluşturan motor: reportlab (platypus) ya da fitz (PyMuPDF Story, daha hızlı)
+CONVERTER_PDF_WRITER = os.getenv('PDF_WRITER', 'reportlab')
+# PDF çıktısı parça parça oluşturulup PyMuPDF ile birleştirilir; tepe bellek belgeye değil parça
+# boyutuna bağlı kalır. Resim parçaları ızgara sayfalarında bölünür ve düzeni değiştirmez; metin
+# bölünürse her parça yeni sayfada başlar (0 = o tür bölünmez, ikisi de 0 = tek parça).
+# Varsayılan kapalıdır: yalnızca resimle bölmede parçalar arasındaki metin bellekte toplanır ve
+# metin ağırlıklı belgede FlowableStream'in sabit bellek kullanımı kaybolur
+CONVERTER_PDF_CHUNK_IMAGES = int(os.getenv('PDF_CHUNK_IMAGES', '0'))
+CONVERTER_PDF_CHUNK_PARAGRAPHS = int(os.getenv('PDF_CHUNK_PARAGRAPHS', '0'))
+# Parçaları paralel oluşturan süreç sayısı (1 = istek sürecinde sırayla; bellek süreç sayısıyla çarpılır)
+CONVERTER_PDF_CHUNK_WORKERS = int(os.getenv('PDF_CHUNK_WORKERS', '1'))
+# Word çıktısını oluşturan yazıcı: bulk (gövde XML'i ve resimler tek geçişte doğrudan ZIP'e yazılır,
+# python-docx ile aynı belge) ya da python-docx (nesne modeliyle, daha yavaş)
+CONVERTER_WORD_WRITER = os.getenv('WORD_WRITER', 'bulk')
+# Yük kabulü: düğümdeki süren dönüştürmelerin toplam tahmini maliyeti (sayfa eşdeğeri: sayfa/slayt
+# + MB + resimliyse resim sayısı) bu sınırı aşacaksa istek 429 ve Retry-After ile hemen reddedilir
+# (0 = sınırsız). Sınır aynı ADMISSION_DIR'i kullanan tüm işçiler arasında paylaşılır
+CONVERTER_ADMISSION_MAX_COST = int(os.getenv('ADMISSION_MAX_COST', '2000'))
+CONVERTER_ADMISSION_RETRY_AFTER = int(os.getenv('ADMISSION_RETRY_AFTER', '5'))
+CONVERTER_ADMISSION_DIR = os.getenv('ADMISSION_DIR', os.path.join(MEDIA_ROOT, 'admission'))
+# Her dönüştürme ayrı bir alt süreçte çalışır; süre (saniye) ya da yerleşik bellek (MB) sınırını
+# aşan süreç öldürülür (0 = sınırsız)
+CONVERTER_ISOLATION = os.getenv('CONVERSION_ISOLATION', 'True').lower() == 'true'
+CONVERTER_CONVERSION_TIMEOUT = int(os.getenv('CONVERSION_TIMEOUT', '300'))
+CONVERTER_CONVERSION_MEMORY_LIMIT = int(os.getenv('CONVERSION_MEMORY_MB', '1024')) * 1024 * 1024
+# ASGI dağıtımında (ör. uvicorn duckspinner.asgi:application) ana sayfa zaman uyumsuz görünümle
+# sunulur: yüklemeler ve indirmeler işçiyi bekletmez, dönüştürme her zaman alt süreçte çalışır
+CONVERTER_ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False').lower() == 'true'
+# Dönüştürme sonuç önbelleği (yüklenen içeriğin özetine göre, MEDIA_ROOT altında)
+CONVERTER_CACHE_ENABLED = os.getenv('CONVERSION_CACHE', 'True').lower() == 'true'
+CONVERTER_CACHE_DIR = os.path.join(MEDIA_ROOT, 'conversion_cache')
+CONVERTER_CACHE_MAX_BYTES = int(os.getenv('CONVERSION_CACHE_MAX_MB', '512')) * 1024 * 1024
+# Sayfa/slayt/resim düzeyinde ara sonuç önbelleği: düzenlenip yeniden yüklenen belgede
+# yalnızca değişen sayfalar ve resimler yeniden işlenir
+CONVERTER_PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE', 'True').lower() == 'true'
+CONVERTER_PAGE_CACHE_DIR = os.path.join(MEDIA_ROOT, 'page_cache')
+CONVERTER_PAGE_CACHE_MAX_BYTES = int(os.getenv('PAGE_CACHE_MAX_MB', '256')) * 1024 * 1024
+# Önizleme: en çok bu kadar sayfa/slayt; okuma bütçe (sn) dolunca sayfa sonunda kesilir,
+# alt süreç PREVIEW_TIMEOUT'ta öldürülür. PNG küçük resim bu DPI ile çizilir
+CONVERTER_PREVIEW_PAGES = int(os.getenv('PREVIEW_PAGES', '3'))
+CONVERTER_PREVIEW_BUDGET = float(os.getenv('PREVIEW_BUDGET', '2'))
+CONVERTER_PREVIEW_TIMEOUT = int(os.getenv('PREVIEW_TIMEOUT', '10'))
+CONVERTER_PREVIEW_DPI = int(os.getenv('PREVIEW_DPI', '60'))
+# Gömülen resimler ızgara hücresine bu DPI ile küçültülür (0 = küçültme, orijinalleri göm)
+CONVERTER_IMAGE_DPI = int(os.getenv('IMAGE_DPI', '150'))
+CONVERTER_IMAGE_JPEG_QUALITY = int(os.getenv('IMAGE_JPEG_QUALITY', '85'))
+CONVERTER_IMAGE_PNG_COMPRESS_LEVEL = int(os.getenv('IMAGE_PNG_COMPRESS_LEVEL', '6'))
+# En büyük yükleme boyutu; aşan istekler dosya okunmadan 413 ile reddedilir
+CONVERTER_MAX_UPLOAD_SIZE = int(os.getenv('MAX_UPLOAD_MB', '100')) * 1024 * 1024
+# Toplu dönüştürmede tüm dosyaların (açılmış ZIP içeriği dahil) toplam sınırı ve dosya sayısı
+CONVERTER_MAX_BATCH_UPLOAD_SIZE = int(os.getenv('MAX_BATCH_UPLOAD_MB', '500')) * 1024 * 1024
+CONVERTER_BATCH_MAX_FILES = int(os.getenv('BATCH_MAX_FILES', '100'))
+# Toplu dönüştürme süreç havuzunun boyutu (0 = çekirdek sayısı)
+CONVERTER_BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', '0')) or None
+# Bu boyutun altındaki yüklemeler bellekte işlenir, üstündekiler geçici dosyaya akıtılır
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv('UPLOAD_MEMORY_MB', '5')) * 1024 * 1024
+# İsteklere özel geçici çalışma dizinlerinin kökü (janitor komutu çökmelerden kalanları temizler)
+CONVERTER_WORKSPACE_ROOT = os.getenv('WORKSPACE_ROOT', os.path.join(MEDIA_ROOT, 'workspaces'))
+# Büyük yüklemelerin geçici dosyaları da çalışma alanında tutulur
+FILE_UPLOAD_TEMP_DIR = os.path.join(CONVERTER_WORKSPACE_ROOT, 'uploads')
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'converter.uploads.WorkspaceTemporaryFileUploadHandler',
+]
+# Dizin ilk büyük yüklemede WorkspaceTemporaryFileUploadHandler tarafından oluşturulur; Django'nun
+# "dizin yok" denetimi bu yüzden susturulur
+SILENCED_SYSTEM_CHECKS = ['files.E001']
+# janitor: bu kadar saniyeden eski geçici dosyalar ve bitmiş işler silinir
+CONVERTER_JANITOR_MAX_AGE = int(os.getenv('JANITOR_MAX_AGE', '3600'))
+CONVERTER_JOB_RETENTION = int(os.getenv('JOB_RETENTION', '86400'))
+# Bu kadar saniyedir 'running' kalan iş, işçisi çökmüş sayılıp yeniden sıraya alınır. Dönüştürme
+# süre sınırından uzun olmalı; yoksa çalışmakta olan iş ikinci kez alınır
+CONVERTER_JOB_STALE_AFTER = int(os.getenv('JOB_STALE_AFTER', str(CONVERTER_CONVERSION_TIMEOUT + 300)))
+# Çıktı bu boyuta kadar bellekte tutulur, aşınca geçici dosyaya taşar
+CONVERTER_OUTPUT_SPOOL_SIZE = int(os.getenv('OUTPUT_SPOOL_MB', '8')) * 1024 * 1024
+# İndirme yanıtının parça boyutu
+CONVERTER_RESPONSE_CHUNK_SIZE = 64 * 1024
+# Yanıtlara aşama sürelerini içeren Server-Timing başlığı eklenir
+CONVERTER_SERVER_TIMING = os.getenv('SERVER_TIMING', 'True').lower() == 'true'
+# Ana sayfa bir kez oluşturulup saklanır, her istekte yalnızca CSRF belirteci yerleştirilir
+# (varsayılan olarak DEBUG kapalıyken; DEBUG'da şablon değişiklikleri hemen görünsün)
+CONVERTER_HOME_PAGE_CACHE = os.getenv('HOME_PAGE_CACHE', str(not DEBUG)).lower() == 'true'
+# /metrics: her süreç değerlerini bu dizine yazar, uç nokta hepsini toplar (boşsa yalnızca süreç içi)
+CONVERTER_METRICS_DIR = os.getenv('METRICS_DIR', '')
+# Doluysa /metrics "Authorization: Bearer <token>" ister
+CONVERTER_METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+# İsteklerin bu oranı cProfile ile çalıştırılır ve .prof dosyası yazılır (0 = kapalı)
+CONVERTER_PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+CONVERTER_PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(MEDIA_ROOT, 'profiles'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Dönüştürücü bilgi mesajlarını konsola yaz
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'converter': {'handlers': ['console'], 'level': os.getenv('CONVERTER_LOG_LEVEL', 'INFO')},
+    },
+}
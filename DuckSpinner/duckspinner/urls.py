@@ -23,7 +23,14 @@ from converter import views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('', views.home, name='home'),  # Ana sayfa için root URL
+    # Ana sayfa için root URL (ASGI'de ASYNC_VIEWS=true ile zaman uyumsuz sürüm)
+    path('', views.home_async if settings.CONVERTER_ASYNC_VIEWS else views.home, name='home'),
+    path('preview/', views.preview, name='preview'),  # İlk sayfaların hızlı önizlemesi (PNG/PDF)
+    path('batch/', views.batch_convert, name='batch_convert'),  # Toplu dönüştürme (ZIP olarak döner)
+    path('jobs/', views.job_create, name='job_create'),  # Arka plan dönüştürme işi oluştur
+    path('jobs/<uuid:job_id>/', views.job_status, name='job_status'),
+    path('jobs/<uuid:job_id>/download/', views.job_download, name='job_download'),
+    path('metrics', views.metrics, name='metrics'),  # Prometheus metrikleri
 ]
 
 # 👇 Geliştirme ortamında (DEBUG=True) statik dosyaları sunmak için bu blok kullanılır.
@@ -14,3 +14,12 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'duckspinner.settings')
 
 application = get_wsgi_application()
+
+# İsteğe bağlı: tüm dönüştürme kütüphanelerini şimdi yükle. gunicorn preload_app ile
+# birlikte kullanılınca bu iş ana süreçte bir kez yapılır, işçiler sayfaları paylaşır.
+from django.conf import settings  # noqa: E402
+
+if settings.CONVERTER_PRELOAD_BACKENDS:
+    from converter.backends import preload  # noqa: E402
+
+    preload()
@@ -0,0 +1,6 @@
+# gunicorn bu dosyayı çalışma dizininden otomatik okur
+import os
+
+# PRELOAD_BACKENDS=true ise uygulama (ve duckspinner/wsgi.py üzerinden tüm dönüştürme
+# kütüphaneleri) ana süreçte bir kez yüklenir; çatallanan işçiler bu belleği paylaşır.
+preload_app = os.getenv('PRELOAD_BACKENDS', 'False').lower() == 'true'